@@ -0,0 +1,52 @@
+"""
+배열 내장 함수의 NumPy 경로와 원소마다 함수를 호출하는 경로 비교
+
+python -m benchmarks.bench_array
+"""
+
+import time
+
+from pinterpret import builtins
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+
+N = 100_000
+
+CASES = [
+    f"sum(range({N}))",
+    f"sum(map(fn(x) {{ x * x + 1 }}, range({N})))",
+    f"len(filter(fn(x) {{ x / 3 * 3 == x }}, range({N})))",
+]
+
+
+def measure(program, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        evaluate(program, Environment())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    vectorized = builtins.apply_vectorized
+    for source in CASES:
+        program = Parser(Lexer(source)).parse_program()
+        fast = measure(program)
+
+        builtins.apply_vectorized = lambda fn, arr: None
+        try:
+            slow = measure(program)
+        finally:
+            builtins.apply_vectorized = vectorized
+
+        print(
+            f"{source[:40]:40s} per-element {slow * 1e3:8.2f} ms"
+            f"  vectorized {fast * 1e3:8.2f} ms ({slow / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
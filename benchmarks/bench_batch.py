@@ -0,0 +1,47 @@
+"""
+BatchRunner의 worker 수에 따른 처리량 비교
+
+python -m benchmarks.bench_batch [프로그램 수]
+"""
+
+import os
+import sys
+import time
+
+from pinterpret.batch import BatchRunner
+
+PRELUDE = """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+"""
+
+
+def make_jobs(n: int):
+    return [(str(i), f"fib({8 + i % 4}) + {i}") for i in range(n)]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    jobs = make_jobs(n)
+
+    baseline = None
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with BatchRunner(workers=workers, prelude=PRELUDE) as runner:
+            # worker를 미리 띄워둔다.
+            list(runner.run(make_jobs(workers * runner.chunksize)))
+
+            start = time.perf_counter()
+            count = sum(1 for _ in runner.run(jobs))
+            elapsed = time.perf_counter() - start
+
+        throughput = count / elapsed
+        baseline = baseline or throughput
+        print(
+            f"workers {workers:3d} : {throughput:10.1f} programs/s"
+            f" ({throughput / baseline:.1f}x)"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
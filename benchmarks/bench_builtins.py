@@ -0,0 +1,48 @@
+"""
+Monkey로 작성한 함수와 같은 일을 하는 내장 함수의 호출 시간 비교
+
+python -m benchmarks.bench_builtins
+"""
+
+import timeit
+
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+
+N = 2000
+
+PRELUDE = """
+let mabs = fn(x) { if (x < 0) { -x } else { x } };
+let mmax = fn(a, b) { if (a > b) { a } else { b } };
+let mpow = fn(b, e) { if (e == 0) { 1 } else { b * mpow(b, e - 1) } };
+"""
+
+CASES = [
+    ("mabs(-7)", "abs(-7)"),
+    ("mmax(3, 9)", "max(3, 9)"),
+    ("mpow(3, 10)", "pow(3, 10)"),
+]
+
+
+def main():
+    env = Environment()
+    evaluate(Parser(Lexer(PRELUDE)).parse_program(), env)
+
+    for monkey, native in CASES:
+        times = []
+        for source in (monkey, native):
+            program = Parser(Lexer(source)).parse_program()
+            elapsed = min(
+                timeit.repeat(lambda: evaluate(program, env), number=N, repeat=3)
+            )
+            times.append(elapsed / N)
+        print(
+            f"{native:12s} monkey {times[0] * 1e6:8.2f} us"
+            f"  builtin {times[1] * 1e6:8.2f} us ({times[0] / times[1]:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
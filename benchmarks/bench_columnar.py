@@ -0,0 +1,48 @@
+"""
+열 단위 평가와 행마다 evaluate하는 경우의 시간 비교
+
+python -m benchmarks.bench_columnar
+"""
+
+import time
+
+import numpy as np
+
+from pinterpret.columnar import evaluate_columns, evaluate_rows
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+
+SOURCE = """
+let clamp = fn(v, lo, hi) { if (v < lo) { lo } else { if (v > hi) { hi } else { v } } };
+let score = fn(a, b) { a * 3 + b * 2 - (a - b) / 2 };
+clamp(score(x, y), 0, 100) + clamp(score(y, x), 0, 100)
+"""
+
+ROWS = 1_000_000
+SAMPLE_ROWS = 10_000
+
+
+def main():
+    program = Parser(Lexer(SOURCE)).parse_program()
+    rng = np.random.default_rng(0)
+    columns = {
+        "x": rng.integers(-100, 100, ROWS),
+        "y": rng.integers(-100, 100, ROWS),
+    }
+
+    start = time.perf_counter()
+    result = evaluate_columns(program, columns)
+    columnar = time.perf_counter() - start
+
+    sample = {name: column[:SAMPLE_ROWS] for name, column in columns.items()}
+    start = time.perf_counter()
+    expected = evaluate_rows(program, sample, SAMPLE_ROWS)
+    rows = (time.perf_counter() - start) * ROWS / SAMPLE_ROWS
+
+    assert (result[:SAMPLE_ROWS] == expected).all()
+    print(f"columnar : {columnar * 1e3:10.1f} ms for {ROWS} rows")
+    print(f"per row  : {rows * 1e3:10.1f} ms for {ROWS} rows (estimated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+HAMT 해시와 매번 dict를 복사하는 해시의 put 시간 비교
+
+python -m benchmarks.bench_hash
+"""
+
+import time
+
+from pinterpret.obj import HashObj, IntegerObj
+
+SIZES = [100, 1000, 10000]
+
+
+def build_hamt(n: int) -> HashObj:
+    h = HashObj()
+    for i in range(n):
+        h = h.put(IntegerObj(i), IntegerObj(i))
+    return h
+
+
+def build_copying(n: int) -> dict:
+    h = {}
+    for i in range(n):
+        h = {**h, IntegerObj(i).hash_key(): IntegerObj(i)}
+    return h
+
+
+def measure(build, n: int) -> float:
+    start = time.perf_counter()
+    build(n)
+    return time.perf_counter() - start
+
+
+def main():
+    for n in SIZES:
+        hamt = measure(build_hamt, n) / n
+        copying = measure(build_copying, n) / n
+        print(
+            f"n={n:6d}  copy {copying * 1e6:8.2f} us/put"
+            f"  hamt {hamt * 1e6:8.2f} us/put ({copying / hamt:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
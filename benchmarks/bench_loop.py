@@ -0,0 +1,59 @@
+"""
+재귀로 만든 반복과 while 반복의 비교
+
+재귀는 반복마다 Environment와 파이썬 스택 프레임이 쌓여 재귀 한도에 걸리므로 작은 N에서만 비교하고,
+while은 큰 N에서도 한 번 더 잰다.
+
+python -m benchmarks.bench_loop
+"""
+
+import time
+
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+
+RECURSION = """
+let sum = fn(i, n, acc) {{ if (i < n) {{ sum(i + 1, n, acc + i) }} else {{ acc }} }};
+sum(0, {n}, 0)
+"""
+
+LOOP = """
+let i = 0;
+let acc = 0;
+while (i < {n}) {{ let acc = acc + i; let i = i + 1; }}
+acc
+"""
+
+
+def measure(template: str, n: int) -> float:
+    program = Parser(Lexer(template.format(n=n))).parse_program()
+    start = time.perf_counter()
+    result = evaluate(program, Environment())
+    elapsed = time.perf_counter() - start
+    assert result.inspect() == str(n * (n - 1) // 2), result.inspect()
+    return elapsed
+
+
+def main():
+    n = 80
+    recursion = measure(RECURSION, n) / n
+    loop = measure(LOOP, n) / n
+    print(
+        f"n={n:7d}  recursion {recursion * 1e6:6.2f} us/iter"
+        f"  while {loop * 1e6:6.2f} us/iter ({recursion / loop:.1f}x)"
+    )
+
+    for n in (100_000, 1_000_000):
+        try:
+            measure(RECURSION, n)
+            recursion = "ok"
+        except RecursionError:
+            recursion = "RecursionError"
+        loop = measure(LOOP, n) / n
+        print(f"n={n:7d}  recursion {recursion}  while {loop * 1e6:6.2f} us/iter")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+AST 노드와 런타임 객체의 메모리 사용량 측정
+
+python -m benchmarks.bench_memory
+"""
+
+import gc
+import tracemalloc
+
+from pinterpret.arena import ArenaProgram
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import BooleanObj, FunctionObj, IntegerObj
+from pinterpret.parser import Parser
+
+N = 20000
+
+
+def generate_source(n: int) -> str:
+    return "\n".join(
+        f"let f{i} = fn(a, b) {{ if (a < b) {{ return a * {i} + -b }} else {{ b }} }};"
+        f" f{i}({i}, 2) == {i};"
+        for i in range(n)
+    )
+
+
+def count_nodes(program) -> int:
+    count = 0
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        if node is None or isinstance(node, (str, int, bool)):
+            continue
+        count += 1
+        for name in ("statements", "arguments", "parameters"):
+            stack.extend(getattr(node, name, None) or [])
+        for name in (
+            "expression",
+            "value",
+            "name",
+            "return_value",
+            "left",
+            "right",
+            "condition",
+            "consequence",
+            "alternative",
+            "body",
+            "function",
+        ):
+            child = getattr(node, name, None)
+            if child is not None and not isinstance(child, (str, int, bool)):
+                stack.append(child)
+    return count
+
+
+def measure(func):
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, peak
+
+
+def main():
+    source = generate_source(N)
+
+    program, size, peak = measure(lambda: Parser(Lexer(source)).parse_program())
+    nodes = count_nodes(program) - 1
+    print(
+        f"parse     : {nodes} nodes, {size / nodes:.1f} bytes/node, peak {peak / 2**20:.1f}MB"
+    )
+
+    arena_program, size, _ = measure(lambda: ArenaProgram.from_program(program))
+    print(
+        f"arena     : {len(arena_program.arena)} nodes, {size / nodes:.1f} bytes/node"
+    )
+
+    env = Environment()
+    _, size, peak = measure(lambda: evaluate(program, env))
+    print(f"evaluate  : peak {peak / 2**20:.1f}MB")
+
+    for name, factory in (
+        ("IntegerObj", lambda i: IntegerObj(i)),
+        ("BooleanObj", lambda i: BooleanObj(i % 2 == 0)),
+        ("FunctionObj", lambda i: FunctionObj([], None, env)),
+        ("Environment", lambda i: Environment(env)),
+    ):
+        objs, size, _ = measure(lambda: [factory(i) for i in range(N)])
+        # 리스트 자체의 크기는 제외한다.
+        size -= objs.__sizeof__()
+        print(f"{name:<12}: {size / N:.1f} bytes/object")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+fib 호출들을 이 프로세스에서 차례로 실행하는 경우와 pmap으로 나눠 실행하는 경우의 비교
+
+python -m benchmarks.bench_parallel [WORKERS]
+"""
+
+import sys
+import time
+
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import IntegerObj
+from pinterpret.parallel import ParallelPool
+from pinterpret.parser import Parser
+
+PRELUDE = """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let work = fn(i) { fib(12 + i - i / 4 * 4) };
+"""
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    env = Environment()
+    evaluate(Parser(Lexer(PRELUDE)).parse_program(), env)
+    work, _ = env.get("work")
+
+    with ParallelPool(workers=workers) as pool:
+        print(f"workers : {pool.workers}")
+        for n in (4, 32, 128):
+            calls = [(work, [IntegerObj(i)]) for i in range(n)]
+
+            start = time.perf_counter()
+            ParallelPool(workers=1).call_all(calls)
+            serial = time.perf_counter() - start
+
+            pool.call_all(calls)  # worker를 띄우고 overhead를 재는 시간은 빼고 잰다.
+            start = time.perf_counter()
+            pool.call_all(calls)
+            parallel = time.perf_counter() - start
+
+            mode = "processes" if pool._executor is not None else "in-process"
+            print(
+                f"n={n:4d} serial {serial * 1e3:9.1f} ms"
+                f"  pmap {parallel * 1e3:9.1f} ms ({serial / parallel:.1f}x, {mode})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+큰 prelude에서 만든 함수를 pickle할 때의 payload 크기와 시간 비교
+
+- full : env를 통째로 넣는 기본 방식 (스냅샷의 SnapshotPickler가 쓰는 방식)
+- reduce : FunctionObj.__reduce__, 필요한 바인딩과 바이너리 AST만 보낸다.
+- shared : ast_table.export() 이후, 바인딩과 content hash만 보낸다.
+
+python -m benchmarks.bench_pickle
+"""
+
+import copyreg
+import io
+import pickle
+import timeit
+
+from benchmarks.bench_prelude import generate_prelude
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import FunctionObj
+from pinterpret.parser import Parser
+from pinterpret.shipping import ast_table
+
+N = 200
+
+
+class FullPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if type(obj) is FunctionObj:
+            slots = {"parameters": obj.parameters, "body": obj.body, "env": obj.env}
+            return copyreg.__newobj__, (FunctionObj,), (None, slots)
+        return NotImplemented
+
+
+def full_dumps(obj) -> bytes:
+    out = io.BytesIO()
+    FullPickler(out, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return out.getvalue()
+
+
+def measure(name: str, dumps, fn):
+    data = dumps(fn)
+    dump_time = min(timeit.repeat(lambda: dumps(fn), number=N, repeat=3)) / N
+    load_time = min(timeit.repeat(lambda: pickle.loads(data), number=N, repeat=3))
+    load_time /= N
+    print(
+        f"{name:8s} {len(data) / 1024:10.1f} KB"
+        f" {dump_time * 1e6:10.1f} us {load_time * 1e6:10.1f} us"
+    )
+
+
+def main():
+    env = Environment()
+    evaluate(Parser(Lexer(generate_prelude(1000))).parse_program(), env)
+    fn, _ = env.get("f500")
+
+    def dumps(obj) -> bytes:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    print(f"{'':8s} {'payload':>13s} {'dumps':>13s} {'loads':>13s}")
+    measure("full", full_dumps, fn)
+    measure("reduce", dumps, fn)
+    ast_table.export()
+    measure("shared", dumps, fn)
+
+
+if __name__ == "__main__":
+    main()
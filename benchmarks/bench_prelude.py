@@ -0,0 +1,79 @@
+"""
+요청마다 prelude를 평가하는 경우와, 한 번 평가해 freeze한 prelude를 fork하는 경우의 비교
+그리고 gc.freeze() 전후의 전체 GC 시간 비교
+
+python -m benchmarks.bench_prelude
+"""
+
+import gc
+import time
+import timeit
+
+from pinterpret.batch import load_prelude
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+
+N = 200
+
+
+def generate_prelude(n: int) -> str:
+    lines = []
+    for i in range(n):
+        lines.append(f"let c{i} = {i} * 3 + 1;")
+        lines.append(
+            f"let f{i} = fn(x) {{ if (x > {i}) {{ x - c{i} }} else {{ x + c{i} }} }};"
+        )
+    return "\n".join(lines)
+
+
+PRELUDE = generate_prelude(150)
+REQUEST = "f10(c20) + f100(c3) * f149(7)"
+
+
+def parse(source: str):
+    return Parser(Lexer(source)).parse_program()
+
+
+def main():
+    prelude_program = parse(PRELUDE)
+    request = parse(REQUEST)
+
+    def fresh():
+        env = Environment()
+        evaluate(prelude_program, env)
+        return evaluate(request, env)
+
+    prelude = load_prelude(PRELUDE)
+
+    def forked():
+        return evaluate(request, prelude.fork())
+
+    assert fresh() == forked()
+    fresh_time = min(timeit.repeat(fresh, number=N, repeat=3)) / N
+    forked_time = min(timeit.repeat(forked, number=N, repeat=3)) / N
+    print(f"evaluate prelude per request : {fresh_time * 1e6:9.1f} us/request")
+    print(
+        f"fork frozen prelude          : {forked_time * 1e6:9.1f} us/request"
+        f" ({fresh_time / forked_time:.0f}x)"
+    )
+
+    # 요청마다 만든 AST와 prelude가 살아있는 상태에서 전체 GC 시간
+    keep = [parse(PRELUDE) for _ in range(20)]
+    start = time.perf_counter()
+    gc.collect()
+    before = time.perf_counter() - start
+
+    gc.freeze()
+    start = time.perf_counter()
+    gc.collect()
+    after = time.perf_counter() - start
+    print(f"gc.collect() before gc.freeze : {before * 1e3:7.2f} ms")
+    print(
+        f"gc.collect() after gc.freeze  : {after * 1e3:7.2f} ms ({len(keep)} programs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+prepare + run과 매번 Lexer -> Parser -> evaluate 하는 경우의 호출당 시간 비교
+
+python -m benchmarks.bench_prepared
+"""
+
+import timeit
+
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import IntegerObj
+from pinterpret.parser import Parser
+from pinterpret.prepared import prepare
+
+SOURCE = """
+let clamp = fn(v, lo, hi) { if (v < lo) { lo } else { if (v > hi) { hi } else { v } } };
+let score = fn(a, b) { a * 3 + b * 2 - (a - b) / 2 };
+clamp(score(x, y), 0, 100) + clamp(score(y, x), 0, 100)
+"""
+
+N = 2000
+
+
+def full_pipeline(x: int, y: int):
+    env = Environment()
+    env.set("x", IntegerObj(x))
+    env.set("y", IntegerObj(y))
+    return evaluate(Parser(Lexer(SOURCE)).parse_program(), env)
+
+
+def main():
+    handle = prepare(SOURCE)
+    assert handle.run({"x": 7, "y": 5}) == full_pipeline(7, 5)
+
+    full = min(timeit.repeat(lambda: full_pipeline(7, 5), number=N, repeat=3)) / N
+    prepared = (
+        min(timeit.repeat(lambda: handle.run({"x": 7, "y": 5}), number=N, repeat=3)) / N
+    )
+
+    print(f"full pipeline : {full * 1e6:8.1f} us/call")
+    print(f"prepared run  : {prepared * 1e6:8.1f} us/call ({full / prepared:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+긴 프로그램 사이에 섞인 짧은 프로그램들이 끝나기까지 걸리는 시간 비교
+
+순서대로 evaluate를 호출하면 짧은 프로그램도 앞의 긴 프로그램을 모두 기다리지만,
+Scheduler는 slice_steps 단계씩 번갈아 실행하므로 짧은 프로그램이 먼저 끝난다.
+
+python -m benchmarks.bench_scheduler
+"""
+
+import statistics
+import time
+
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+from pinterpret.scheduler import Scheduler
+
+LONG = """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+fib(15)
+"""
+
+SHORT = "let add = fn(a, b) {{ a + b }}; add({i}, {i} * 2)"
+
+
+def make_programs():
+    programs = []
+    for i in range(2000):
+        # 짧은 프로그램 200개마다 긴 프로그램 하나
+        source = LONG if i % 200 == 0 else SHORT.format(i=i)
+        programs.append((source is LONG, Parser(Lexer(source)).parse_program()))
+    return programs
+
+
+def report(name: str, total: float, latencies):
+    print(
+        f"{name:10s} total {total * 1e3:8.1f} ms"
+        f" | short p50 {statistics.median(latencies) * 1e3:7.1f} ms"
+        f" max {max(latencies) * 1e3:7.1f} ms"
+    )
+
+
+def main():
+    programs = make_programs()
+
+    start = time.perf_counter()
+    latencies = []
+    for is_long, program in programs:
+        evaluate(program, Environment())
+        if not is_long:
+            latencies.append(time.perf_counter() - start)
+    report("sequential", time.perf_counter() - start, latencies)
+
+    scheduler = Scheduler(slice_steps=1000)
+    long_tasks = set()
+    for is_long, program in programs:
+        task = scheduler.spawn(program)
+        if is_long:
+            long_tasks.add(task)
+
+    start = time.perf_counter()
+    latencies = []
+    for task in scheduler.run():
+        if task not in long_tasks:
+            latencies.append(time.perf_counter() - start)
+    report("scheduler", time.perf_counter() - start, latencies)
+
+
+if __name__ == "__main__":
+    main()
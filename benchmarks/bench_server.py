@@ -0,0 +1,92 @@
+"""
+평가 서버의 초당 요청 수와 지연 시간 측정
+
+서버를 같은 프로세스에서 띄우거나 (--connect 없이), 이미 떠 있는 서버에 접속해서
+connections개의 연결로 각각 pipeline개씩 요청을 겹쳐 보낸다.
+
+python -m benchmarks.bench_server [--requests N] [--connections C] [--pipeline P]
+                                  [--workers W] [--framing ndjson|length]
+                                  [--connect HOST:PORT | --connect-unix PATH]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from pinterpret.server import Client, EvaluationServer
+
+SOURCE = "let add = fn(a, b) {{ a + b }}; add({i}, {i} * 2) * 3"
+
+
+async def run_connection(client: Client, count: int, pipeline: int, latencies: list):
+    slots = asyncio.Semaphore(pipeline)
+
+    async def one(i: int):
+        async with slots:
+            start = time.perf_counter()
+            response = await client.request(SOURCE.format(i=i))
+            latencies.append(time.perf_counter() - start)
+            assert "error" not in response, response
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+
+
+async def connect(args, server):
+    if args.connect_unix:
+        return await Client.connect_unix(args.connect_unix, args.framing)
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        return await Client.connect_tcp(host, int(port), args.framing)
+    return await Client.connect_tcp(*server.address, args.framing)
+
+
+async def main(args):
+    server = None
+    if not (args.connect or args.connect_unix):
+        server = EvaluationServer(workers=args.workers, framing=args.framing)
+        await server.start_tcp(port=0)
+
+    clients = [await connect(args, server) for _ in range(args.connections)]
+    # worker를 미리 띄워둔다.
+    await asyncio.gather(*(client.request("1") for client in clients))
+
+    latencies = []
+    per_connection = args.requests // args.connections
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_connection(client, per_connection, args.pipeline, latencies)
+            for client in clients
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{len(latencies)} requests in {elapsed:.2f}s : {len(latencies) / elapsed:.0f} req/s"
+        f" | p50 {statistics.median(latencies) * 1e3:.2f} ms"
+        f" p99 {p99 * 1e3:.2f} ms"
+    )
+    print(
+        "server :",
+        {k: v for k, v in (await clients[0].stats()).items() if k != "buckets"},
+    )
+
+    for client in clients:
+        await client.close()
+    if server is not None:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--pipeline", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--framing", choices=["ndjson", "length"], default="ndjson")
+    parser.add_argument("--connect", help="HOST:PORT of a running server")
+    parser.add_argument("--connect-unix", help="unix socket of a running server")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,42 @@
+"""
+prelude를 다시 파싱/평가하는 시간과 스냅샷에서 복원하는 시간 비교
+
+python -m benchmarks.bench_snapshot
+"""
+
+import timeit
+
+from benchmarks.bench_prelude import generate_prelude
+from pinterpret import snapshot
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+
+N = 20
+
+
+def main():
+    source = generate_prelude(1000)
+
+    def rerun():
+        env = Environment()
+        evaluate(Parser(Lexer(source)).parse_program(), env)
+        return env
+
+    data = snapshot.dumps(rerun())
+    rerun_time = min(timeit.repeat(rerun, number=N, repeat=3)) / N
+    restore_time = min(timeit.repeat(lambda: snapshot.loads(data), number=N, repeat=3))
+    restore_time /= N
+
+    print(f"prelude source : {len(source) / 1024:8.1f} KB")
+    print(f"snapshot       : {len(data) / 1024:8.1f} KB")
+    print(f"parse+evaluate : {rerun_time * 1e3:8.2f} ms")
+    print(
+        f"restore        : {restore_time * 1e3:8.2f} ms"
+        f" ({rerun_time / restore_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
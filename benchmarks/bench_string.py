@@ -0,0 +1,47 @@
+"""
+rope로 이어 붙이기와 매번 합치기의 비교
+
+재귀로 문자열을 만드는 Monkey 코드가 하는 것처럼, 조각을 하나씩 + 한 뒤 마지막에 값을 읽는다.
+
+python -m benchmarks.bench_string
+"""
+
+import time
+
+from pinterpret.obj import StringObj
+
+PIECE = "0123456789"
+SIZES = [1000, 10000, 40000]
+
+
+def build(n: int) -> str:
+    piece = StringObj(PIECE)
+    s = StringObj("")
+    for _ in range(n):
+        s = StringObj.concat(s, piece)
+    return s.value
+
+
+def measure(n: int, short: int) -> float:
+    default = StringObj.SHORT
+    StringObj.SHORT = short
+    try:
+        start = time.perf_counter()
+        build(n)
+        return time.perf_counter() - start
+    finally:
+        StringObj.SHORT = default
+
+
+def main():
+    for n in SIZES:
+        rope = measure(n, StringObj.SHORT)
+        eager = measure(n, len(PIECE) * n)
+        print(
+            f"{n * len(PIECE):7d} chars  eager {eager * 1e3:8.2f} ms"
+            f"  rope {rope * 1e3:8.2f} ms ({eager / rope:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
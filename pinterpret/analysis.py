@@ -0,0 +1,51 @@
+"""
+AST 분석 pass 모음
+"""
+
+from typing import List, Set
+
+from pinterpret.ast import FunctionLiteral, Identifier, LetStatement
+from pinterpret.visitor import AnalysisPass
+
+
+class FreeIdentifiers(AnalysisPass):
+    """프로그램 안에서 정의되지 않고 사용되는 식별자를 찾는다.
+
+    let 문과 함수 파라미터를 정의로 보고, 함수 리터럴마다 새 scope를 만든다.
+    if 블록은 evaluate와 마찬가지로 scope를 만들지 않는다.
+    재귀 함수를 위해, 값이 함수 리터럴인 let 문은 값을 보기 전에 이름을 정의한다.
+    """
+
+    names: List[str]  # 자유 식별자 (처음 나온 순서)
+
+    def __init__(self):
+        self.names = []
+        self._found: Set[str] = set()
+        self._scopes: List[Set[str]] = [set()]
+        # 바로 다음에 방문할 식별자 중 정의(let 이름, 파라미터)인 것의 개수
+        self._declarations = 0
+
+    def enter_LetStatement(self, node: LetStatement):
+        self._declarations = 1
+        if isinstance(node.value, FunctionLiteral):
+            self._scopes[-1].add(node.name.value)
+
+    def leave_LetStatement(self, node: LetStatement):
+        self._scopes[-1].add(node.name.value)
+
+    def enter_FunctionLiteral(self, node: FunctionLiteral):
+        self._declarations = len(node.parameters)
+        self._scopes.append({p.value for p in node.parameters})
+
+    def leave_FunctionLiteral(self, node: FunctionLiteral):
+        self._scopes.pop()
+
+    def enter_Identifier(self, node: Identifier):
+        if self._declarations:
+            self._declarations -= 1
+            return
+        name = node.value
+        if name in self._found or any(name in scope for scope in self._scopes):
+            return
+        self._found.add(name)
+        self.names.append(name)
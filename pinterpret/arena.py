@@ -0,0 +1,374 @@
+"""
+Arena AST
+
+노드마다 객체를 만드는 대신, 노드를 정수 핸들로 가리키고
+노드 정보를 타입이 정해진 평행 배열(array)에 저장하는 AST 저장소.
+
+kinds[h]         노드 종류 (serialize.NodeTag)
+token_ids[h]     토큰 테이블(tokens)에서의 인덱스
+child_starts[h]  children 배열에서 자식 핸들이 시작하는 위치
+child_counts[h]  자식 개수
+payloads[h]      정수 값 (IntegerLiteral 값, BoolLiteral 값)
+children         자식 노드 핸들, 없는 자식은 -1
+
+배열 몇 개와 토큰 테이블이 전부이므로 GC가 노드 하나하나를 추적하지 않고,
+프로그램을 버리면 Arena 전체가 한 번에 해제된다.
+
+evaluate와 __str__은 view 레이어를 통해 Arena를 그대로 사용한다.
+view는 각 AST 클래스를 상속하므로 isinstance 분기가 그대로 동작하고,
+속성에 접근할 때마다 배열에서 값을 읽어온다.
+"""
+
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from pinterpret.ast import (
+    Node,
+    Program,
+    Statement,
+    LetStatement,
+    ReturnStatement,
+    WhileStatement,
+    ExpressionStatement,
+    BlockStatement,
+    Identifier,
+    IntegerLiteral,
+    StringLiteral,
+    BoolLiteral,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+)
+from pinterpret.serialize import Encoder, NodeTag
+from pinterpret.token import Token, string_value
+
+NO_NODE = -1
+
+# payload에 담을 수 없는 큰 정수는 토큰 리터럴에서 다시 읽는다.
+PAYLOAD_MIN = -(2**63)
+PAYLOAD_MAX = 2**63 - 1
+PAYLOAD_OVERFLOW = PAYLOAD_MIN
+
+
+class Arena:
+    tokens: List[Token]
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.token_ids = array("l")
+        self.child_starts = array("l")
+        self.child_counts = array("l")
+        self.payloads = array("q")
+        self.children = array("l")
+        self.tokens = []
+        self._token_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def add(self, root: Optional[Node]) -> int:
+        """AST를 Arena에 옮기고, 루트 노드의 핸들을 돌려준다."""
+        if root is None:
+            return NO_NODE
+
+        handle = len(self.kinds)
+        # (노드, 부모의 children 배열에서 이 노드 핸들이 들어갈 위치)
+        stack = [(root, -1)]
+        while stack:
+            node, slot = stack.pop()
+            if node is None:
+                continue
+
+            tag, _, children = Encoder.describe(node)
+            current = len(self.kinds)
+            if slot >= 0:
+                self.children[slot] = current
+
+            self.kinds.append(tag)
+            self.token_ids.append(self.token_id(node.token))
+            self.child_starts.append(len(self.children))
+            self.child_counts.append(len(children))
+            self.payloads.append(self.payload(node))
+
+            start = len(self.children)
+            self.children.extend([NO_NODE] * len(children))
+            for i in reversed(range(len(children))):
+                stack.append((children[i], start + i))
+        return handle
+
+    def token_id(self, token: Token) -> int:
+        index = self._token_index.get(token.literal)
+        if index is None:
+            index = self._token_index[token.literal] = len(self.tokens)
+            self.tokens.append(token)
+        return index
+
+    @staticmethod
+    def payload(node: Node) -> int:
+        if isinstance(node, IntegerLiteral):
+            if PAYLOAD_MIN < node.value <= PAYLOAD_MAX:
+                return node.value
+            return PAYLOAD_OVERFLOW
+        elif isinstance(node, BoolLiteral):
+            return int(node.value)
+        return 0
+
+    def child(self, handle: int, index: int) -> int:
+        return self.children[self.child_starts[handle] + index]
+
+    def child_handles(self, handle: int) -> array:
+        start = self.child_starts[handle]
+        return self.children[start : start + self.child_counts[handle]]
+
+    def view(self, handle: int) -> Optional[Node]:
+        if handle == NO_NODE:
+            return None
+        return VIEW_CLASSES[self.kinds[handle]](self, handle)
+
+    def views(self, handles) -> List[Optional[Node]]:
+        return [self.view(handle) for handle in handles]
+
+
+class NodeView:
+    """Arena의 노드 하나를 가리키는 view의 공통 로직
+
+    view 클래스마다 __slots__ = ("arena", "handle")을 선언한다.
+    """
+
+    __slots__ = ()
+
+    arena: Arena
+    handle: int
+
+    def __init__(self, arena: Arena, handle: int):
+        self.arena = arena
+        self.handle = handle
+
+    @property
+    def token(self) -> Token:
+        return self.arena.tokens[self.arena.token_ids[self.handle]]
+
+    def child_view(self, index: int) -> Optional[Node]:
+        return self.arena.view(self.arena.child(self.handle, index))
+
+    def children_views(self, start: int = 0, stop: Optional[int] = None) -> list:
+        handles = self.arena.child_handles(self.handle)
+        return self.arena.views(handles[start:stop])
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, NodeView)
+            and self.arena is other.arena
+            and self.handle == other.handle
+        )
+
+    def __hash__(self):
+        return hash((id(self.arena), self.handle))
+
+
+def child_property(index: int) -> property:
+    return property(lambda self: self.child_view(index))
+
+
+def operator_property() -> property:
+    return property(lambda self: self.token.literal)
+
+
+class IdentifierView(NodeView, Identifier):
+    __slots__ = ("arena", "handle")
+
+    value = operator_property()
+
+
+class IntegerLiteralView(NodeView, IntegerLiteral):
+    __slots__ = ("arena", "handle")
+
+    @property
+    def value(self) -> int:
+        value = self.arena.payloads[self.handle]
+        if value == PAYLOAD_OVERFLOW:
+            return int(self.token.literal)
+        return value
+
+
+class BoolLiteralView(NodeView, BoolLiteral):
+    __slots__ = ("arena", "handle")
+
+    @property
+    def value(self) -> bool:
+        return bool(self.arena.payloads[self.handle])
+
+
+class StringLiteralView(NodeView, StringLiteral):
+    __slots__ = ("arena", "handle")
+
+    @property
+    def value(self) -> str:
+        return sys.intern(string_value(self.token.literal))
+
+
+class PrefixExpressionView(NodeView, PrefixExpression):
+    __slots__ = ("arena", "handle")
+
+    operator = operator_property()
+    right = child_property(0)
+
+
+class InfixExpressionView(NodeView, InfixExpression):
+    __slots__ = ("arena", "handle")
+
+    operator = operator_property()
+    left = child_property(0)
+    right = child_property(1)
+
+
+class CallExpressionView(NodeView, CallExpression):
+    __slots__ = ("arena", "handle")
+
+    function = child_property(0)
+
+    @property
+    def arguments(self) -> list:
+        return self.children_views(1)
+
+
+class ArrayLiteralView(NodeView, ArrayLiteral):
+    __slots__ = ("arena", "handle")
+
+    @property
+    def elements(self) -> list:
+        return self.children_views()
+
+
+class HashLiteralView(NodeView, HashLiteral):
+    __slots__ = ("arena", "handle")
+
+    @property
+    def keys(self) -> list:
+        return self.children_views(0, self.arena.child_counts[self.handle] // 2)
+
+    @property
+    def values(self) -> list:
+        return self.children_views(self.arena.child_counts[self.handle] // 2)
+
+
+class IndexExpressionView(NodeView, IndexExpression):
+    __slots__ = ("arena", "handle")
+
+    left = child_property(0)
+    index = child_property(1)
+
+
+class IfExpressionView(NodeView, IfExpression):
+    __slots__ = ("arena", "handle")
+
+    condition = child_property(0)
+    consequence = child_property(1)
+
+    @property
+    def alternative(self) -> Optional[BlockStatement]:
+        if self.arena.child_counts[self.handle] < 3:
+            return None
+        return self.child_view(2)
+
+
+class FunctionLiteralView(NodeView, FunctionLiteral):
+    __slots__ = ("arena", "handle")
+
+    @property
+    def parameters(self) -> list:
+        return self.children_views(0, -1)
+
+    @property
+    def body(self) -> BlockStatement:
+        return self.child_view(self.arena.child_counts[self.handle] - 1)
+
+
+class BlockStatementView(NodeView, BlockStatement):
+    __slots__ = ("arena", "handle")
+
+    @property
+    def statements(self) -> list:
+        return self.children_views()
+
+
+class LetStatementView(NodeView, LetStatement):
+    __slots__ = ("arena", "handle")
+
+    name = child_property(0)
+    value = child_property(1)
+
+
+class ReturnStatementView(NodeView, ReturnStatement):
+    __slots__ = ("arena", "handle")
+
+    return_value = child_property(0)
+
+
+class WhileStatementView(NodeView, WhileStatement):
+    __slots__ = ("arena", "handle")
+
+    condition = child_property(0)
+    body = child_property(1)
+
+
+class ExpressionStatementView(NodeView, ExpressionStatement):
+    __slots__ = ("arena", "handle")
+
+    expression = child_property(0)
+
+
+VIEW_CLASSES = {
+    int(NodeTag.IDENTIFIER): IdentifierView,
+    int(NodeTag.INTEGER): IntegerLiteralView,
+    int(NodeTag.BOOL): BoolLiteralView,
+    int(NodeTag.PREFIX): PrefixExpressionView,
+    int(NodeTag.INFIX): InfixExpressionView,
+    int(NodeTag.CALL): CallExpressionView,
+    int(NodeTag.IF): IfExpressionView,
+    int(NodeTag.FUNCTION): FunctionLiteralView,
+    int(NodeTag.BLOCK): BlockStatementView,
+    int(NodeTag.LET): LetStatementView,
+    int(NodeTag.RETURN): ReturnStatementView,
+    int(NodeTag.EXPRESSION): ExpressionStatementView,
+    int(NodeTag.ARRAY): ArrayLiteralView,
+    int(NodeTag.INDEX): IndexExpressionView,
+    int(NodeTag.HASH): HashLiteralView,
+    int(NodeTag.STRING): StringLiteralView,
+    int(NodeTag.WHILE): WhileStatementView,
+}
+
+
+class ArenaProgram(Program):
+    """Arena를 소유하는 Program
+
+    statements는 최상위 명령문의 view 목록이다.
+    """
+
+    __slots__ = ("arena", "roots")
+
+    arena: Arena
+    roots: array
+
+    def __init__(self, arena: Arena, roots: array):
+        self.arena = arena
+        self.roots = roots
+
+    @classmethod
+    def from_program(cls, program: Program) -> "ArenaProgram":
+        arena = Arena()
+        roots = array("l", [arena.add(stmt) for stmt in program.statements])
+        return cls(arena, roots)
+
+    @property
+    def statements(self) -> List[Statement]:
+        return self.arena.views(self.roots)
+
+    def append(self, statement: Statement):
+        self.roots.append(self.arena.add(statement))
@@ -1,10 +1,16 @@
+import sys
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from threading import RLock
+from typing import Callable, List, Optional, Tuple
 
-from pinterpret.token import Token
+from pinterpret.token import Token, string_value
 
 
 class Node(ABC):
+    __slots__ = ()
+
+    # 자식 노드를 담은 속성 이름 (평가 순서대로)
+    fields: Tuple[str, ...] = ()
 
     @abstractmethod
     def token_literal(self) -> str:
@@ -14,10 +20,13 @@ class Node(ABC):
 class Expression(Node):
     """표현식"""
 
-    pass
+    __slots__ = ()
 
 
 class PrefixExpression(Expression):
+    __slots__ = ("token", "operator", "right")
+    fields = ("right",)
+
     token: Token
     operator: str
     right: Expression
@@ -35,6 +44,9 @@ class PrefixExpression(Expression):
 
 
 class InfixExpression(Expression):
+    __slots__ = ("token", "left", "operator", "right")
+    fields = ("left", "right")
+
     token: Token
 
     left: Expression
@@ -57,6 +69,8 @@ class InfixExpression(Expression):
 class IntegerLiteral(Expression):
     """숫자형 표현"""
 
+    __slots__ = ("token", "value")
+
     token: Token
     value: int
 
@@ -74,6 +88,8 @@ class IntegerLiteral(Expression):
 class BoolLiteral(Expression):
     """불 리터럴"""
 
+    __slots__ = ("token", "value")
+
     token: Token
     value: bool
 
@@ -88,7 +104,32 @@ class BoolLiteral(Expression):
         return self.token.literal
 
 
+class StringLiteral(Expression):
+    """문자열 리터럴
+
+    값은 sys.intern으로 intern 해두므로, 같은 내용의 리터럴은 같은 str 객체를 가진다.
+    """
+
+    __slots__ = ("token", "value")
+
+    token: Token
+    value: str
+
+    def __init__(self, token: Token):
+        self.token = token
+        self.value = sys.intern(string_value(token.literal))
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self):
+        return self.token.literal
+
+
 class CallExpression(Expression):
+    __slots__ = ("token", "function", "arguments")
+    fields = ("function", "arguments")
+
     token: Token
     function: Expression
     arguments: List[Expression]
@@ -106,6 +147,75 @@ class CallExpression(Expression):
         return f"{self.function.token_literal()}({args})"
 
 
+class ArrayLiteral(Expression):
+    """배열 리터럴 ex) [1, 2 * 3, f(x)]"""
+
+    __slots__ = ("token", "elements")
+    fields = ("elements",)
+
+    token: Token
+    elements: List[Expression]
+
+    def __init__(self, token: Token, elements: List[Expression]):
+        self.token = token
+        self.elements = elements
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self):
+        elements = ",".join([str(element) for element in self.elements])
+        return f"[{elements}]"
+
+
+class HashLiteral(Expression):
+    """해시 리터럴 ex) {1: a, true: f(x)}
+
+    i번째 쌍은 (keys[i], values[i])이다. 키를 모두 평가한 뒤 값을 평가한다.
+    """
+
+    __slots__ = ("token", "keys", "values")
+    fields = ("keys", "values")
+
+    token: Token
+    keys: List[Expression]
+    values: List[Expression]
+
+    def __init__(self, token: Token, keys: List[Expression], values: List[Expression]):
+        self.token = token
+        self.keys = keys
+        self.values = values
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self):
+        pairs = ",".join([f"{k}:{v}" for k, v in zip(self.keys, self.values)])
+        return f"{{{pairs}}}"
+
+
+class IndexExpression(Expression):
+    """인덱스 표현식 ex) arr[1 + 2], hash[key]"""
+
+    __slots__ = ("token", "left", "index")
+    fields = ("left", "index")
+
+    token: Token
+    left: Expression
+    index: Expression
+
+    def __init__(self, token: Token, left: Expression, index: Expression):
+        self.token = token
+        self.left = left
+        self.index = index
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self):
+        return f"({self.left}[{self.index}])"
+
+
 class Statement(Node):
     """명령문
 
@@ -115,33 +225,84 @@ class Statement(Node):
     표현식 : 값을 만듦 (ex: add(5,3);)
     """
 
-    pass
+    __slots__ = ()
 
 
 class BlockStatement(Statement):
     """ """
 
+    __slots__ = ("token", "statements")
+    fields = ("statements",)
+
     token: Token
     statements: List[Statement]
 
     def __init__(self, token: Token, statements: List[Statement]):
         self.token = token
-        self.value = self.token.literal.lower() == "true"
         self.statements = statements
 
     def token_literal(self) -> str:
         return self.token.literal
 
     def __str__(self):
-        output = ""
-        for stmt in self.statements:
-            output += str(stmt) + "\n"
-        return output.strip()
+        return "\n".join([str(stmt) for stmt in self.statements]).strip()
+
+
+# 파싱은 처음 한 번뿐이므로 노드마다 lock을 두지 않고 하나를 같이 쓴다.
+# 파싱 에러 목록과 hash consing 테이블도 원래 파서와 공유하므로 이 lock 안에서만 바뀐다.
+_lazy_parse_lock = RLock()
+
+
+class LazyBlockStatement(BlockStatement):
+    """본문을 처음 사용할 때 파싱하는 블록 명령문
+
+    Parser의 lazy_functions 모드에서 함수 본문으로 쓰인다.
+    파싱 시점에는 중괄호 짝만 맞춰 토큰 열을 보관해두고,
+    statements에 처음 접근할 때 (보통 첫 apply_function 때) AST를 만든다.
+
+    여러 스레드가 같은 본문에 처음 접근해도 한 번만 파싱하도록 lock을 건다.
+    파싱이 끝난 뒤에는 lock 없이 읽는다.
+    """
+
+    __slots__ = ("tokens", "_parse_func", "_statements")
+
+    tokens: Optional[List[Token]]
+
+    def __init__(
+        self,
+        token: Token,
+        tokens: List[Token],
+        parse_func: Callable[[List[Token]], BlockStatement],
+    ):
+        self.token = token
+        self.tokens = tokens
+        self._parse_func = parse_func
+        self._statements = None
+
+    @property
+    def parsed(self) -> bool:
+        return self._statements is not None
+
+    @property
+    def statements(self) -> List[Statement]:
+        statements = self._statements
+        if statements is None:
+            with _lazy_parse_lock:
+                statements = self._statements
+                if statements is None:
+                    statements = self._parse_func(self.tokens).statements
+                    self._statements = statements
+                    self.tokens = None
+                    self._parse_func = None
+        return statements
 
 
 class IfExpression(Expression):
     """조건 표현문"""
 
+    __slots__ = ("token", "condition", "consequence", "alternative")
+    fields = ("condition", "consequence", "alternative")
+
     token: Token
     condition: Expression
     consequence: BlockStatement
@@ -172,6 +333,8 @@ class IfExpression(Expression):
 class Identifier(Expression):
     """식별자 노드"""
 
+    __slots__ = ("token", "value")
+
     token: Token
     value: str
 
@@ -187,6 +350,9 @@ class Identifier(Expression):
 
 
 class FunctionLiteral(Expression):
+    __slots__ = ("token", "parameters", "body")
+    fields = ("parameters", "body")
+
     token: Token
     parameters: List[Identifier]
     body: BlockStatement
@@ -214,6 +380,9 @@ class LetStatement(Statement):
     5 + 2 : value(Expression)
     """
 
+    __slots__ = ("token", "name", "value")
+    fields = ("name", "value")
+
     token: Token
     name: Identifier
     value: Expression
@@ -235,6 +404,9 @@ class ReturnStatement(Statement):
     ex) return 5;
     """
 
+    __slots__ = ("token", "return_value")
+    fields = ("return_value",)
+
     token: Token
     return_value: Expression
 
@@ -249,7 +421,36 @@ class ReturnStatement(Statement):
         return f"{self.token.literal} {self.return_value.token_literal() if self.return_value else ''};"
 
 
+class WhileStatement(Statement):
+    """
+    ex) while (i < 10) { let i = i + 1; }
+
+    블록은 scope를 만들지 않으므로, 본문의 let은 바깥 변수를 다시 묶는다.
+    """
+
+    __slots__ = ("token", "condition", "body")
+    fields = ("condition", "body")
+
+    token: Token
+    condition: Expression
+    body: BlockStatement
+
+    def __init__(self, token: Token, condition: Expression, body: BlockStatement):
+        self.token = token
+        self.condition = condition
+        self.body = body
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self):
+        return f"while {self.condition} \n{{{self.body}}}"
+
+
 class ExpressionStatement(Statement):
+    __slots__ = ("token", "expression")
+    fields = ("expression",)
+
     token: Token
     expression: Expression
 
@@ -267,6 +468,9 @@ class ExpressionStatement(Statement):
 
 
 class Program(Node):
+    __slots__ = ("statements",)
+    fields = ("statements",)
+
     statements: List[Statement]
 
     def __init__(self, statements: Optional[List[Statement]] = None):
@@ -282,7 +486,4 @@ class Program(Node):
             return ""
 
     def __str__(self):
-        output = ""
-        for stmt in self.statements:
-            output += str(stmt) + "\n"
-        return output.strip()
+        return "\n".join([str(stmt) for stmt in self.statements]).strip()
@@ -0,0 +1,298 @@
+"""
+여러 개의 독립된 프로그램을 프로세스 풀에서 나눠 실행하는 배치 실행기
+
+GIL 때문에 한 프로세스에서는 evaluate가 코어 하나만 쓰므로,
+ProcessPoolExecutor의 worker 프로세스들에 프로그램을 나눠준다.
+
+- worker는 계속 살아있으면서, 시작할 때 prelude를 한 번 평가해 freeze한 Environment를 재사용한다.
+  각 프로그램은 prelude Environment를 fork한 자식 Environment에서 실행된다.
+- 작은 프로그램이 많을 때 프로세스 간 통신 비용을 줄이기 위해 chunk 단위로 보낸다.
+- 동시에 처리 중인 chunk 수를 제한하므로, 입력이 아무리 많아도 메모리는 일정하다.
+- 결과는 입력 순서대로(ordered=True) 또는 끝나는 순서대로 돌려준다.
+
+ThreadRunner는 같은 방식으로 ThreadPoolExecutor의 스레드들에서 실행한다.
+interpreter의 core는 여러 스레드에서 동시에 evaluate를 호출해도 되도록 되어 있다.
+
+- Lexer, Parser, 파싱 함수 registry는 파서 인스턴스마다 따로 가진다.
+- AST와 FunctionObj는 평가 중에 바뀌지 않는다.
+  (lazy 함수 본문만 예외인데, 처음 파싱할 때 lock을 건다.)
+- 함수 호출과 각 프로그램은 새 Environment에 쓰고, 바깥 Environment는 읽기만 한다.
+  여러 스레드가 같은 Environment를 직접 evaluate에 넘기지만 않으면 된다.
+- visitor의 dispatch 캐시처럼 모듈 수준에서 공유하는 캐시는 항상 같은 값을 넣으므로
+  동시에 채워도 결과가 같다.
+
+CLI
+python -m pinterpret.batch PROGRAMS [--workers N] [--prelude FILE] [--unordered] [--threads]
+
+PROGRAMS는 프로그램 파일이 들어있는 디렉토리이거나,
+한 줄에 {"id": ..., "source": ...} 하나씩 들어있는 JSONL 파일이다.
+결과는 한 줄에 하나씩 JSON으로 출력한다.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pinterpret.common import Object
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import ErrorObj, ReturnObj
+from pinterpret.parser import Parser
+
+Job = Tuple[str, str]  # (id, source)
+
+# worker 프로세스마다 한 번 평가해두는 prelude
+_prelude_env: Optional[Environment] = None
+
+
+def load_prelude(source: str) -> Environment:
+    """prelude를 평가하고 freeze한 Environment를 돌려준다.
+
+    프로그램은 fork한 자식 Environment에서 실행한다.
+    """
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    if parser.errors:
+        raise ValueError("invalid prelude : " + "; ".join(parser.errors))
+
+    env = Environment()
+    result = evaluate(program, env)
+    if isinstance(result, ErrorObj):
+        raise ValueError("invalid prelude : " + result.inspect())
+    return env.freeze()
+
+
+def init_worker(prelude: Optional[str]):
+    global _prelude_env
+    _prelude_env = load_prelude(prelude) if prelude else None
+    # prelude와 불러온 모듈의 객체들은 worker가 끝날 때까지 살아있으므로
+    # GC가 매번 다시 검사하지 않도록 permanent generation으로 옮긴다.
+    gc.freeze()
+
+
+def worker_prelude() -> Optional[Environment]:
+    """init_worker가 평가해 둔 이 worker 프로세스의 prelude"""
+    return _prelude_env
+
+
+def fork(prelude_env: Optional[Environment]) -> Environment:
+    return prelude_env.fork() if prelude_env is not None else Environment()
+
+
+def run_job(job_id: str, source: str, prelude_env: Optional[Environment]) -> Dict:
+    """프로그램 하나를 실행한다.
+
+    파싱이나 평가 중에 예외가 나도 그 프로그램의 에러 결과로 돌려주므로,
+    같은 chunk의 다른 프로그램 결과는 잃지 않는다.
+    """
+    try:
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        if parser.errors:
+            return {"id": job_id, "error": "; ".join(parser.errors)}
+
+        result = evaluate(program, fork(prelude_env))
+    except Exception as e:
+        return {"id": job_id, "error": f"{type(e).__name__}: {e}"}
+
+    return result_record(job_id, result)
+
+
+def result_record(job_id: str, result: Object) -> Dict:
+    """평가 결과를 JSON으로 보낼 수 있는 dict로 만든다."""
+    if isinstance(result, ReturnObj):
+        result = result.value
+    if isinstance(result, ErrorObj):
+        return {"id": job_id, "error": result.message}
+    return {"id": job_id, "type": result.type.value, "result": result.inspect()}
+
+
+def run_jobs(jobs: List[Job], prelude_env: Optional[Environment]) -> List[Dict]:
+    return [run_job(job_id, source, prelude_env) for job_id, source in jobs]
+
+
+def run_chunk(jobs: List[Job]) -> List[Dict]:
+    """worker 프로세스에서 실행된다."""
+    return run_jobs(jobs, _prelude_env)
+
+
+def chunked(jobs: Iterable[Job], size: int) -> Iterator[List[Job]]:
+    it = iter(jobs)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+class Runner:
+    """프로그램 묶음을 executor에 chunk 단위로 나눠 실행하는 공통 로직
+
+    submit_chunk에서 chunk 하나를 executor에 넘기는 방법만 정하면 된다.
+    """
+
+    executor: Executor
+    workers: int
+    chunksize: int
+    max_pending: int  # 동시에 처리 중인 chunk 수의 상한
+
+    def __init__(self, executor: Executor, workers: int, chunksize: int):
+        self.executor = executor
+        self.workers = workers
+        self.chunksize = chunksize
+        self.max_pending = workers * 4
+
+    def submit_chunk(self, chunk: List[Job]) -> Future:
+        raise NotImplementedError
+
+    def run(self, jobs: Iterable[Job], ordered: bool = True) -> Iterator[Dict]:
+        chunks = chunked(jobs, self.chunksize)
+        if ordered:
+            return self._run_ordered(chunks)
+        return self._run_unordered(chunks)
+
+    def _run_ordered(self, chunks: Iterator[List[Job]]) -> Iterator[Dict]:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(self.submit_chunk(chunk))
+            if len(pending) >= self.max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def _run_unordered(self, chunks: Iterator[List[Job]]) -> Iterator[Dict]:
+        pending: Set[Future] = set()
+        for chunk in chunks:
+            pending.add(self.submit_chunk(chunk))
+            if len(pending) >= self.max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class BatchRunner(Runner):
+    """worker 프로세스를 띄워두고 여러 번의 배치에 재사용한다.
+
+    with BatchRunner(workers=4, prelude=...) as runner:
+        for result in runner.run(jobs):
+            ...
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        prelude: Optional[str] = None,
+        chunksize: int = 16,
+    ):
+        if prelude:
+            # worker를 띄우기 전에 prelude의 에러를 확인한다.
+            load_prelude(prelude)
+
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(prelude,)
+        )
+        super().__init__(executor, workers, chunksize)
+
+    def submit_chunk(self, chunk: List[Job]) -> Future:
+        return self.executor.submit(run_chunk, chunk)
+
+
+class ThreadRunner(Runner):
+    """같은 프로세스의 스레드들에서 실행한다.
+
+    prelude는 한 번만 평가해서 모든 스레드가 같이 쓴다.
+    각 프로그램은 prelude Environment의 자식 Environment에서 실행되므로
+    prelude Environment에는 쓰지 않는다.
+
+    GIL이 있는 CPython에서는 evaluate가 동시에 하나만 실행되므로 처리량은 늘지 않고,
+    free-threaded CPython에서 코어를 나눠 쓴다.
+    """
+
+    prelude_env: Optional[Environment]
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        prelude: Optional[str] = None,
+        chunksize: int = 16,
+    ):
+        self.prelude_env = load_prelude(prelude) if prelude else None
+        workers = workers or os.cpu_count() or 1
+        super().__init__(ThreadPoolExecutor(max_workers=workers), workers, chunksize)
+
+    def submit_chunk(self, chunk: List[Job]) -> Future:
+        return self.executor.submit(run_jobs, chunk, self.prelude_env)
+
+
+def iter_jobs(path: str) -> Iterator[Job]:
+    """디렉토리 안의 파일들, 또는 JSONL 파일의 각 줄을 (id, source)로 읽는다."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            file_path = os.path.join(path, name)
+            if os.path.isfile(file_path):
+                with open(file_path, encoding="utf-8") as f:
+                    yield name, f.read()
+        return
+
+    with open(path, encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield str(record.get("id", i)), record["source"]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pinterpret.batch", description="run many programs in parallel"
+    )
+    parser.add_argument("programs", help="directory of programs or JSONL file")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--prelude", help="file evaluated once in every worker")
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument(
+        "--unordered", action="store_true", help="print results as they complete"
+    )
+    parser.add_argument(
+        "--threads", action="store_true", help="use threads instead of processes"
+    )
+    args = parser.parse_args(argv)
+
+    prelude = None
+    if args.prelude:
+        with open(args.prelude, encoding="utf-8") as f:
+            prelude = f.read()
+
+    runner_cls = ThreadRunner if args.threads else BatchRunner
+    with runner_cls(args.workers, prelude, args.chunksize) as runner:
+        for result in runner.run(iter_jobs(args.programs), ordered=not args.unordered):
+            sys.stdout.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+내장 함수
+
+파이썬으로 구현한 함수를 BuiltinObj로 감싸 이름으로 등록해 둔다.
+evaluate는 Environment에서 찾지 못한 식별자를 여기서 찾으므로,
+같은 이름으로 let을 하면 내장 함수를 가릴 수 있다.
+
+내장 함수는 평가된 인자를 위치 인자로 받아 Object를 돌려준다.
+apply_function은 Environment를 만들지 않고 바로 호출하며,
+arity를 정해두면 인자 개수는 호출 전에 검사한다.
+잘못된 인자는 예외가 아니라 ErrorObj로 알린다.
+
+@builtin("twice", arity=1)
+def twice(x: Object) -> Object:
+    ...
+"""
+
+from array import array
+from itertools import compress
+from typing import Callable, Dict, List, Optional
+
+from pinterpret.common import Object
+from pinterpret.obj import (
+    INT64_MAX,
+    INT64_MIN,
+    ArrayObj,
+    BooleanObj,
+    BuiltinObj,
+    ErrorObj,
+    FunctionObj,
+    HashObj,
+    IntegerObj,
+    StringObj,
+    is_hashable,
+)
+
+BuiltinFunction = Callable[..., Object]
+
+BUILTINS: Dict[str, BuiltinObj] = {}
+
+
+def builtin(
+    name: str, arity: Optional[int] = None
+) -> Callable[[BuiltinFunction], BuiltinFunction]:
+    """arity가 None이면 인자 개수를 fn에서 직접 검사한다."""
+
+    def register(fn: BuiltinFunction) -> BuiltinFunction:
+        BUILTINS[name] = BuiltinObj(name, fn, arity)
+        return fn
+
+    return register
+
+
+def lookup(name: str) -> BuiltinObj:
+    return BUILTINS[name]
+
+
+def call_builtin(fn: BuiltinObj, args: List[Object]) -> Object:
+    if fn.arity is not None and len(args) != fn.arity:
+        return wrong_arguments(fn.name, fn.arity, args)
+    return fn.fn(*args)
+
+
+def wrong_arguments(name: str, expected: int, args: List[Object]) -> ErrorObj:
+    return ErrorObj(
+        f"wrong number of arguments : {name} expects {expected}, got {len(args)}"
+    )
+
+
+def not_supported(name: str, *args: Object) -> ErrorObj:
+    types = ", ".join(str(arg.type) for arg in args)
+    return ErrorObj(f"not supported : {name}({types})")
+
+
+def is_callable(obj: Object) -> bool:
+    return isinstance(obj, (FunctionObj, BuiltinObj))
+
+
+def all_integers(args) -> bool:
+    return all(isinstance(arg, IntegerObj) for arg in args)
+
+
+@builtin("abs", arity=1)
+def abs_(x: Object) -> Object:
+    if not isinstance(x, IntegerObj):
+        return not_supported("abs", x)
+    return x if x.value >= 0 else IntegerObj(-x.value)
+
+
+@builtin("min")
+def min_(*args: Object) -> Object:
+    """min(a, b, ...) : 인자가 하나 이상이어야 한다."""
+    if not args:
+        return wrong_arguments("min", 1, [])
+    if not all_integers(args):
+        return not_supported("min", *args)
+    return min(args, key=lambda arg: arg.value)
+
+
+@builtin("max")
+def max_(*args: Object) -> Object:
+    """max(a, b, ...) : 인자가 하나 이상이어야 한다."""
+    if not args:
+        return wrong_arguments("max", 1, [])
+    if not all_integers(args):
+        return not_supported("max", *args)
+    return max(args, key=lambda arg: arg.value)
+
+
+@builtin("pow", arity=2)
+def pow_(base: Object, exponent: Object) -> Object:
+    """정수만 다루므로 지수는 0 이상이어야 한다."""
+    if not all_integers((base, exponent)):
+        return not_supported("pow", base, exponent)
+    if exponent.value < 0:
+        return ErrorObj(f"negative exponent : pow(..., {exponent.value})")
+    return IntegerObj(base.value**exponent.value)
+
+
+@builtin("len", arity=1)
+def len_(x: Object) -> Object:
+    if isinstance(x, (ArrayObj, HashObj)):
+        return IntegerObj(len(x))
+    elif isinstance(x, StringObj):
+        # rope를 펼치지 않고 길이를 안다.
+        return IntegerObj(x.length)
+    return not_supported("len", x)
+
+
+@builtin("str", arity=1)
+def str_(x: Object) -> Object:
+    """str(x) : x를 출력한 모양의 문자열"""
+    if isinstance(x, StringObj):
+        return x
+    return StringObj(x.inspect())
+
+
+def apply_vectorized(fn: Object, arr: ArrayObj):
+    """정수 배열의 모든 원소에 fn을 한 번에 적용한 NumPy 배열, 그럴 수 없으면 None
+
+    NumPy가 있고 fn이 배열 연산으로 평가할 수 있는 함수일 때만 된다. (pinterpret.columnar)
+    int64로 계산하다가 넘치면 None을 돌려주므로, 원소마다 apply_function을 호출한 결과와 같다.
+    """
+    if arr.ints is None or not isinstance(fn, FunctionObj):
+        return None
+    try:
+        from pinterpret.columnar import Unvectorizable, apply_columns, import_numpy
+
+        np = import_numpy()
+    except ImportError:
+        return None
+
+    column = np.frombuffer(arr.ints, dtype=np.int64)
+    try:
+        return apply_columns(fn, column, len(column))
+    except Unvectorizable:
+        return None
+
+
+def ints_of(column) -> array:
+    """int64 NumPy 배열 -> array('q')"""
+    ints = array("q")
+    ints.frombytes(column.astype("int64").tobytes())
+    return ints
+
+
+@builtin("map", arity=2)
+def map_(fn: Object, arr: Object) -> Object:
+    """map(fn, arr) : [fn(arr[0]), fn(arr[1]), ...]"""
+    if not is_callable(fn) or not isinstance(arr, ArrayObj):
+        return not_supported("map", fn, arr)
+
+    column = apply_vectorized(fn, arr)
+    if column is not None:
+        if column.dtype.kind == "b":
+            return ArrayObj([BooleanObj(bool(value)) for value in column])
+        return ArrayObj.from_ints(ints_of(column))
+
+    from pinterpret.evaluator import apply_function
+
+    results = []
+    for element in arr.elements:
+        result = apply_function(fn, [element])
+        if isinstance(result, ErrorObj):
+            return result
+        results.append(result)
+    return ArrayObj(results)
+
+
+@builtin("filter", arity=2)
+def filter_(fn: Object, arr: Object) -> Object:
+    """filter(fn, arr) : fn(x)가 참인 원소 x만 남긴 배열"""
+    if not is_callable(fn) or not isinstance(arr, ArrayObj):
+        return not_supported("filter", fn, arr)
+
+    column = apply_vectorized(fn, arr)
+    if column is not None:
+        mask = column if column.dtype.kind == "b" else column != 0
+        return ArrayObj.from_ints(array("q", compress(arr.ints, mask.tolist())))
+
+    from pinterpret.evaluator import apply_function, is_truthy
+
+    results = []
+    for element in arr.elements:
+        result = apply_function(fn, [element])
+        if isinstance(result, ErrorObj):
+            return result
+        if is_truthy(result):
+            results.append(element)
+    return ArrayObj(results)
+
+
+@builtin("sum", arity=1)
+def sum_(arr: Object) -> Object:
+    """sum(arr) : 정수 배열의 합"""
+    if not isinstance(arr, ArrayObj):
+        return not_supported("sum", arr)
+    if arr.ints is not None:
+        # array('q')를 C 수준에서 더하며, 결과는 파이썬 정수이므로 넘치지 않는다.
+        return IntegerObj(sum(arr.ints))
+
+    elements = arr.elements
+    if not all_integers(elements):
+        return not_supported("sum", *elements)
+    return IntegerObj(sum(element.value for element in elements))
+
+
+@builtin("range")
+def range_(*args: Object) -> Object:
+    """range(stop), range(start, stop) : [start, start + 1, ..., stop - 1]"""
+    if len(args) not in (1, 2):
+        return wrong_arguments("range", 2, list(args))
+    if not all_integers(args):
+        return not_supported("range", *args)
+
+    start, stop = (0, args[0].value) if len(args) == 1 else (a.value for a in args)
+    if stop > start and not (INT64_MIN <= start and stop - 1 <= INT64_MAX):
+        return ErrorObj(f"out of range : range({start}, {stop})")
+    return ArrayObj.from_ints(array("q", range(start, stop)))
+
+
+@builtin("put", arity=3)
+def put(h: Object, key: Object, value: Object) -> Object:
+    """put(h, key, value) : h에 key -> value를 더한 새 해시. h는 그대로이다."""
+    if not isinstance(h, HashObj):
+        return not_supported("put", h, key, value)
+    if not is_hashable(key):
+        return ErrorObj(f"unusable as hash key : {key.type}")
+    return h.put(key, value)
+
+
+@builtin("keys", arity=1)
+def keys(h: Object) -> Object:
+    if not isinstance(h, HashObj):
+        return not_supported("keys", h)
+    return ArrayObj(key for key, _ in h.pairs_list())
+
+
+@builtin("values", arity=1)
+def values(h: Object) -> Object:
+    if not isinstance(h, HashObj):
+        return not_supported("values", h)
+    return ArrayObj(value for _, value in h.pairs_list())
+
+
+@builtin("pmap", arity=2)
+def pmap(fn: Object, n: Object) -> Object:
+    """pmap(fn, n) : [fn(0), fn(1), ..., fn(n - 1)]
+
+    호출들을 여러 프로세스에서 나눠 실행한다. (pinterpret.parallel)
+    fn의 결과는 정수, 불, null, 문자열, 정수만 담은 배열이어야 한다.
+    """
+    if not is_callable(fn):
+        return ErrorObj(f"not a function : pmap({fn.type}, ...)")
+    if not isinstance(n, IntegerObj) or n.value < 0:
+        return ErrorObj(f"not a count : pmap(..., {n.inspect()})")
+
+    from pinterpret.parallel import default_pool
+
+    return default_pool().call_all([(fn, [IntegerObj(i)]) for i in range(n.value)])
+
+
+@builtin("pcall")
+def pcall(*fns: Object) -> Object:
+    """pcall(f, g, ...) : [f(), g(), ...]
+
+    인자 없는 함수들을 여러 프로세스에서 나눠 실행한다. (pinterpret.parallel)
+    결과의 타입은 pmap과 같이 제한된다.
+    """
+    for fn in fns:
+        if not is_callable(fn):
+            return ErrorObj(f"not a function : pcall({fn.type})")
+
+    from pinterpret.parallel import default_pool
+
+    return default_pool().call_all([(fn, []) for fn in fns])
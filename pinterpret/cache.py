@@ -0,0 +1,199 @@
+"""
+파싱 결과 디스크 캐시
+
+__pycache__처럼 소스코드를 파싱한 결과(Program)를 디렉토리에 저장해두고,
+같은 소스코드를 다시 실행할 때 Lexer/Parser를 건너뛴다.
+
+캐시 키는 소스코드와 pinterpret 버전의 해시값이므로,
+소스코드가 바뀌면 자연스럽게 다른 항목을 보게 된다.
+오래 쓰이지 않은 항목은 전체 크기가 max_size를 넘지 않도록 LRU 순서로 지운다.
+
+캐시 파일은 pickle이므로, 읽을 때는 AST 노드와 토큰 클래스(AST_GLOBALS)만 불러온다.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import FrozenSet, List, Optional, Tuple
+
+from pinterpret import __version__
+from pinterpret.ast import Program
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+
+DEFAULT_CACHE_DIR = "__pinterpret_cache__"
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024  # 64MB
+
+CACHE_SUFFIX = ".cache"
+
+# 캐시한 Program의 pickle이 가리킬 수 있는 (모듈, 이름)
+AST_GLOBALS = frozenset(
+    [("pinterpret.token", "Token"), ("pinterpret.token", "TokenType")]
+    + [
+        ("pinterpret.ast", name)
+        for name in (
+            "Program",
+            "LetStatement",
+            "ReturnStatement",
+            "WhileStatement",
+            "ExpressionStatement",
+            "BlockStatement",
+            "Identifier",
+            "IntegerLiteral",
+            "BoolLiteral",
+            "StringLiteral",
+            "ArrayLiteral",
+            "HashLiteral",
+            "PrefixExpression",
+            "InfixExpression",
+            "IndexExpression",
+            "IfExpression",
+            "FunctionLiteral",
+            "CallExpression",
+        )
+    ]
+)
+
+
+class RestrictedUnpickler(pickle.Unpickler):
+    """allowed에 있는 (모듈, 이름)만 불러오는 Unpickler
+
+    점이 들어간 이름은 속성을 따라가므로 (ex: os.getpid) 받지 않는다.
+    """
+
+    allowed: FrozenSet[Tuple[str, str]] = frozenset()
+
+    def find_class(self, module: str, name: str):
+        if "." in name or (module, name) not in self.allowed:
+            raise pickle.UnpicklingError(f"not allowed : {module}.{name}")
+        return super().find_class(module, name)
+
+
+class ProgramUnpickler(RestrictedUnpickler):
+    allowed = AST_GLOBALS
+
+
+class ProgramCache:
+    directory: str
+    max_size: int  # 캐시 디렉토리 전체 크기의 상한 (bytes)
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, source: str, kind: str = "ast") -> str:
+        """소스코드에 대한 캐시 키
+
+        kind는 같은 소스코드에서 나온 서로 다른 형태(AST, 최적화된 형태 등)를 구분한다.
+        """
+        digest = hashlib.sha256()
+        digest.update(__version__.encode())
+        digest.update(b"\0")
+        digest.update(kind.encode())
+        digest.update(b"\0")
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, source: str, kind: str = "ast") -> Optional[object]:
+        path = self.path(self.key(source, kind))
+        try:
+            with open(path, "rb") as f:
+                value = ProgramUnpickler(f).load()
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # 깨졌거나 호환되지 않는 항목은 버린다.
+            self.remove(path)
+            return None
+
+        # LRU 순서를 위해 최근 사용 시각을 갱신한다.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, source: str, value: object, kind: str = "ast") -> bool:
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError):
+            return False
+
+        if len(data) > self.max_size:
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록, 임시 파일에 쓰고 바꿔치기한다.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(self.key(source, kind)))
+        except OSError:
+            self.remove(tmp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def parse(self, source: str) -> Tuple[Program, List[str]]:
+        """캐시에 있으면 꺼내 쓰고, 없으면 파싱해서 캐시에 넣는다.
+
+        에러가 있는 프로그램은 에러를 매번 보여줄 수 있도록 캐시하지 않는다.
+        """
+        program = self.get(source)
+        if program is not None:
+            return program, []
+
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        if not parser.errors:
+            self.put(source, program)
+        return program, parser.errors
+
+    def entries(self) -> List[Tuple[str, float, int]]:
+        """(경로, 최근 사용 시각, 크기)의 목록"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+
+        for name in names:
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, _, size in self.entries())
+
+    def evict(self):
+        """전체 크기가 max_size 이하가 될 때까지 가장 오래 쓰이지 않은 항목부터 지운다."""
+        entries = sorted(self.entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_size:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            self.remove(path)
+
+    @staticmethod
+    def remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,410 @@
+"""
+열(column) 단위 평가
+
+자유 식별자가 길이가 같은 NumPy 배열에 묶인 프로그램을, 행마다 evaluate를 호출하는 대신
+배열 연산으로 한 번에 평가한다.
+
+- 산술/비교 중위 표현식, 전위 표현식 -> NumPy 배열 연산
+- if 표현식 -> np.where (양쪽 가지를 모두 계산한 뒤 조건으로 고른다)
+- 함수 호출 -> 함수 본문을 인자 배열로 그대로 평가 (인라인)
+- let 문 -> 배열을 이름에 묶음
+
+재귀 호출, else 없는 if, 블록 안의 return/let, 0으로 나누기, 타입 오류처럼
+배열 연산으로 표현할 수 없는 경우는 행마다 evaluate를 호출하는 방식으로 되돌아간다.
+정수는 int64로 계산한다. int64 범위를 넘는 리터럴이나 계산 중에 넘친 값이 있으면
+파이썬 정수로 계산하는 evaluate와 결과가 달라지므로, 이때도 행마다 evaluate로 되돌아간다.
+
+NumPy는 선택 의존성이므로 이 모듈의 함수를 호출할 때 불러온다.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from pinterpret.ast import (
+    Node,
+    Program,
+    Statement,
+    LetStatement,
+    ReturnStatement,
+    ExpressionStatement,
+    BlockStatement,
+    Identifier,
+    IntegerLiteral,
+    BoolLiteral,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    FunctionLiteral,
+    CallExpression,
+)
+from pinterpret.common import Object
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.obj import (
+    INT64_MAX,
+    INT64_MIN,
+    BooleanObj,
+    FunctionObj,
+    IntegerObj,
+    ReturnObj,
+)
+
+
+def import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "columnar evaluation requires numpy, install it with `pip install numpy`"
+        ) from e
+    return numpy
+
+
+class Unvectorizable(Exception):
+    """배열 연산으로 평가할 수 없는 구문을 만났을 때"""
+
+
+class ColumnFunction:
+    """열 단위 평가 중의 함수 값"""
+
+    __slots__ = ("node", "env")
+
+    def __init__(self, node: FunctionLiteral, env: Environment):
+        self.node = node
+        self.env = env
+
+
+class ColumnarEvaluator:
+    def __init__(self, size: int):
+        self.np = import_numpy()
+        self.size = size
+        # 지금 본문을 평가하고 있는 함수들 (재귀 호출 감지용)
+        self.calling: List[FunctionLiteral] = []
+
+    # 값 종류
+    def is_int(self, value) -> bool:
+        if isinstance(value, self.np.ndarray):
+            return value.dtype.kind in "iu"
+        return isinstance(value, (int, self.np.integer)) and not isinstance(
+            value, (bool, self.np.bool_)
+        )
+
+    def is_bool(self, value) -> bool:
+        if isinstance(value, self.np.ndarray):
+            return value.dtype.kind == "b"
+        return isinstance(value, (bool, self.np.bool_))
+
+    def check_int(self, value):
+        if not self.is_int(value):
+            raise Unvectorizable(f"not an integer : {type(value).__name__}")
+        return value
+
+    def check_range(self, value: int) -> int:
+        if not INT64_MIN <= value <= INT64_MAX:
+            raise Unvectorizable("integer out of int64 range")
+        return value
+
+    def check_overflow(self, overflow):
+        if self.np.any(overflow):
+            raise Unvectorizable("integer overflow")
+
+    def truthy(self, value):
+        if self.is_bool(value):
+            return value
+        elif self.is_int(value):
+            return value != 0
+        raise Unvectorizable(f"not a condition : {type(value).__name__}")
+
+    def from_object(self, value: Object):
+        if isinstance(value, IntegerObj):
+            return self.check_range(value.value)
+        elif isinstance(value, BooleanObj):
+            return value.value
+        elif isinstance(value, FunctionObj):
+            # FunctionObj도 parameters와 body를 가지므로 함수 리터럴처럼 다룬다.
+            return ColumnFunction(value, value.env)
+        raise Unvectorizable(f"not supported : {value.type}")
+
+    def run(self, program: Program, env: Environment):
+        value = self.evaluate_statements(program.statements, env, top_level=True)
+        if isinstance(value, ColumnFunction) or value is None:
+            raise Unvectorizable("result is not an integer or boolean")
+        return value
+
+    def evaluate_statements(
+        self, stmts: Sequence[Statement], env: Environment, top_level: bool
+    ):
+        result = None
+        for stmt in stmts:
+            if isinstance(stmt, ReturnStatement):
+                if not top_level:
+                    raise Unvectorizable("return inside block")
+                return self.evaluate(stmt.return_value, env)
+            elif isinstance(stmt, LetStatement):
+                if not top_level:
+                    raise Unvectorizable("let inside block")
+                env.set(stmt.name.value, self.evaluate(stmt.value, env))
+                result = None
+            elif isinstance(stmt, ExpressionStatement):
+                result = self.evaluate(stmt.expression, env)
+            else:
+                raise Unvectorizable(f"not supported : {type(stmt).__name__}")
+        return result
+
+    def evaluate(self, node: Optional[Node], env: Environment):
+        np = self.np
+        if isinstance(node, IntegerLiteral):
+            return self.check_range(node.value)
+
+        elif isinstance(node, BoolLiteral):
+            return node.value
+
+        elif isinstance(node, Identifier):
+            value, ok = env.get(node.value)
+            if not ok:
+                raise Unvectorizable("identifier not found : " + node.value)
+            if isinstance(value, Object):
+                # 함수 본문을 평가할 때 evaluate로 만든 바깥 Environment에서 온 값
+                return self.from_object(value)
+            return value
+
+        elif isinstance(node, PrefixExpression):
+            right = self.evaluate(node.right, env)
+            if node.operator == "-":
+                self.check_overflow(np.equal(self.check_int(right), INT64_MIN))
+                return -right
+            elif node.operator == "!":
+                if self.is_bool(right):
+                    return np.logical_not(right)
+                # 정수는 0이어도 !는 false가 된다. (evaluate_bang_prefix_expression)
+                self.check_int(right)
+                return False
+            raise Unvectorizable(f"not supported : {node.operator}")
+
+        elif isinstance(node, InfixExpression):
+            return self.evaluate_infix(node, env)
+
+        elif isinstance(node, IfExpression):
+            return self.evaluate_if(node, env)
+
+        elif isinstance(node, FunctionLiteral):
+            return ColumnFunction(node, env)
+
+        elif isinstance(node, CallExpression):
+            function = self.evaluate(node.function, env)
+            if not isinstance(function, ColumnFunction):
+                raise Unvectorizable("not a function")
+            if function.node in self.calling:
+                raise Unvectorizable("recursive call")
+
+            args = [self.evaluate(arg, env) for arg in node.arguments]
+            extended_env = Environment(function.env)
+            for param, arg in zip(function.node.parameters, args):
+                extended_env.set(param.value, arg)
+
+            self.calling.append(function.node)
+            try:
+                body = function.node.body.statements
+                return self.evaluate_statements(body, extended_env, top_level=True)
+            finally:
+                self.calling.pop()
+
+        raise Unvectorizable(f"not supported : {type(node).__name__}")
+
+    def evaluate_infix(self, node: InfixExpression, env: Environment):
+        np = self.np
+        left = self.evaluate(node.left, env)
+        right = self.evaluate(node.right, env)
+        operator = node.operator
+
+        if operator in ("+", "-", "*", "/"):
+            # 파이썬 정수끼리 계산하지 않도록 int64로 맞추고, 넘쳤는지는 직접 확인한다.
+            left = np.int64(self.check_int(left)) if isinstance(left, int) else left
+            right = np.int64(self.check_int(right)) if isinstance(right, int) else right
+            self.check_int(left)
+            self.check_int(right)
+            return self.evaluate_arithmetic(operator, left, right)
+
+        elif operator in ("<", ">"):
+            self.check_int(left)
+            self.check_int(right)
+            if operator == "<":
+                return left < right
+            else:
+                return left > right
+
+        elif operator in ("==", "!="):
+            if not (
+                (self.is_int(left) and self.is_int(right))
+                or (self.is_bool(left) and self.is_bool(right))
+            ):
+                raise Unvectorizable("type mismatch")
+            if operator == "==":
+                return np.equal(left, right)
+            return np.not_equal(left, right)
+
+        raise Unvectorizable(f"not supported : {operator}")
+
+    def evaluate_arithmetic(self, operator: str, left, right):
+        """int64 사칙연산. 한 행이라도 넘치면 Unvectorizable을 낸다.
+
+        NumPy는 넘친 값을 조용히 감싸므로 (wraparound) 결과를 보고 넘쳤는지 판단한다.
+        """
+        np = self.np
+        with np.errstate(over="ignore"):
+            if operator == "+":
+                result = left + right
+                # 부호가 같은 두 수를 더했는데 결과의 부호가 다르면 넘친 것이다.
+                self.check_overflow(((left ^ result) & (right ^ result)) < 0)
+            elif operator == "-":
+                result = left - right
+                self.check_overflow(((left ^ right) & (left ^ result)) < 0)
+            elif operator == "*":
+                result = left * right
+                divisor = np.where(left == 0, 1, left)
+                self.check_overflow(
+                    (left != 0) & (result // divisor != right)
+                    | (left == -1) & (right == INT64_MIN)
+                )
+            else:
+                if np.any(np.asarray(right) == 0):
+                    raise Unvectorizable("division by zero")
+                self.check_overflow((left == INT64_MIN) & (right == -1))
+                result = left // right
+        return result
+
+    def evaluate_if(self, node: IfExpression, env: Environment):
+        np = self.np
+        condition = self.truthy(self.evaluate(node.condition, env))
+
+        if not isinstance(condition, np.ndarray):
+            # 모든 행에서 조건이 같으면 한쪽 가지만 평가한다.
+            if condition:
+                return self.evaluate_block(node.consequence, env)
+            elif node.alternative is not None:
+                return self.evaluate_block(node.alternative, env)
+            raise Unvectorizable("if without else")
+
+        if node.alternative is None:
+            if condition.all():
+                return self.evaluate_block(node.consequence, env)
+            raise Unvectorizable("if without else")
+
+        consequence = self.evaluate_block(node.consequence, env)
+        alternative = self.evaluate_block(node.alternative, env)
+        if not (
+            (self.is_int(consequence) and self.is_int(alternative))
+            or (self.is_bool(consequence) and self.is_bool(alternative))
+        ):
+            raise Unvectorizable("branches have different types")
+        return np.where(condition, consequence, alternative)
+
+    def evaluate_block(self, block: BlockStatement, env: Environment):
+        value = self.evaluate_statements(block.statements, env, top_level=False)
+        if value is None or isinstance(value, ColumnFunction):
+            raise Unvectorizable("branch is not an integer or boolean")
+        return value
+
+
+def to_column(value, size: int):
+    """결과 값을 길이 size의 배열로 맞춘다."""
+    np = import_numpy()
+    if isinstance(value, np.ndarray) and value.shape == (size,):
+        return value
+    if isinstance(value, (bool, np.bool_)) or (
+        isinstance(value, np.ndarray) and value.dtype.kind == "b"
+    ):
+        return np.full(size, value, dtype=bool)
+    return np.full(size, value, dtype=np.int64)
+
+
+def to_object(value) -> Object:
+    np = import_numpy()
+    if isinstance(value, (bool, np.bool_)):
+        return BooleanObj(bool(value))
+    return IntegerObj(int(value))
+
+
+def evaluate_rows(program: Program, columns: Dict[str, object], size: int):
+    """행마다 evaluate를 호출한다.
+
+    결과가 모두 정수이거나 모두 불이면 그 타입의 배열을, 아니면 Object 배열을 돌려준다.
+    """
+    np = import_numpy()
+    results = []
+    for i in range(size):
+        env = Environment()
+        for name, column in columns.items():
+            env.set(name, to_object(column[i]))
+        result = evaluate(program, env)
+        if isinstance(result, ReturnObj):
+            result = result.value
+        results.append(result)
+
+    if results and all(
+        isinstance(r, IntegerObj) and INT64_MIN <= r.value <= INT64_MAX for r in results
+    ):
+        return np.array([r.value for r in results], dtype=np.int64)
+    elif results and all(isinstance(r, BooleanObj) for r in results):
+        return np.array([r.value for r in results], dtype=bool)
+
+    column = np.empty(size, dtype=object)
+    column[:] = results
+    return column
+
+
+def apply_columns(function: FunctionObj, column, size: int):
+    """매개변수가 하나인 함수를 column의 모든 원소에 한 번에 적용한 배열을 돌려준다.
+
+    배열 연산으로 평가할 수 없으면 Unvectorizable을 낸다.
+    """
+    if len(function.parameters) != 1:
+        raise Unvectorizable("function must take one argument")
+
+    env = Environment(function.env)
+    env.set(function.parameters[0].value, column)
+    evaluator = ColumnarEvaluator(size)
+    evaluator.calling.append(function)
+    try:
+        value = evaluator.evaluate_statements(
+            function.body.statements, env, top_level=True
+        )
+    except OverflowError as e:
+        raise Unvectorizable("overflow") from e
+    if isinstance(value, ColumnFunction) or value is None:
+        raise Unvectorizable("result is not an integer or boolean")
+    return to_column(value, size)
+
+
+def int64_column(array):
+    """정수 배열을 int64 배열로 바꾼다. int64 범위를 넘는 값이 있으면 Unvectorizable을 낸다."""
+    np = import_numpy()
+    # uint64는 astype에서 조용히 음수로 감싸지므로 미리 확인한다.
+    if array.dtype.kind == "u" and array.size and array.max() > np.uint64(INT64_MAX):
+        raise Unvectorizable("column out of int64 range")
+    return array.astype(np.int64)
+
+
+def evaluate_columns(program: Program, columns: Mapping[str, object]):
+    """columns의 각 행에 대해 program을 평가한 결과를 배열로 돌려준다.
+
+    columns는 이름 -> 정수/불 배열이며, 모든 배열의 길이가 같아야 한다.
+    """
+    np = import_numpy()
+    arrays = {name: np.asarray(column) for name, column in columns.items()}
+    sizes = {len(array) for array in arrays.values()}
+    if len(sizes) > 1:
+        raise ValueError("columns must have the same length")
+    size = sizes.pop() if sizes else 1
+
+    for name, array in arrays.items():
+        if array.dtype.kind not in "iub":
+            raise TypeError(f"column {name} must be integer or boolean")
+
+    try:
+        env = Environment()
+        for name, array in arrays.items():
+            env.set(name, int64_column(array) if array.dtype.kind in "iu" else array)
+        value = ColumnarEvaluator(size).run(program, env)
+    except (Unvectorizable, OverflowError):
+        return evaluate_rows(program, arrays, size)
+    return to_column(value, size)
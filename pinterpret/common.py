@@ -9,9 +9,15 @@ class ObjectType(Enum):
     Return = "RETURN"
     Error = "ERROR"
     Function = "FUNCTION"
+    Builtin = "BUILTIN"
+    Array = "ARRAY"
+    Hash = "HASH"
+    String = "STRING"
 
 
 class Object(ABC):
+    __slots__ = ()
+
     type: ObjectType
 
     @abstractmethod
@@ -4,6 +4,20 @@ from pinterpret.common import Object
 
 
 class Environment:
+    """식별자 -> 객체
+
+    set은 자기 자신의 _store에만 쓰고, outer는 읽기만 한다.
+    그래서 여러 스레드가 같은 Environment를 outer로 하는 자식 Environment에서
+    동시에 평가해도 서로 영향을 주지 않는다.
+
+    prelude처럼 한 번 평가해두고 여러 번 쓰는 Environment는 freeze로 얼려두고,
+    실행할 때마다 fork로 자식 Environment를 만든다.
+    fork는 복사 없이 outer만 가리키므로 prelude 크기와 상관없이 O(1)이고,
+    let은 자식 Environment에만 쓰인다.
+    """
+
+    __slots__ = ("_store", "outer")
+
     _store: Dict[str, Object]
     outer: "Environment"
 
@@ -12,11 +26,54 @@ class Environment:
         self.outer = outer
 
     def get(self, key: str) -> Tuple[Object, bool]:
-        ret = self._store.get(key)
-        if ret is None and self.outer is not None:
-            ret = self.outer.get(key)
-        return ret, ret is not None
+        env = self
+        while env is not None:
+            ret = env._store.get(key)
+            if ret is not None:
+                return ret, True
+            env = env.outer
+        return None, False
 
     def set(self, key: str, val: Object) -> Object:
         self._store[key] = val
         return val
+
+    def __reduce__(self):
+        # _store와 outer를 state로 보내야 순환 참조를 pickle이 처리할 수 있다.
+        return type(self), (), (self._store, self.outer)
+
+    def __setstate__(self, state):
+        self._store, self.outer = state
+
+    def fork(self) -> "Environment":
+        """이 Environment를 outer로 하는 빈 자식 Environment"""
+        return Environment(self)
+
+    def freeze(self) -> "Environment":
+        """이 Environment와 그 outer들에 더 이상 쓸 수 없게 한다.
+
+        prelude에서 만든 함수들은 이 Environment를 붙잡고 있으므로,
+        새로 만들지 않고 그 자리에서 FrozenEnvironment로 바꾼다.
+        """
+        env = self
+        while env is not None and not isinstance(env, FrozenEnvironment):
+            env.__class__ = FrozenEnvironment
+            env = env.outer
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        return False
+
+
+class FrozenEnvironment(Environment):
+    """freeze된 Environment. 읽기만 할 수 있다."""
+
+    __slots__ = ()
+
+    def set(self, key: str, val: Object) -> Object:
+        raise TypeError(f"cannot assign {key} : environment is frozen")
+
+    @property
+    def frozen(self) -> bool:
+        return True
@@ -1,8 +1,9 @@
-from typing import List
+from typing import Iterable, Iterator, List
 
 from pinterpret.ast import (
     Node,
     IntegerLiteral,
+    StringLiteral,
     BoolLiteral,
     ExpressionStatement,
     Program,
@@ -12,12 +13,17 @@ from pinterpret.ast import (
     IfExpression,
     BlockStatement,
     ReturnStatement,
+    WhileStatement,
     LetStatement,
     Identifier,
     FunctionLiteral,
     CallExpression,
     Expression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
 )
+from pinterpret.builtins import BUILTINS, call_builtin
 from pinterpret.common import Object
 from pinterpret.environment import Environment
 from pinterpret.obj import (
@@ -27,6 +33,11 @@ from pinterpret.obj import (
     ReturnObj,
     ErrorObj,
     FunctionObj,
+    BuiltinObj,
+    ArrayObj,
+    HashObj,
+    StringObj,
+    is_hashable,
 )
 from pinterpret.token import TokenType
 
@@ -53,6 +64,9 @@ def evaluate(node: Node, env: Environment) -> Object:
     elif isinstance(node, ReturnStatement):
         return evaluate_return_statement(node, env)
 
+    elif isinstance(node, WhileStatement):
+        return evaluate_while_statement(node, env)
+
     elif isinstance(node, LetStatement):
         value = evaluate(node.value, env)
         if isinstance(value, ErrorObj):
@@ -62,12 +76,17 @@ def evaluate(node: Node, env: Environment) -> Object:
     elif isinstance(node, IntegerLiteral):
         return IntegerObj(node.value)
 
+    elif isinstance(node, StringLiteral):
+        return StringObj(node.value)
+
     elif isinstance(node, Identifier):
         val, ok = env.get(node.value)
         if ok:
             return val
-        else:
-            return ErrorObj("identifier not found : " + node.value)
+        builtin = BUILTINS.get(node.value)
+        if builtin is not None:
+            return builtin
+        return ErrorObj("identifier not found : " + node.value)
 
     elif isinstance(node, FunctionLiteral):
         return FunctionObj(parameters=node.parameters, body=node.body, env=env)
@@ -85,6 +104,26 @@ def evaluate(node: Node, env: Environment) -> Object:
             return args[0]
         return apply_function(function, args)
 
+    elif isinstance(node, ArrayLiteral):
+        elements = evaluate_expressions(node.elements, env)
+        if len(elements) == 1 and isinstance(elements[0], ErrorObj):
+            return elements[0]
+        return ArrayObj(elements)
+
+    elif isinstance(node, HashLiteral):
+        keys = evaluate_expressions(node.keys, env)
+        if len(keys) == 1 and isinstance(keys[0], ErrorObj):
+            return keys[0]
+        values = evaluate_expressions(node.values, env)
+        if len(values) == 1 and isinstance(values[0], ErrorObj):
+            return values[0]
+        return build_hash(keys, values)
+
+    elif isinstance(node, IndexExpression):
+        left = evaluate(node.left, env)
+        index = evaluate(node.index, env)
+        return index_operation(left, index)
+
     return NullObj()
 
 
@@ -97,6 +136,20 @@ def evaluate_statements(stmts: List[Statement], env: Environment) -> Object:
     return result
 
 
+def evaluate_stream(stmts: Iterable[Statement], env: Environment) -> Iterator[Object]:
+    """명령문을 하나씩 받아 평가하고, 그 결과를 바로 돌려준다.
+
+    평가가 끝난 명령문은 붙잡아 두지 않으므로 Parser.iter_statements와 함께 쓰면
+    프로그램 전체 AST를 만들지 않고도 실행할 수 있다.
+    마지막으로 돌려준 값은 evaluate(program)의 결과와 같다.
+    """
+    for stmt in stmts:
+        result = evaluate(stmt, env)
+        yield result
+        if isinstance(result, ReturnObj) or isinstance(result, ErrorObj):
+            return
+
+
 def evaluate_expressions(exprs: List[Expression], env: Environment) -> List[Object]:
     results = []
     for expr in exprs:
@@ -126,7 +179,10 @@ def evaluate_minus_prefix_expression(right_obj: Object) -> Object:
 
 def evaluate_prefix_expression(node: PrefixExpression, env: Environment):
     right_obj = evaluate(node.right, env)
+    return prefix_operation(node, right_obj)
+
 
+def prefix_operation(node: PrefixExpression, right_obj: Object) -> Object:
     if isinstance(right_obj, ErrorObj):
         return right_obj
 
@@ -141,12 +197,20 @@ def evaluate_prefix_expression(node: PrefixExpression, env: Environment):
 def evaluate_infix_expression(node: InfixExpression, env: Environment) -> Object:
     left_obj = evaluate(node.left, env)
     right_obj = evaluate(node.right, env)
+    return infix_operation(node, left_obj, right_obj)
+
 
+def infix_operation(
+    node: InfixExpression, left_obj: Object, right_obj: Object
+) -> Object:
     if isinstance(left_obj, ErrorObj):
         return left_obj
     elif isinstance(right_obj, ErrorObj):
         return right_obj
 
+    if isinstance(left_obj, StringObj) and isinstance(right_obj, StringObj):
+        return string_infix_operation(node.operator, left_obj, right_obj)
+
     if node.operator in ("+", "-", "*", "/", "<", ">"):
         if not (isinstance(left_obj, IntegerObj) and isinstance(right_obj, IntegerObj)):
             return ErrorObj(
@@ -191,6 +255,46 @@ def evaluate_infix_expression(node: InfixExpression, env: Environment) -> Object
         )
 
 
+def string_infix_operation(
+    operator: str, left_obj: StringObj, right_obj: StringObj
+) -> Object:
+    if operator == "+":
+        return StringObj.concat(left_obj, right_obj)
+    elif operator == "==":
+        return BooleanObj(left_obj == right_obj)
+    elif operator == "!=":
+        return BooleanObj(left_obj != right_obj)
+    return ErrorObj(f"not supported : {left_obj.type} {operator} {right_obj.type}")
+
+
+def index_operation(left: Object, index: Object) -> Object:
+    if isinstance(left, ErrorObj):
+        return left
+    elif isinstance(index, ErrorObj):
+        return index
+
+    if isinstance(left, HashObj):
+        if not is_hashable(index):
+            return ErrorObj(f"unusable as hash key : {index.type}")
+        value = left.get(index)
+        return NullObj() if value is None else value
+
+    if not (isinstance(left, ArrayObj) and isinstance(index, IntegerObj)):
+        return ErrorObj(f"not supported : {left.type}[{index.type}]")
+    if not 0 <= index.value < len(left):
+        return NullObj()
+    return left.get(index.value)
+
+
+def build_hash(keys: List[Object], values: List[Object]) -> Object:
+    result = HashObj()
+    for key, value in zip(keys, values):
+        if not is_hashable(key):
+            return ErrorObj(f"unusable as hash key : {key.type}")
+        result = result.put(key, value)
+    return result
+
+
 def evaluate_if_expression(node: IfExpression, env: Environment) -> Object:
     value = evaluate(node.condition, env)
     if isinstance(value, ErrorObj):
@@ -210,13 +314,38 @@ def evaluate_return_statement(node: ReturnStatement, env: Environment) -> Object
     return ReturnObj(value)
 
 
-def apply_function(fn: FunctionObj, args: List[Object]) -> Object:
-    extended_env = extend_function_env(fn, args)
-    evaluated = evaluate(fn.body, extended_env)
+def evaluate_while_statement(node: WhileStatement, env: Environment) -> Object:
+    """파이썬 반복문 하나로 실행한다.
+
+    재귀 호출과 달리 반복마다 Environment를 만들지 않고 파이썬 스택도 쌓이지 않으므로,
+    반복 횟수가 재귀 한도에 걸리지 않는다.
+    """
+    condition = node.condition
+    stmts = node.body.statements
+    while True:
+        value = evaluate(condition, env)
+        if isinstance(value, ErrorObj):
+            return value
+        if not is_truthy(value):
+            return NullObj()
+
+        result = evaluate_statements(stmts, env)
+        if isinstance(result, ReturnObj) or isinstance(result, ErrorObj):
+            return result
+
+
+def apply_function(fn: Object, args: List[Object]) -> Object:
+    if isinstance(fn, FunctionObj):
+        extended_env = extend_function_env(fn, args)
+        evaluated = evaluate(fn.body, extended_env)
 
-    if isinstance(evaluated, ReturnObj):
-        return evaluated.value
-    return evaluated
+        if isinstance(evaluated, ReturnObj):
+            return evaluated.value
+        return evaluated
+    elif isinstance(fn, BuiltinObj):
+        # 내장 함수는 Environment를 만들지 않고 바로 호출한다.
+        return call_builtin(fn, args)
+    return ErrorObj(f"not a function : {fn.type}")
 
 
 def extend_function_env(fn: FunctionObj, args: List[Object]) -> Environment:
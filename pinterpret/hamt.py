@@ -0,0 +1,199 @@
+"""
+Hash Array Mapped Trie (HAMT)
+
+바뀌지 않는(persistent) 맵. set은 원래 맵을 그대로 두고 새 맵을 돌려주는데,
+바뀐 키까지의 경로에 있는 노드만 새로 만들고 나머지 노드는 원래 맵과 공유한다.
+그래서 n개짜리 맵에 set을 해도 맵 전체를 복사하지 않고 O(log32 n)의 시간과 메모리만 쓴다.
+
+키의 해시를 5비트씩 잘라 단계마다 32갈래 중 하나로 내려간다.
+BitmapNode는 32칸을 다 만들지 않고, 쓰는 칸만 bitmap에 표시해 entries에 모아 둔다.
+entries의 원소는 (해시, 키, 값) 튜플이거나 하위 노드이다.
+해시가 같은 서로 다른 키는 CollisionNode에 모은다.
+
+키는 해시할 수 있어야 하며, hash()를 여러 번 부르므로 해시를 캐시해두는 키가 좋다. (obj.HashKey)
+
+m = HamtMap().set("a", 1).set("b", 2)
+m.get("a")  # 1
+"""
+
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+BITS = 5
+MASK = (1 << BITS) - 1
+HASH_MASK = (1 << 64) - 1  # 해시를 부호 없는 64비트로 다룬다.
+
+Leaf = Tuple[int, Any, Any]  # (해시, 키, 값)
+
+_MISSING = object()
+
+
+def popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+class CollisionNode:
+    """해시가 모두 같은 키들"""
+
+    __slots__ = ("hash", "leaves")
+
+    hash: int
+    leaves: Tuple[Leaf, ...]
+
+    def __init__(self, hash: int, leaves: Tuple[Leaf, ...]):
+        self.hash = hash
+        self.leaves = leaves
+
+    def get(self, key, default):
+        for _, k, v in self.leaves:
+            if k == key:
+                return v
+        return default
+
+    def set(self, shift: int, leaf: Leaf) -> Tuple[Any, bool]:
+        hash, key, value = leaf
+        if hash != self.hash:
+            return merge(shift, self.hash, self, hash, leaf), True
+
+        for i, (_, k, v) in enumerate(self.leaves):
+            if k == key:
+                if v is value:
+                    return self, False
+                leaves = self.leaves[:i] + (leaf,) + self.leaves[i + 1 :]
+                return CollisionNode(self.hash, leaves), False
+        return CollisionNode(self.hash, self.leaves + (leaf,)), True
+
+    def iter_leaves(self) -> Iterator[Leaf]:
+        return iter(self.leaves)
+
+
+class BitmapNode:
+    __slots__ = ("bitmap", "entries")
+
+    bitmap: int
+    entries: tuple
+
+    def __init__(self, bitmap: int, entries: tuple):
+        self.bitmap = bitmap
+        self.entries = entries
+
+    def set(self, shift: int, leaf: Leaf) -> Tuple["BitmapNode", bool]:
+        """leaf를 넣은 새 노드와, 키가 새로 추가되었는지를 돌려준다."""
+        hash, key, value = leaf
+        bit = 1 << ((hash >> shift) & MASK)
+        index = popcount(self.bitmap & (bit - 1))
+        entries = self.entries
+
+        if not self.bitmap & bit:
+            entries = entries[:index] + (leaf,) + entries[index:]
+            return BitmapNode(self.bitmap | bit, entries), True
+
+        entry = entries[index]
+        if isinstance(entry, tuple):
+            if entry[1] == key:
+                if entry[2] is value:
+                    return self, False
+                child, added = leaf, False
+            else:
+                child = merge(shift + BITS, entry[0], entry, hash, leaf)
+                added = True
+        else:
+            child, added = entry.set(shift + BITS, leaf)
+            if child is entry:
+                return self, False
+
+        entries = entries[:index] + (child,) + entries[index + 1 :]
+        return BitmapNode(self.bitmap, entries), added
+
+    def iter_leaves(self) -> Iterator[Leaf]:
+        # 깊이는 최대 64 / BITS 단계이므로 재귀로 충분하다.
+        for entry in self.entries:
+            if isinstance(entry, tuple):
+                yield entry
+            else:
+                yield from entry.iter_leaves()
+
+
+def merge(shift: int, a_hash: int, a, b_hash: int, b):
+    """같은 칸에 들어가는 두 원소(leaf 또는 CollisionNode)를 담는 하위 노드"""
+    if a_hash == b_hash:
+        # CollisionNode와 해시가 같은 leaf는 CollisionNode.set이 처리하므로, 둘 다 leaf이다.
+        return CollisionNode(a_hash, (a, b))
+
+    a_bit = 1 << ((a_hash >> shift) & MASK)
+    b_bit = 1 << ((b_hash >> shift) & MASK)
+    if a_bit == b_bit:
+        return BitmapNode(a_bit, (merge(shift + BITS, a_hash, a, b_hash, b),))
+    entries = (a, b) if a_bit < b_bit else (b, a)
+    return BitmapNode(a_bit | b_bit, entries)
+
+
+EMPTY_NODE = BitmapNode(0, ())
+
+
+class HamtMap:
+    """바뀌지 않는 맵"""
+
+    __slots__ = ("root", "size")
+
+    root: BitmapNode
+    size: int
+
+    def __init__(self, root: BitmapNode = EMPTY_NODE, size: int = 0):
+        self.root = root
+        self.size = size
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[Any, Any]]) -> "HamtMap":
+        result = cls()
+        for key, value in items:
+            result = result.set(key, value)
+        return result
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get(self, key, default: Optional[Any] = None):
+        hash_ = hash(key) & HASH_MASK
+        node = self.root
+        shift = 0
+        while True:
+            if isinstance(node, CollisionNode):
+                return node.get(key, default) if node.hash == hash_ else default
+
+            bit = 1 << ((hash_ >> shift) & MASK)
+            if not node.bitmap & bit:
+                return default
+            entry = node.entries[popcount(node.bitmap & (bit - 1))]
+            if isinstance(entry, tuple):
+                return entry[2] if entry[1] == key else default
+            node = entry
+            shift += BITS
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(self, key, value) -> "HamtMap":
+        root, added = self.root.set(0, (hash(key) & HASH_MASK, key, value))
+        if root is self.root:
+            return self
+        return HamtMap(root, self.size + added)
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        for _, key, value in self.root.iter_leaves():
+            yield key, value
+
+    def __iter__(self) -> Iterator[Any]:
+        for _, key, _ in self.root.iter_leaves():
+            yield key
+
+    def __reduce__(self):
+        # 문자열 등의 해시는 프로세스마다 다르므로, 받는 쪽에서 다시 넣는다.
+        return restore, (list(self.items()),)
+
+
+def restore(items) -> HamtMap:
+    """pickle에서 HamtMap을 복원한다.
+
+    classmethod를 가리키면 pickle이 builtins.getattr를 거치므로 모듈 수준 함수로 둔다.
+    """
+    return HamtMap.from_items(items)
@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from pinterpret.token import Token
 
 
@@ -10,12 +12,14 @@ class Lexer:
     pos: int  # current index of input string
     rpos: int  # next index of input string
     char: str  # character
+    tokens: Dict[str, Token]  # 같은 단어의 토큰은 하나만 만들어 공유한다.
 
     def __init__(self, input: str):
         self.input = input
         self.pos = 0
         self.rpos = 0
         self.char = ""
+        self.tokens = {}
         self.read_char()
 
     @property
@@ -42,6 +46,8 @@ class Lexer:
         elif self.char.isnumeric():
             # integer or float
             text = self.read_integer()
+        elif self.char == '"':
+            text = self.read_string()
         else:
             if self.char == "=" and self.peek_char() == "=":
                 self.read_char()
@@ -52,7 +58,11 @@ class Lexer:
             else:
                 text = self.char
             self.read_char()
-        return Token(text)
+
+        token = self.tokens.get(text)
+        if token is None:
+            token = self.tokens[text] = Token(text)
+        return token
 
     def skip_whitespace(self):
         while self.char in {" ", "\n", "\t", "\r"}:
@@ -66,6 +76,20 @@ class Lexer:
                 break
         return self.input[pos : self.pos]
 
+    def read_string(self):
+        """닫는 따옴표까지 읽는다. escape된 따옴표에서는 끝나지 않는다.
+
+        닫는 따옴표가 없으면 입력 끝까지 읽으며, 그 토큰은 ILLEGAL이 된다.
+        """
+        pos = self.pos
+        self.read_char()
+        while self.char not in ('"', ""):
+            if self.char == "\\":
+                self.read_char()
+            self.read_char()
+        self.read_char()
+        return self.input[pos : self.pos]
+
     def read_integer(self):
         pos = self.pos
         while True:
@@ -73,3 +97,24 @@ class Lexer:
             if not (self.char.isnumeric() or self.char == "."):
                 break
         return self.input[pos : self.pos]
+
+
+class TokenListLexer:
+    """
+    replay tokens which were already read by Lexer.
+    returns EOF token after the last one, like Lexer does.
+    """
+
+    tokens: List[Token]
+    pos: int  # index of next token
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def next_token(self) -> Token:
+        if self.pos >= len(self.tokens):
+            return Token("")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
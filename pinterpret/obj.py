@@ -1,17 +1,62 @@
-from typing import List
+from array import array
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
 
 from pinterpret.ast import Identifier, BlockStatement
 from pinterpret.common import Object, ObjectType
 from pinterpret.environment import Environment
+from pinterpret.hamt import HamtMap
+from pinterpret.shipping import reduce_function
+
+
+class HashKey:
+    """HashObj의 키
+
+    해시는 만들 때 한 번만 계산해 두므로, HAMT를 내려가며 hash()를 여러 번 불러도 다시 계산하지 않는다.
+    """
+
+    __slots__ = ("type", "value", "hash")
+
+    type: ObjectType
+    value: object
+    hash: int
+
+    def __init__(self, type: ObjectType, value):
+        self.type = type
+        self.value = value
+        self.hash = hash((type, value))
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other: "HashKey"):
+        return (
+            isinstance(other, HashKey)
+            and self.type is other.type
+            and self.value == other.value
+        )
+
+    def __reduce__(self):
+        # 해시는 프로세스마다 다를 수 있으므로 받는 쪽에서 다시 계산한다.
+        return HashKey, (self.type, self.value)
 
 
 class IntegerObj(Object):
+    # _hash_key는 hash_key()를 처음 부를 때 채운다.
+    __slots__ = ("value", "_hash_key")
+
+    type = ObjectType.Integer
     value: int
 
     def __init__(self, value: int):
-        self.type = ObjectType.Integer
         self.value = value
 
+    def hash_key(self) -> HashKey:
+        try:
+            return self._hash_key
+        except AttributeError:
+            key = self._hash_key = HashKey(ObjectType.Integer, self.value)
+            return key
+
     def inspect(self) -> str:
         return str(self.value)
 
@@ -20,12 +65,21 @@ class IntegerObj(Object):
 
 
 class BooleanObj(Object):
+    __slots__ = ("value", "_hash_key")
+
+    type = ObjectType.Boolean
     value: bool
 
     def __init__(self, value: bool):
-        self.type = ObjectType.Boolean
         self.value = value
 
+    def hash_key(self) -> HashKey:
+        try:
+            return self._hash_key
+        except AttributeError:
+            key = self._hash_key = HashKey(ObjectType.Boolean, self.value)
+            return key
+
     def inspect(self) -> str:
         return str(self.value)
 
@@ -37,9 +91,106 @@ class BooleanObj(Object):
         )
 
 
+class StringObj(Object):
+    """문자열
+
+    + 로 이어 붙인 문자열은 바로 합치지 않고 두 피연산자를 가리키는 rope 노드로 만든다.
+    값이 처음 필요할 때 rope 전체를 한 번에 "".join으로 펼치고, 펼친 값은 캐시한다.
+    그래서 재귀로 한 글자씩 붙여 N글자 문자열을 만들어도 O(N²)가 아니라 O(N)이다.
+    짧은 문자열끼리는 rope 노드를 만드는 것보다 바로 합치는 게 싸므로 바로 합친다.
+
+    문자열 리터럴의 값은 파싱할 때 intern 되므로, 같은 리터럴끼리는 비교가 동일성 검사로 끝난다.
+    """
+
+    __slots__ = ("_value", "_left", "_right", "length", "_hash_key")
+
+    type = ObjectType.String
+    length: int
+
+    # 이 길이 이하로 합쳐지는 문자열은 rope 노드를 만들지 않고 바로 합친다.
+    SHORT = 64
+
+    def __init__(self, value: str):
+        self._value = value
+        self._left = None
+        self._right = None
+        self.length = len(value)
+
+    @classmethod
+    def concat(cls, left: "StringObj", right: "StringObj") -> "StringObj":
+        if not left.length:
+            return right
+        if not right.length:
+            return left
+        length = left.length + right.length
+        if length <= cls.SHORT:
+            return cls(left.value + right.value)
+
+        obj = cls.__new__(cls)
+        obj._value = None
+        obj._left = left
+        obj._right = right
+        obj.length = length
+        return obj
+
+    @property
+    def value(self) -> str:
+        value = self._value
+        if value is None:
+            value = self._flatten()
+        return value
+
+    def _flatten(self) -> str:
+        # 한쪽으로 긴 rope도 다룰 수 있도록 재귀 없이 stack으로 순회한다.
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            value = node._value
+            if value is None:
+                left, right = node._left, node._right
+                if left is not None and right is not None:
+                    stack.append(right)
+                    stack.append(left)
+                    continue
+                # 다른 스레드가 방금 펼쳤다. _value를 먼저 쓰고 자식을 지우므로 값이 있다.
+                value = node._value
+            parts.append(value)
+
+        value = "".join(parts)
+        self._value = value
+        self._left = None
+        self._right = None
+        return value
+
+    def hash_key(self) -> HashKey:
+        try:
+            return self._hash_key
+        except AttributeError:
+            key = self._hash_key = HashKey(ObjectType.String, self.value)
+            return key
+
+    def inspect(self) -> str:
+        return self.value
+
+    def __eq__(self, other: "StringObj"):
+        if not isinstance(other, StringObj):
+            return False
+        if self is other:
+            return True
+        if self.length != other.length:
+            return False
+        a, b = self.value, other.value
+        return a is b or a == b
+
+    def __reduce__(self):
+        return StringObj, (self.value,)
+
+
 class NullObj(Object):
-    def __init__(self):
-        self.type = ObjectType.Null
+    __slots__ = ()
+
+    type = ObjectType.Null
 
     def inspect(self) -> str:
         return "null"
@@ -49,9 +200,11 @@ class NullObj(Object):
 
 
 class ReturnObj(Object):
+    __slots__ = ("value",)
+
+    type = ObjectType.Return
 
     def __init__(self, value: Object):
-        self.type = ObjectType.Return
         self.value = value
 
     def inspect(self) -> str:
@@ -62,9 +215,11 @@ class ReturnObj(Object):
 
 
 class ErrorObj(Object):
+    __slots__ = ("message",)
+
+    type = ObjectType.Return
 
     def __init__(self, message: str):
-        self.type = ObjectType.Return
         self.message = message
 
     def inspect(self) -> str:
@@ -72,6 +227,9 @@ class ErrorObj(Object):
 
 
 class FunctionObj(Object):
+    __slots__ = ("parameters", "body", "env")
+
+    type = ObjectType.Function
     parameters: List[Identifier]
     body: BlockStatement
 
@@ -80,7 +238,6 @@ class FunctionObj(Object):
     def __init__(
         self, parameters: List[Identifier], body: BlockStatement, env: Environment
     ):
-        self.type = ObjectType.Function
         self.parameters = parameters
         self.body = body
         self.env = env
@@ -88,3 +245,159 @@ class FunctionObj(Object):
     def inspect(self) -> str:
         params = ",".join([p.value for p in self.parameters])
         return f"fn ({params}) {{{self.body}}}"
+
+    def __reduce__(self):
+        # 본문이 쓰는 바인딩과 함수 리터럴의 content hash만 보낸다. (pinterpret.shipping)
+        return reduce_function(self)
+
+
+class BuiltinObj(Object):
+    """파이썬으로 구현한 내장 함수 (pinterpret.builtins)
+
+    fn은 인자를 위치 인자로 받는다. arity가 None이면 인자 개수를 검사하지 않는다.
+    """
+
+    __slots__ = ("name", "fn", "arity")
+
+    type = ObjectType.Builtin
+    name: str
+    fn: Callable[..., Object]
+    arity: Optional[int]
+
+    def __init__(self, name: str, fn: Callable[..., Object], arity: Optional[int]):
+        self.name = name
+        self.fn = fn
+        self.arity = arity
+
+    def inspect(self) -> str:
+        return f"builtin {self.name}"
+
+    def __reduce__(self):
+        # 내장 함수는 이름만 보내고, 받는 쪽의 registry에서 찾는다.
+        from pinterpret.builtins import lookup
+
+        return lookup, (self.name,)
+
+
+# array('q')에 담을 수 있는 정수 범위
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+
+def pack_ints(elements: Sequence[Object]) -> Optional[array]:
+    """원소가 모두 int64 범위의 IntegerObj이면 그 값들의 array('q')를, 아니면 None"""
+    values = array("q")
+    for element in elements:
+        if type(element) is not IntegerObj:
+            return None
+        value = element.value
+        if not INT64_MIN <= value <= INT64_MAX:
+            return None
+        values.append(value)
+    return values
+
+
+class ArrayObj(Object):
+    """배열
+
+    원소가 모두 int64 범위의 정수이면 IntegerObj 목록 대신 값만 array('q')에 담는다. (ints)
+    그 밖의 배열은 Object 목록에 담는다. (objects)
+    ints는 C 배열이므로 내장 함수가 파이썬 반복문 없이 다루거나,
+    NumPy가 있으면 복사 없이 배열로 볼 수 있다. (pinterpret.builtins)
+
+    배열은 만든 뒤에 바뀌지 않는다.
+    """
+
+    __slots__ = ("ints", "objects")
+
+    type = ObjectType.Array
+    ints: Optional[array]
+    objects: Optional[List[Object]]
+
+    def __init__(self, elements: Iterable[Object]):
+        objects = list(elements)
+        self.ints = pack_ints(objects)
+        self.objects = None if self.ints is not None else objects
+
+    @classmethod
+    def from_ints(cls, ints: array) -> "ArrayObj":
+        """array('q')를 복사하지 않고 감싼다."""
+        obj = cls.__new__(cls)
+        obj.ints = ints
+        obj.objects = None
+        return obj
+
+    @property
+    def elements(self) -> List[Object]:
+        if self.ints is not None:
+            return [IntegerObj(value) for value in self.ints]
+        return self.objects
+
+    def __len__(self) -> int:
+        if self.ints is not None:
+            return len(self.ints)
+        return len(self.objects)
+
+    def get(self, index: int) -> Object:
+        if self.ints is not None:
+            return IntegerObj(self.ints[index])
+        return self.objects[index]
+
+    def inspect(self) -> str:
+        if self.ints is not None:
+            return "[" + ", ".join(map(str, self.ints)) + "]"
+        return "[" + ", ".join(e.inspect() for e in self.objects) + "]"
+
+    def __eq__(self, other: "ArrayObj"):
+        if not isinstance(other, ArrayObj):
+            return False
+        if self.ints is not None and other.ints is not None:
+            return self.ints == other.ints
+        return self.elements == other.elements
+
+
+class HashObj(Object):
+    """해시 맵
+
+    HashKey -> (키 Object, 값 Object)를 HAMT에 담는다. (pinterpret.hamt)
+    put은 원래 맵을 그대로 두고 구조를 공유하는 새 HashObj를 돌려주므로 O(log n)이다.
+    키로 쓸 수 있는 Object는 hash_key()를 가진다.
+    """
+
+    __slots__ = ("pairs",)
+
+    type = ObjectType.Hash
+    pairs: HamtMap
+
+    def __init__(self, pairs: HamtMap = HamtMap()):
+        self.pairs = pairs
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def get(self, key: Object) -> Optional[Object]:
+        pair = self.pairs.get(key.hash_key())
+        return None if pair is None else pair[1]
+
+    def put(self, key: Object, value: Object) -> "HashObj":
+        return HashObj(self.pairs.set(key.hash_key(), (key, value)))
+
+    def inspect(self) -> str:
+        pairs = (f"{k.inspect()}: {v.inspect()}" for k, v in self.pairs_list())
+        return "{" + ", ".join(pairs) + "}"
+
+    def pairs_list(self) -> List[Tuple[Object, Object]]:
+        return [pair for _, pair in self.pairs.items()]
+
+    def __eq__(self, other: "HashObj"):
+        if not isinstance(other, HashObj) or len(self) != len(other):
+            return False
+        for hash_key, (_, value) in self.pairs.items():
+            pair = other.pairs.get(hash_key)
+            if pair is None or pair[1] != value:
+                return False
+        return True
+
+
+def is_hashable(obj: Object) -> bool:
+    return hasattr(obj, "hash_key")
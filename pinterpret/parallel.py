@@ -0,0 +1,268 @@
+"""
+pmap, pcall의 호출들을 여러 프로세스에서 나눠 실행하는 실행기
+
+Monkey에는 대입문이 없어서, 함수는 붙잡은 바인딩과 인자만으로 결과가 정해진다.
+그래서 서로 다른 호출은 어느 프로세스에서 어떤 순서로 실행해도 결과가 같다.
+
+- 함수는 pinterpret.shipping의 __reduce__로 본문이 쓰는 바인딩과 함수 리터럴의 hash만 보낸다.
+  worker를 띄울 때 그때까지의 AST 테이블을 넘겨두므로, 그 함수들은 hash만 보낸다.
+- 결과는 Object 대신 int / bool / None / str / array('q')로 받아 통신량을 줄인다.
+  오류는 문자열 결과와 구분하도록 (ERROR, 메시지) 튜플로 받는다.
+  그래서 결과는 INTEGER, BOOLEAN, NULL, STRING과 정수만 담은 ARRAY만 될 수 있다.
+- 작은 작업은 프로세스로 보내는 비용이 더 크다. 먼저 sample_time 동안 이 프로세스에서 실행해
+  호출 하나의 시간을 재고, 남은 호출을 나눠 실행하는 예상 시간이
+  (측정한 dispatch overhead + 남은 시간 / worker 수) 더 짧을 때만 worker에 보낸다.
+  pmap(fib, n)처럼 뒤쪽 호출일수록 오래 걸리는 경우가 많으므로, 앞에서부터가 아니라
+  범위 전체에 고르게 퍼진 순서(spread_order)로 실행하며 시간을 재고,
+  sample_time마다 예상을 다시 확인한다.
+  worker 프로세스는 남은 시간이 startup_time보다 길어질 때 처음 띄운다.
+- worker 안에서 부른 pmap은 프로세스를 더 띄우지 않고 그 worker에서 실행한다.
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Iterator, List, Optional, Tuple, Union
+
+from pinterpret.common import Object
+from pinterpret.evaluator import apply_function
+from pinterpret.obj import (
+    ArrayObj,
+    BooleanObj,
+    ErrorObj,
+    IntegerObj,
+    NullObj,
+    StringObj,
+)
+from pinterpret.shipping import ast_table
+
+Call = Tuple[Object, List[Object]]  # (함수, 인자)
+ERROR = "error"
+
+# worker가 돌려주는 결과, 튜플은 (ERROR, 오류 메시지), array는 정수 배열의 원소
+Value = Union[int, bool, None, str, array, Tuple[str, str]]
+
+RESULT_TYPES = (IntegerObj, BooleanObj, NullObj, StringObj, ErrorObj)
+
+
+def check_result(result: Object) -> Object:
+    if isinstance(result, RESULT_TYPES):
+        return result
+    elif isinstance(result, ArrayObj) and result.ints is not None:
+        return result
+    return ErrorObj(f"not supported result : {result.type}")
+
+
+def is_error(value: Value) -> bool:
+    return isinstance(value, tuple)
+
+
+def encode_result(result: Object) -> Value:
+    if isinstance(result, ErrorObj):
+        return ERROR, result.message
+    elif isinstance(result, NullObj):
+        return None
+    elif isinstance(result, ArrayObj):
+        return result.ints
+    return result.value
+
+
+def decode_result(value: Value) -> Object:
+    if value is None:
+        return NullObj()
+    elif is_error(value):
+        return ErrorObj(value[1])
+    elif isinstance(value, str):
+        return StringObj(value)
+    elif isinstance(value, array):
+        return ArrayObj.from_ints(value)
+    elif isinstance(value, bool):
+        return BooleanObj(value)
+    return IntegerObj(value)
+
+
+def spread_order(n: int) -> Iterator[int]:
+    """0 ~ n-1을 한 번씩, 범위 전체에 고르게 퍼지는 순서로 (0, n/2, n/4, 3n/4, ...)
+
+    n 이상인 2의 거듭제곱 범위에서 index의 비트를 뒤집은 순서이다.
+    """
+    bits = (n - 1).bit_length() if n > 1 else 0
+    for i in range(1 << bits):
+        index = int(format(i, f"0{bits}b")[::-1], 2) if bits else 0
+        if index < n:
+            yield index
+
+
+def init_worker(exported: List[Tuple[str, bytes]]):
+    ast_table.install(exported)
+
+
+def run_calls(calls: List[Call]) -> List[Value]:
+    """worker 프로세스에서 실행된다."""
+    values = []
+    for fn, args in calls:
+        result = check_result(apply_function(fn, args))
+        values.append(encode_result(result))
+        if isinstance(result, ErrorObj):
+            break
+    return values
+
+
+def ping():
+    pass
+
+
+class ParallelPool:
+    workers: int
+    chunks_per_worker: int
+    sample_time: float  # 호출 시간을 재기 위해 먼저 이 프로세스에서 실행하는 시간 (초)
+    startup_time: float  # 남은 호출이 이보다 오래 걸릴 때 worker를 띄운다. (초)
+    dispatch_overhead: Optional[float]  # worker와 주고받는 시간, 띄울 때 잰다. (초)
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunks_per_worker: int = 4,
+        sample_time: float = 0.002,
+        startup_time: float = 0.1,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self.sample_time = sample_time
+        self.startup_time = startup_time
+        self.dispatch_overhead = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 1 and multiprocessing.parent_process() is None
+
+    def start(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                executor = ProcessPoolExecutor(
+                    self.workers,
+                    initializer=init_worker,
+                    initargs=(ast_table.export(),),
+                )
+                # worker들이 다 뜬 뒤에 왕복 시간을 잰다.
+                for future in [executor.submit(ping) for _ in range(self.workers)]:
+                    future.result()
+                times = []
+                for _ in range(5):
+                    start = time.perf_counter()
+                    executor.submit(ping).result()
+                    times.append(time.perf_counter() - start)
+                self.dispatch_overhead = sorted(times)[len(times) // 2]
+                self._executor = executor
+            return self._executor
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def worth_parallel(self, serial_time: float) -> bool:
+        """이 프로세스에서 serial_time 걸릴 호출들을 worker에 나눠 보내는 게 빠른지"""
+        if not self.enabled:
+            return False
+        if self._executor is None:
+            if serial_time < self.startup_time:
+                return False
+            self.start()
+        return self.dispatch_overhead + serial_time / self.workers < serial_time
+
+    def call_all(self, calls: List[Call]) -> Object:
+        """모든 호출의 결과를 ArrayObj로, 오류가 있으면 첫 오류를 돌려준다.
+
+        spread_order로 이 프로세스에서 실행하면서, sample_time마다 지금까지 잰 호출 하나의
+        평균 시간으로 남은 호출의 시간을 다시 예상한다. worker에 나눠 보내는 게 빠르다고
+        판단되면 남은 호출을 모두 보낸다.
+        """
+        results: List[Optional[Object]] = [None] * len(calls)
+        # 이 index부터의 결과는 필요 없다. (그 앞에서 오류가 났을 때)
+        limit = len(calls)
+        remaining = len(calls)  # results[:limit] 중 아직 실행하지 않은 호출 수
+        done = 0
+        start = checked = time.perf_counter()
+        for index in spread_order(len(calls)):
+            if index >= limit or results[index] is not None:
+                continue
+            fn, args = calls[index]
+            result = check_result(apply_function(fn, args))
+            results[index] = result
+            done += 1
+            remaining -= 1
+            if isinstance(result, ErrorObj):
+                # 앞쪽 호출에도 오류가 있을 수 있으므로 그 앞까지만 마저 실행한다.
+                limit = index
+                remaining = results[:limit].count(None)
+
+            now = time.perf_counter()
+            if remaining and now - checked >= self.sample_time:
+                checked = now
+                per_call = (now - start) / done
+                if self.worth_parallel(per_call * remaining):
+                    rest = [i for i in range(limit) if results[i] is None]
+                    values = self.run_parallel([calls[i] for i in rest])
+                    # 오류가 나면 그 뒤의 결과는 오지 않지만, 아래에서 오류를 먼저 만난다.
+                    for i, value in zip(rest, values):
+                        results[i] = decode_result(value)
+                    break
+
+        for result in results:
+            if isinstance(result, ErrorObj):
+                return result
+        return ArrayObj(results)
+
+    def run_parallel(self, calls: List[Call]) -> List[Value]:
+        executor = self.start()
+        size = math.ceil(len(calls) / (self.workers * self.chunks_per_worker))
+        futures = [
+            executor.submit(run_calls, calls[i : i + size])
+            for i in range(0, len(calls), size)
+        ]
+        try:
+            values = []
+            for future in futures:
+                chunk = future.result()
+                values.extend(chunk)
+                if chunk and is_error(chunk[-1]):
+                    break
+            return values
+        except BrokenProcessPool:
+            # worker가 죽었으면 다음 호출에서 새로 띄운다.
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+_default_pool: Optional[ParallelPool] = None
+_default_pool_lock = Lock()
+
+
+def default_pool() -> ParallelPool:
+    """pmap, pcall이 쓰는 프로세스마다 하나인 실행기 (worker 수 : CPU 수)"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ParallelPool()
+        return _default_pool
@@ -17,8 +17,9 @@ INPUT               OUTPUT
 
 """
 
-from enum import IntEnum
-from typing import Optional, List, Dict, Callable
+from enum import Enum, IntEnum
+from functools import partial
+from typing import Optional, List, Dict, Callable, Iterator
 
 from pinterpret.ast import (
     Program,
@@ -26,18 +27,24 @@ from pinterpret.ast import (
     LetStatement,
     Identifier,
     ReturnStatement,
+    WhileStatement,
     Expression,
     ExpressionStatement,
     IntegerLiteral,
+    StringLiteral,
     PrefixExpression,
     InfixExpression,
     BoolLiteral,
     IfExpression,
     BlockStatement,
+    LazyBlockStatement,
     FunctionLiteral,
     CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
 )
-from pinterpret.lexer import Lexer
+from pinterpret.lexer import Lexer, TokenListLexer
 from pinterpret.token import Token, TokenType
 
 
@@ -49,6 +56,7 @@ class OperatorPrecedence(IntEnum):
     PRODUCT = 5
     PREFIX = 6
     CALL = 7
+    INDEX = 8
 
 
 PRECEDENCE_RELATION = {
@@ -61,8 +69,46 @@ PRECEDENCE_RELATION = {
     TokenType.SLASH: OperatorPrecedence.PRODUCT,
     TokenType.ASTERISK: OperatorPrecedence.PRODUCT,
     TokenType.LPAREN: OperatorPrecedence.CALL,
+    TokenType.LBRACKET: OperatorPrecedence.INDEX,
 }
 
+
+class PendingKind(Enum):
+    PREFIX = "PREFIX"
+    INFIX = "INFIX"
+    GROUP = "GROUP"
+    CALL = "CALL"
+    ARRAY = "ARRAY"
+    INDEX = "INDEX"
+    HASH = "HASH"
+
+
+class PendingOperator:
+    """parse_expression에서 오른쪽 피연산자를 기다리고 있는 연산자
+
+    arguments는 CALL의 인자, ARRAY의 원소, HASH의 키와 값(번갈아)을 모은다.
+    """
+
+    kind: PendingKind
+    token: Token
+    precedence: OperatorPrecedence
+    left: Optional[Expression]
+    arguments: List[Expression]
+
+    def __init__(
+        self,
+        kind: PendingKind,
+        token: Token,
+        precedence: OperatorPrecedence,
+        left: Optional[Expression] = None,
+    ):
+        self.kind = kind
+        self.token = token
+        self.precedence = precedence
+        self.left = left
+        self.arguments = []
+
+
 # 전위함수 파싱 로직
 prefix_parse_ftype = Callable[[], Expression]
 infix_parse_ftype = Callable[[Expression], Expression]
@@ -76,11 +122,21 @@ class Parser:
 
     errors: List[str]
 
+    # True이면 함수 본문은 중괄호 짝만 맞춰두고, 처음 호출될 때 파싱한다.
+    lazy_functions: bool
+
+    # None이 아니면 구조가 같은 표현식 노드를 하나만 만들어 공유한다. (hash consing)
+    interned: Optional[Dict[tuple, Expression]]
+
     prefix_parse_fns: Dict[TokenType, prefix_parse_ftype]
     infix_parse_fns: Dict[TokenType, infix_parse_ftype]
 
-    def __init__(self, lexer: Lexer):
+    def __init__(
+        self, lexer: Lexer, lazy_functions: bool = False, hash_consing: bool = False
+    ):
         self.lexer = lexer
+        self.lazy_functions = lazy_functions
+        self.interned = {} if hash_consing else None
 
         # initialize current token & next_token
         self.ct = self.lexer.next_token()
@@ -96,6 +152,9 @@ class Parser:
         # register integer
         self.register_prefix(TokenType.INT, self.parse_integer)
 
+        # register string literal
+        self.register_prefix(TokenType.STRING, self.parse_string)
+
         # register bool literal
         [
             self.register_prefix(t, self.parse_bool)
@@ -135,17 +194,34 @@ class Parser:
         # register call expression
         self.register_infix(TokenType.LPAREN, self.parse_call_expression)
 
+        # register array literal & index expression
+        self.register_prefix(TokenType.LBRACKET, self.parse_array_literal)
+        self.register_infix(TokenType.LBRACKET, self.parse_index_expression)
+
+        # register hash literal
+        # 블록은 if와 fn 뒤에서만 나오므로, 표현식 자리의 중괄호는 해시 리터럴이다.
+        self.register_prefix(TokenType.LBRACE, self.parse_hash_literal)
+
     def parse_program(self) -> Program:
         program = Program()
 
+        for stmt in self.iter_statements():
+            program.append(stmt)
+
+        return program
+
+    def iter_statements(self) -> Iterator[Statement]:
+        """최상위 명령문을 파싱되는 즉시 하나씩 돌려준다.
+
+        parse_program과 달리 전체 AST를 들고 있지 않으므로,
+        긴 스크립트도 일정한 메모리로 처리할 수 있다.
+        """
         while self.ct.type != TokenType.EOF:
             stmt = self.parse_statement()
             if stmt:
-                program.append(stmt)
+                yield stmt
             self.next_token()
 
-        return program
-
     def register_prefix(
         self, token_type: TokenType, prefix_parse_func: prefix_parse_ftype
     ):
@@ -165,9 +241,11 @@ class Parser:
             return self.parse_let_statement()
         elif self.ct.type == TokenType.RETURN:
             return self.parse_return_statement()
+        elif self.ct.type == TokenType.WHILE:
+            return self.parse_while_statement()
         else:
-            # monkey 언어에는 실질적 명령문이 let 문과 return 문이 두 개 밖에 없기 때문에,
-            # 이 두 경우가 아닐 때는 표현식 문으로 파싱한다.
+            # monkey 언어의 명령문은 let, return, while 문뿐이기 때문에,
+            # 이 경우가 아닐 때는 표현식 문으로 파싱한다.
             return self.parse_expression_statement()
 
     def parse_let_statement(self) -> Optional[LetStatement]:
@@ -200,6 +278,28 @@ class Parser:
 
         return ReturnStatement(return_token, expression)
 
+    def parse_while_statement(self) -> Optional[WhileStatement]:
+        token = self.ct
+
+        if not self.expect_peek(TokenType.LPAREN):
+            return
+
+        self.next_token()
+        condition = self.parse_expression(OperatorPrecedence.LOWEST)
+
+        if not self.expect_peek(TokenType.RPAREN):
+            return
+
+        if not self.expect_peek(TokenType.LBRACE):
+            return
+
+        body = self.parse_block_statement()
+
+        if self.next_token_is(TokenType.SEMICOLON):
+            self.next_token()
+
+        return WhileStatement(token, condition, body)
+
     def parse_expression_statement(self) -> Optional[ExpressionStatement]:
         """entrypoint for parsing expression.
         :return:
@@ -264,47 +364,254 @@ class Parser:
            precedence < self.next_precedence()로 결정
         6) depth1-while 구문으로 나옴 --> l_expr에 (a+b)가 됨
 
+        위의 depth는 재귀 호출이 아니라 stack에 쌓인 PendingOperator로 표현한다.
+        전위/중위/그룹/호출/인덱스 표현식과 배열/해시 리터럴은 하위 parse_expression을
+        호출하는 대신 stack에 쌓았다가, 하위 표현식이 끝나면 꺼내서 노드를 조립한다.
+        그래서 '((((...))))'나 '--------5', '[[[[...]]]]'처럼 깊게 중첩된 입력도
+        파이썬 재귀 한도와 상관없이 선형 시간에 파싱된다.
+
         :param precedence:
         :return:
         """
-        if prefix := self.prefix_parse_fns.get(self.ct.type):
-            l_expr = prefix()
+        stack: List[PendingOperator] = []
+
+        while True:
+            # 1) 피연산자 파싱 : 전위 연산자와 여는 괄호는 stack에 쌓고 다음 토큰으로 넘어간다.
+            prefix = self.prefix_parse_fns.get(self.ct.type)
+            if prefix is None:
+                self.errors.append(f"no prefix parse function for {self.ct.type} found")
+                l_expr = None
+                level_closed = True
+            elif prefix == self.parse_prefix_expression:
+                stack.append(
+                    PendingOperator(
+                        PendingKind.PREFIX, self.ct, OperatorPrecedence.PREFIX
+                    )
+                )
+                self.next_token()
+                continue
+            elif prefix == self.parse_grouped_expression:
+                stack.append(
+                    PendingOperator(
+                        PendingKind.GROUP, self.ct, OperatorPrecedence.LOWEST
+                    )
+                )
+                self.next_token()
+                continue
+            elif prefix == self.parse_array_literal and not self.next_token_is(
+                TokenType.RBRACKET
+            ):
+                stack.append(
+                    PendingOperator(
+                        PendingKind.ARRAY, self.ct, OperatorPrecedence.LOWEST
+                    )
+                )
+                self.next_token()
+                continue
+            elif prefix == self.parse_hash_literal and not self.next_token_is(
+                TokenType.RBRACE
+            ):
+                stack.append(
+                    PendingOperator(
+                        PendingKind.HASH, self.ct, OperatorPrecedence.LOWEST
+                    )
+                )
+                self.next_token()
+                continue
+            else:
+                # 빈 배열/해시 리터럴도 여기서 바로 파싱한다.
+                l_expr = prefix()
+                level_closed = False
+
+            # 2) 중위 연산자 파싱 및 stack 정리
+            while True:
+                level_precedence = stack[-1].precedence if stack else precedence
+                if (
+                    not level_closed
+                    and not self.next_token_is(TokenType.SEMICOLON)
+                    and level_precedence < self.next_precedence()
+                ):
+                    infix_function = self.infix_parse_fns.get(self.nt.type, None)
+                    if infix_function is not None:
+                        self.next_token()
+                        if infix_function == self.parse_infix_expression:
+                            token = self.ct
+                            stack.append(
+                                PendingOperator(
+                                    PendingKind.INFIX,
+                                    token,
+                                    self.curr_precedence(),
+                                    l_expr,
+                                )
+                            )
+                            self.next_token()
+                            break
+                        elif infix_function == self.parse_call_expression:
+                            token = self.ct
+                            self.next_token()
+                            if self.curr_token_is(TokenType.RPAREN):
+                                l_expr = self.intern(CallExpression(token, l_expr, []))
+                                continue
+                            stack.append(
+                                PendingOperator(
+                                    PendingKind.CALL,
+                                    token,
+                                    OperatorPrecedence.LOWEST,
+                                    l_expr,
+                                )
+                            )
+                            break
+                        elif infix_function == self.parse_index_expression:
+                            stack.append(
+                                PendingOperator(
+                                    PendingKind.INDEX,
+                                    self.ct,
+                                    OperatorPrecedence.LOWEST,
+                                    l_expr,
+                                )
+                            )
+                            self.next_token()
+                            break
+                        l_expr = infix_function(l_expr)
+                        continue
+
+                # 현재 depth의 표현식이 끝났으므로, 한 단계 위 depth로 돌아간다.
+                level_closed = False
+                if not stack:
+                    return l_expr
+
+                pending = stack.pop()
+                if pending.kind == PendingKind.GROUP:
+                    if not self.expect_peek(TokenType.RPAREN):
+                        l_expr = None
+                elif pending.kind == PendingKind.CALL:
+                    pending.arguments.append(l_expr)
+                    if l_expr is None:
+                        continue
+
+                    if self.next_token_is(TokenType.COMMA):
+                        self.next_token()
+                    self.next_token()
+
+                    if not self.curr_token_is(TokenType.RPAREN):
+                        stack.append(pending)
+                        break
+                    l_expr = self.intern(
+                        CallExpression(pending.token, pending.left, pending.arguments)
+                    )
+                elif pending.kind == PendingKind.ARRAY:
+                    pending.arguments.append(l_expr)
+                    if l_expr is None:
+                        continue
+
+                    if self.next_token_is(TokenType.COMMA):
+                        self.next_token()
+                        self.next_token()
+                        stack.append(pending)
+                        break
+                    if not self.expect_peek(TokenType.RBRACKET):
+                        l_expr = None
+                        continue
+                    l_expr = self.intern(ArrayLiteral(pending.token, pending.arguments))
+                elif pending.kind == PendingKind.INDEX:
+                    if not self.expect_peek(TokenType.RBRACKET):
+                        l_expr = None
+                        continue
+                    l_expr = self.intern(
+                        IndexExpression(pending.token, pending.left, l_expr)
+                    )
+                elif pending.kind == PendingKind.HASH:
+                    pending.arguments.append(l_expr)
+                    if l_expr is None:
+                        continue
+
+                    if len(pending.arguments) % 2:
+                        # 키 다음에는 ':'와 값이 온다.
+                        if not self.expect_peek(TokenType.COLON):
+                            l_expr = None
+                            continue
+                        self.next_token()
+                        stack.append(pending)
+                        break
+
+                    # 값 다음에는 '}' 또는 ','가 온다. ',' 뒤에 바로 '}'가 와도 된다.
+                    if not self.next_token_is(TokenType.RBRACE):
+                        if not self.expect_peek(TokenType.COMMA):
+                            l_expr = None
+                            continue
+                        if not self.next_token_is(TokenType.RBRACE):
+                            self.next_token()
+                            stack.append(pending)
+                            break
+                    self.next_token()
+                    l_expr = self.intern(
+                        HashLiteral(
+                            pending.token,
+                            pending.arguments[0::2],
+                            pending.arguments[1::2],
+                        )
+                    )
+                elif pending.kind == PendingKind.PREFIX:
+                    l_expr = self.intern(PrefixExpression(pending.token, l_expr))
+                else:
+                    l_expr = self.intern(
+                        InfixExpression(pending.token, pending.left, l_expr)
+                    )
+
+    def intern(self, expr: Expression) -> Expression:
+        """hash consing 모드이면, 구조가 같은 노드가 이미 있을 때 그 노드를 돌려준다.
+
+        자식 노드는 이미 intern 되어 있으므로, 자식은 동일성(identity)만 비교하면 된다.
+        그래서 같은 표현식은 항상 같은 객체가 되고, `is`로 비교할 수 있다.
+        """
+        if self.interned is None:
+            return expr
+
+        # 노드는 __eq__를 정의하지 않으므로, 키에 넣은 자식 노드는 동일성으로 비교된다.
+        # id() 대신 노드 자체를 넣어서, 키가 살아있는 동안 자식 노드도 살아있게 한다.
+        if isinstance(expr, (Identifier, IntegerLiteral, BoolLiteral, StringLiteral)):
+            key = (type(expr), expr.token.literal)
+        elif isinstance(expr, PrefixExpression):
+            key = (PrefixExpression, expr.operator, expr.right)
+        elif isinstance(expr, InfixExpression):
+            key = (InfixExpression, expr.operator, expr.left, expr.right)
+        elif isinstance(expr, CallExpression):
+            key = (CallExpression, expr.function, *expr.arguments)
+        elif isinstance(expr, ArrayLiteral):
+            key = (ArrayLiteral, *expr.elements)
+        elif isinstance(expr, IndexExpression):
+            key = (IndexExpression, expr.left, expr.index)
+        elif isinstance(expr, HashLiteral):
+            key = (HashLiteral, len(expr.keys), *expr.keys, *expr.values)
         else:
-            self.errors.append(f"no prefix parse function for {self.ct.type} found")
-            return None
+            return expr
 
-        while (
-            not self.next_token_is(TokenType.SEMICOLON)
-            and precedence < self.next_precedence()
-        ):
-            infix_function = self.infix_parse_fns.get(self.nt.type, None)
-            if infix_function is None:
-                return l_expr
-            self.next_token()
-            l_expr = infix_function(l_expr)
-        return l_expr
+        return self.interned.setdefault(key, expr)
 
     def parse_identifier(self) -> Identifier:
-        return Identifier(self.ct)
+        return self.intern(Identifier(self.ct))
 
     def parse_integer(self) -> Expression:
-        return IntegerLiteral(self.ct)
+        return self.intern(IntegerLiteral(self.ct))
+
+    def parse_string(self) -> Expression:
+        return self.intern(StringLiteral(self.ct))
 
     def parse_bool(self) -> Expression:
-        return BoolLiteral(self.ct)
+        return self.intern(BoolLiteral(self.ct))
 
     def parse_prefix_expression(self) -> Expression:
         token = self.ct
         self.next_token()
         right = self.parse_expression(OperatorPrecedence.PREFIX)
-        return PrefixExpression(token, right)
+        return self.intern(PrefixExpression(token, right))
 
     def parse_infix_expression(self, left_expr: Expression) -> Expression:
         token = self.ct
         precedence = self.curr_precedence()
         self.next_token()
         right_expr = self.parse_expression(precedence)
-        return InfixExpression(token, left_expr, right_expr)
+        return self.intern(InfixExpression(token, left_expr, right_expr))
 
     def parse_grouped_expression(self) -> Optional[Expression]:
         self.next_token()
@@ -368,10 +675,42 @@ class Parser:
         if not self.expect_peek(TokenType.LBRACE):
             return
 
-        body = self.parse_block_statement()
+        if self.lazy_functions:
+            body = self.skip_block_statement()
+        else:
+            body = self.parse_block_statement()
 
         return FunctionLiteral(token, parameters, body)
 
+    def skip_block_statement(self) -> LazyBlockStatement:
+        """중괄호 짝만 맞추면서 블록을 건너뛴다.
+
+        parse_block_statement와 마찬가지로 닫는 중괄호에서 멈추며,
+        건너뛴 토큰 열은 LazyBlockStatement에 보관했다가 필요할 때 파싱한다.
+        """
+        token = self.ct
+        tokens = [token]
+        depth = 1
+
+        while depth and not self.next_token_is(TokenType.EOF):
+            self.next_token()
+            if self.curr_token_is(TokenType.LBRACE):
+                depth += 1
+            elif self.curr_token_is(TokenType.RBRACE):
+                depth -= 1
+            tokens.append(self.ct)
+
+        if depth:
+            # 닫는 중괄호가 없으면 parse_block_statement처럼 EOF에서 멈춘다.
+            self.next_token()
+
+        # 파서 전체가 아니라 errors만 붙잡아 두도록 한다.
+        return LazyBlockStatement(
+            token,
+            tokens,
+            partial(parse_skipped_block, errors=self.errors, interned=self.interned),
+        )
+
     def parse_parameters(self) -> List[Identifier]:
         self.next_token()
         identifiers = []
@@ -400,4 +739,79 @@ class Parser:
                 self.next_token()
             self.next_token()
 
-        return CallExpression(token, function, args)
+        return self.intern(CallExpression(token, function, args))
+
+    def parse_array_literal(self) -> Optional[ArrayLiteral]:
+        token = self.ct
+        elements = self.parse_expression_list(TokenType.RBRACKET)
+        if elements is None:
+            return None
+        return self.intern(ArrayLiteral(token, elements))
+
+    def parse_hash_literal(self) -> Optional[HashLiteral]:
+        token = self.ct
+        keys = []
+        values = []
+
+        while not self.next_token_is(TokenType.RBRACE):
+            self.next_token()
+            keys.append(self.parse_expression(OperatorPrecedence.LOWEST))
+
+            if not self.expect_peek(TokenType.COLON):
+                return None
+
+            self.next_token()
+            values.append(self.parse_expression(OperatorPrecedence.LOWEST))
+
+            if not self.next_token_is(TokenType.RBRACE) and not self.expect_peek(
+                TokenType.COMMA
+            ):
+                return None
+
+        self.next_token()
+        return self.intern(HashLiteral(token, keys, values))
+
+    def parse_index_expression(self, left: Expression) -> Optional[IndexExpression]:
+        token = self.ct
+        self.next_token()
+        index = self.parse_expression(OperatorPrecedence.LOWEST)
+
+        if not self.expect_peek(TokenType.RBRACKET):
+            return None
+        return self.intern(IndexExpression(token, left, index))
+
+    def parse_expression_list(self, end: TokenType) -> Optional[List[Expression]]:
+        """쉼표로 구분된 표현식 목록을 end 토큰까지 파싱한다.
+
+        ct는 여는 토큰에서 시작해, 닫는 토큰에서 끝난다.
+        """
+        if self.next_token_is(end):
+            self.next_token()
+            return []
+
+        self.next_token()
+        expressions = [self.parse_expression(OperatorPrecedence.LOWEST)]
+        while self.next_token_is(TokenType.COMMA):
+            self.next_token()
+            self.next_token()
+            expressions.append(self.parse_expression(OperatorPrecedence.LOWEST))
+
+        if not self.expect_peek(end):
+            return None
+        return expressions
+
+
+def parse_skipped_block(
+    tokens: List[Token],
+    errors: List[str],
+    interned: Optional[Dict[tuple, Expression]] = None,
+) -> BlockStatement:
+    """skip_block_statement가 건너뛴 토큰 열을 BlockStatement로 파싱한다.
+
+    파싱 에러는 원래 파서의 errors에 덧붙이고, hash consing 테이블도 원래 파서와 공유한다.
+    """
+    parser = Parser(TokenListLexer(tokens), lazy_functions=True)
+    parser.interned = interned
+    block = parser.parse_block_statement()
+    errors.extend(parser.errors)
+    return block
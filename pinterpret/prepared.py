@@ -0,0 +1,92 @@
+"""
+한 번 준비하고 여러 번 실행하는 프로그램
+
+같은 소스코드를 입력값만 바꿔 여러 번 실행할 때,
+Lexer -> Parser -> 분석은 prepare에서 한 번만 하고
+PreparedProgram.run에서는 새 Environment에 입력값을 넣고 evaluate만 한다.
+
+PreparedProgram은 만들어진 뒤 바뀌지 않고, evaluate도 AST를 바꾸지 않으므로
+여러 스레드에서 동시에 run을 호출해도 된다.
+"""
+
+from typing import Any, Mapping, Optional, Tuple, Union
+
+from pinterpret.analysis import FreeIdentifiers
+from pinterpret.ast import Program
+from pinterpret.builtins import BUILTINS
+from pinterpret.common import Object
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import BooleanObj, IntegerObj, ReturnObj
+from pinterpret.parser import Parser
+
+Binding = Union[Object, int, bool]
+
+
+class PrepareError(Exception):
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def to_object(value: Binding) -> Object:
+    """파이썬 값을 interpreter 객체로 변환한다."""
+    if isinstance(value, Object):
+        return value
+    elif isinstance(value, bool):
+        return BooleanObj(value)
+    elif isinstance(value, int):
+        return IntegerObj(value)
+    raise TypeError(f"not supported binding : {type(value).__name__}")
+
+
+class PreparedProgram:
+    __slots__ = ("source", "program", "free_identifiers")
+
+    source: str
+    program: Program
+    free_identifiers: Tuple[str, ...]  # run에서 넘겨받아야 하는 식별자
+
+    def __init__(
+        self, source: str, program: Program, free_identifiers: Tuple[str, ...]
+    ):
+        self.source = source
+        self.program = program
+        self.free_identifiers = free_identifiers
+
+    def run(
+        self,
+        bindings: Optional[Mapping[str, Binding]] = None,
+        prelude: Optional[Environment] = None,
+    ) -> Object:
+        """prelude가 있으면 prelude를 fork한 Environment에서 실행한다."""
+        env = prelude.fork() if prelude is not None else Environment()
+        if bindings:
+            for name, value in bindings.items():
+                env.set(name, to_object(value))
+
+        result = evaluate(self.program, env)
+        if isinstance(result, ReturnObj):
+            return result.value
+        return result
+
+    def run_columns(self, columns: Mapping[str, Any]):
+        """입력값 배열(NumPy)의 각 행에 대해 실행한 결과를 배열로 돌려준다.
+
+        pinterpret.columnar.evaluate_columns 참고
+        """
+        from pinterpret.columnar import evaluate_columns
+
+        return evaluate_columns(self.program, columns)
+
+
+def prepare(source: str) -> PreparedProgram:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    if parser.errors:
+        raise PrepareError(parser.errors)
+
+    free = FreeIdentifiers().run(program)
+    names = tuple(name for name in free.names if name not in BUILTINS)
+    return PreparedProgram(source, program, names)
@@ -0,0 +1,343 @@
+"""
+여러 프로그램을 한 스레드에서 번갈아 실행하는 협력형 스케줄러
+
+evaluate는 프로그램 하나를 끝까지 실행한 뒤에야 돌아오므로,
+긴 프로그램 하나가 뒤에 있는 짧은 프로그램들을 모두 기다리게 만든다.
+
+여기서는 노드 종류마다 generator로 된 평가 함수를 두고,
+자식 노드를 평가해야 할 때 (노드, Environment)를 yield해서 요청한다.
+Task는 이 generator들을 파이썬 호출 스택 대신 자기 stack에 쌓아두고 한 단계씩 진행하므로,
+정해진 단계(step)만큼 실행한 뒤 언제든 멈췄다가 이어서 실행할 수 있다.
+파이썬 재귀를 쓰지 않으므로 evaluate보다 깊은 재귀 호출도 실행할 수 있다.
+
+Scheduler는 Task마다 slice_steps 단계씩 실행한다.
+우선순위가 높은 Task부터 실행하고, 우선순위가 같으면 돌아가며(round-robin) 실행한다.
+
+scheduler = Scheduler(slice_steps=1000)
+scheduler.spawn("let f = fn(n) { ... }; f(30)")
+scheduler.spawn("1 + 2", priority=1)
+for task in scheduler.run():
+    print(task.name, task.result)
+"""
+
+import heapq
+import itertools
+from typing import Generator, Iterator, List, Optional, Tuple, Union
+
+from pinterpret.ast import (
+    Node,
+    Program,
+    ExpressionStatement,
+    BlockStatement,
+    ReturnStatement,
+    WhileStatement,
+    LetStatement,
+    Identifier,
+    IntegerLiteral,
+    StringLiteral,
+    BoolLiteral,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+)
+from pinterpret.builtins import call_builtin
+from pinterpret.common import Object
+from pinterpret.environment import Environment
+from pinterpret.evaluator import (
+    build_hash,
+    evaluate,
+    extend_function_env,
+    index_operation,
+    infix_operation,
+    is_truthy,
+    prefix_operation,
+)
+from pinterpret.lexer import Lexer
+from pinterpret.obj import (
+    ArrayObj,
+    BuiltinObj,
+    ErrorObj,
+    FunctionObj,
+    NullObj,
+    ReturnObj,
+)
+from pinterpret.parser import Parser
+from pinterpret.prepared import PrepareError
+
+# 자식 노드 평가 요청
+Request = Tuple[Node, Environment]
+Steps = Generator[Request, Object, Optional[Object]]
+
+# 자식 노드가 없어서 generator를 만들지 않고 바로 evaluate하는 노드
+LEAF_NODES = (IntegerLiteral, StringLiteral, BoolLiteral, Identifier, FunctionLiteral)
+
+
+def statements_steps(stmts, env: Environment) -> Steps:
+    result = NullObj()
+    for stmt in stmts:
+        result = yield stmt, env
+        if isinstance(result, ReturnObj) or isinstance(result, ErrorObj):
+            return result
+    return result
+
+
+def expression_steps(node: ExpressionStatement, env: Environment) -> Steps:
+    return (yield node.expression, env)
+
+
+def prefix_steps(node: PrefixExpression, env: Environment) -> Steps:
+    right_obj = yield node.right, env
+    return prefix_operation(node, right_obj)
+
+
+def infix_steps(node: InfixExpression, env: Environment) -> Steps:
+    left_obj = yield node.left, env
+    right_obj = yield node.right, env
+    return infix_operation(node, left_obj, right_obj)
+
+
+def if_steps(node: IfExpression, env: Environment) -> Steps:
+    value = yield node.condition, env
+    if isinstance(value, ErrorObj):
+        return value
+
+    if is_truthy(value):
+        return (yield node.consequence, env)
+    elif node.alternative:
+        return (yield node.alternative, env)
+    return NullObj()
+
+
+def return_steps(node: ReturnStatement, env: Environment) -> Steps:
+    value = yield node.return_value, env
+    if isinstance(value, ErrorObj):
+        return value
+    return ReturnObj(value)
+
+
+def while_steps(node: WhileStatement, env: Environment) -> Steps:
+    while True:
+        value = yield node.condition, env
+        if isinstance(value, ErrorObj):
+            return value
+        if not is_truthy(value):
+            return NullObj()
+
+        result = yield node.body, env
+        if isinstance(result, ReturnObj) or isinstance(result, ErrorObj):
+            return result
+
+
+def let_steps(node: LetStatement, env: Environment) -> Steps:
+    value = yield node.value, env
+    if isinstance(value, ErrorObj):
+        return value
+    env.set(node.name.value, value)
+    return NullObj()
+
+
+def call_steps(node: CallExpression, env: Environment) -> Steps:
+    function = yield node.function, env
+    if isinstance(function, ErrorObj):
+        return function
+
+    args = []
+    for arg in node.arguments:
+        value = yield arg, env
+        if isinstance(value, ErrorObj):
+            return value
+        args.append(value)
+
+    if isinstance(function, BuiltinObj):
+        return call_builtin(function, args)
+    elif not isinstance(function, FunctionObj):
+        return ErrorObj(f"not a function : {function.type}")
+
+    evaluated = yield function.body, extend_function_env(function, args)
+    if isinstance(evaluated, ReturnObj):
+        return evaluated.value
+    return evaluated
+
+
+def array_steps(node: ArrayLiteral, env: Environment) -> Steps:
+    elements = []
+    for element in node.elements:
+        value = yield element, env
+        if isinstance(value, ErrorObj):
+            return value
+        elements.append(value)
+    return ArrayObj(elements)
+
+
+def hash_steps(node: HashLiteral, env: Environment) -> Steps:
+    objects = []
+    for expr in (*node.keys, *node.values):
+        value = yield expr, env
+        if isinstance(value, ErrorObj):
+            return value
+        objects.append(value)
+    size = len(node.keys)
+    return build_hash(objects[:size], objects[size:])
+
+
+def index_steps(node: IndexExpression, env: Environment) -> Steps:
+    left = yield node.left, env
+    index = yield node.index, env
+    return index_operation(left, index)
+
+
+def node_steps(node: Node, env: Environment) -> Optional[Steps]:
+    """evaluate와 같은 분기로 노드의 generator를 만든다."""
+    if isinstance(node, (Program, BlockStatement)):
+        return statements_steps(node.statements, env)
+    elif isinstance(node, ExpressionStatement):
+        return expression_steps(node, env)
+    elif isinstance(node, PrefixExpression):
+        return prefix_steps(node, env)
+    elif isinstance(node, InfixExpression):
+        return infix_steps(node, env)
+    elif isinstance(node, IfExpression):
+        return if_steps(node, env)
+    elif isinstance(node, ReturnStatement):
+        return return_steps(node, env)
+    elif isinstance(node, LetStatement):
+        return let_steps(node, env)
+    elif isinstance(node, WhileStatement):
+        return while_steps(node, env)
+    elif isinstance(node, CallExpression):
+        return call_steps(node, env)
+    elif isinstance(node, ArrayLiteral):
+        return array_steps(node, env)
+    elif isinstance(node, HashLiteral):
+        return hash_steps(node, env)
+    elif isinstance(node, IndexExpression):
+        return index_steps(node, env)
+    return None
+
+
+class Task:
+    """한 단계씩 실행할 수 있는 프로그램 하나
+
+    한 단계는 노드 하나의 평가를 시작하거나, 자식 노드의 결과를 받아 이어가는 것이다.
+    실행 중에 파이썬 예외(0으로 나누기 등)가 나면 exception에 담고 끝난다.
+    """
+
+    name: str
+    priority: int
+    steps: int  # 지금까지 실행한 단계 수
+    slices: int  # 지금까지 받은 실행 시간 조각 수
+    result: Optional[Object]  # ReturnObj는 풀어서 담는다.
+    exception: Optional[BaseException]
+
+    def __init__(
+        self, program: Program, env: Environment, name: str = "", priority: int = 0
+    ):
+        self.name = name
+        self.priority = priority
+        self.steps = 0
+        self.slices = 0
+        self.result = None
+        self.exception = None
+        self._stack: List[Steps] = [node_steps(program, env)]
+        self._value: Optional[Object] = None  # 맨 위 generator에 보낼 값
+
+    @property
+    def done(self) -> bool:
+        return not self._stack
+
+    def run(self, max_steps: int) -> bool:
+        """최대 max_steps 단계를 실행하고, 프로그램이 끝났는지 돌려준다."""
+        stack = self._stack
+        value = self._value
+        count = 0
+        try:
+            while stack and count < max_steps:
+                count += 1
+                try:
+                    node, env = stack[-1].send(value)
+                except StopIteration as e:
+                    stack.pop()
+                    value = e.value
+                    continue
+
+                if isinstance(node, LEAF_NODES):
+                    value = evaluate(node, env)
+                    continue
+
+                steps = node_steps(node, env)
+                if steps is None:
+                    value = evaluate(node, env)
+                else:
+                    stack.append(steps)
+                    value = None
+        except Exception as e:
+            self.exception = e
+            stack.clear()
+
+        self.steps += count
+        self.slices += 1
+        self._value = value
+        if not stack and self.exception is None:
+            self.result = value.value if isinstance(value, ReturnObj) else value
+        return not stack
+
+
+class Scheduler:
+    """Task들을 slice_steps 단계씩 번갈아 실행한다.
+
+    priority가 큰 Task가 먼저 실행되고, 같은 priority끼리는 round-robin으로 실행된다.
+    높은 priority의 Task가 계속 있으면 낮은 priority의 Task는 기다린다.
+    """
+
+    slice_steps: int
+
+    def __init__(self, slice_steps: int = 1000):
+        if slice_steps < 1:
+            raise ValueError("slice_steps must be positive")
+        self.slice_steps = slice_steps
+        # (-priority, 들어온 순서, task)
+        self._queue: List[Tuple[int, int, Task]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def spawn(
+        self,
+        program: Union[str, Program],
+        env: Optional[Environment] = None,
+        name: str = "",
+        priority: int = 0,
+    ) -> Task:
+        if isinstance(program, str):
+            parser = Parser(Lexer(program))
+            program = parser.parse_program()
+            if parser.errors:
+                raise PrepareError(parser.errors)
+
+        task = Task(program, env or Environment(), name=name, priority=priority)
+        self._push(task)
+        return task
+
+    def _push(self, task: Task):
+        heapq.heappush(self._queue, (-task.priority, next(self._counter), task))
+
+    def run_slice(self) -> Optional[Task]:
+        """다음 Task를 한 조각 실행한다. 그 Task가 끝났으면 돌려준다."""
+        _, _, task = heapq.heappop(self._queue)
+        if task.run(self.slice_steps):
+            return task
+        self._push(task)
+        return None
+
+    def run(self) -> Iterator[Task]:
+        """모든 Task가 끝날 때까지 실행하고, 끝난 Task를 끝난 순서대로 돌려준다."""
+        while self._queue:
+            task = self.run_slice()
+            if task is not None:
+                yield task
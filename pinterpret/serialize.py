@@ -0,0 +1,388 @@
+"""
+AST 바이너리 직렬화
+
+Program을 다시 파싱하지 않고 저장/복원하기 위한 압축된 바이너리 포맷.
+
+포맷
+MAGIC(4 bytes) VERSION(1 byte)
+문자열 개수(varint) [길이(varint) utf-8 바이트]*     <- 토큰 리터럴 문자열 테이블
+명령문 개수(varint) [명령문 바이트 길이(varint)]*      <- 명령문 위치 색인
+명령문 바이트*
+
+각 명령문은 노드를 전위 순회(prefix order)한 순서로 기록한다.
+노드 하나는 태그(1 byte), 토큰 리터럴의 문자열 테이블 인덱스(varint),
+그리고 태그에 따라 자식 개수 등의 추가 정보(varint)로 이루어지고, 그 뒤에 자식 노드가 온다.
+
+같은 식별자/리터럴은 문자열 테이블에 한 번만 저장되고, 복원할 때도 Token을 한 번만 만든다.
+명령문 위치 색인 덕분에 ProgramReader는 mmap 위에서 필요한 명령문만 골라 복원할 수 있다.
+깊게 중첩된 AST도 다룰 수 있도록, 직렬화와 복원 모두 재귀 없이 동작한다.
+"""
+
+import mmap
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from pinterpret.ast import (
+    Node,
+    Program,
+    Statement,
+    LetStatement,
+    ReturnStatement,
+    WhileStatement,
+    ExpressionStatement,
+    BlockStatement,
+    Identifier,
+    IntegerLiteral,
+    StringLiteral,
+    BoolLiteral,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+)
+from pinterpret.token import Token
+
+MAGIC = b"PINT"
+FORMAT_VERSION = 1
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class NodeTag(IntEnum):
+    NONE = 0
+    LET = 1
+    RETURN = 2
+    EXPRESSION = 3
+    BLOCK = 4
+    IDENTIFIER = 5
+    INTEGER = 6
+    BOOL = 7
+    PREFIX = 8
+    INFIX = 9
+    IF = 10
+    FUNCTION = 11
+    CALL = 12
+    ARRAY = 13
+    INDEX = 14
+    HASH = 15
+    STRING = 16
+    WHILE = 17
+
+
+class SerializeError(Exception):
+    pass
+
+
+def write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(buf: Buffer, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Encoder:
+    """Program을 바이너리 포맷으로 변환한다."""
+
+    strings: Dict[str, int]
+
+    def __init__(self):
+        self.strings = {}
+
+    def string_index(self, text: str) -> int:
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def encode(self, program: Program) -> bytes:
+        statements = [self.encode_node(stmt) for stmt in program.statements]
+
+        out = bytearray(MAGIC)
+        out.append(FORMAT_VERSION)
+
+        write_varint(out, len(self.strings))
+        for text in self.strings:
+            data = text.encode()
+            write_varint(out, len(data))
+            out += data
+
+        write_varint(out, len(statements))
+        for data in statements:
+            write_varint(out, len(data))
+        for data in statements:
+            out += data
+        return bytes(out)
+
+    def encode_node(self, root: Optional[Node]) -> bytearray:
+        out = bytearray()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                out.append(NodeTag.NONE)
+                continue
+
+            tag, extra, children = self.describe(node)
+            out.append(tag)
+            write_varint(out, self.string_index(node.token.literal))
+            if extra is not None:
+                write_varint(out, extra)
+            stack.extend(reversed(children))
+        return out
+
+    @staticmethod
+    def describe(node: Node) -> Tuple[NodeTag, Optional[int], List[Optional[Node]]]:
+        """노드의 (태그, 추가 정보, 자식 노드 목록)"""
+        if isinstance(node, Identifier):
+            return NodeTag.IDENTIFIER, None, []
+        elif isinstance(node, IntegerLiteral):
+            return NodeTag.INTEGER, None, []
+        elif isinstance(node, BoolLiteral):
+            return NodeTag.BOOL, None, []
+        elif isinstance(node, StringLiteral):
+            return NodeTag.STRING, None, []
+        elif isinstance(node, PrefixExpression):
+            return NodeTag.PREFIX, None, [node.right]
+        elif isinstance(node, InfixExpression):
+            return NodeTag.INFIX, None, [node.left, node.right]
+        elif isinstance(node, CallExpression):
+            return (
+                NodeTag.CALL,
+                len(node.arguments),
+                [node.function, *node.arguments],
+            )
+        elif isinstance(node, ArrayLiteral):
+            return NodeTag.ARRAY, len(node.elements), list(node.elements)
+        elif isinstance(node, HashLiteral):
+            # 추가 정보는 자식 개수이므로 쌍 개수의 두 배이다.
+            return NodeTag.HASH, 2 * len(node.keys), [*node.keys, *node.values]
+        elif isinstance(node, IndexExpression):
+            return NodeTag.INDEX, None, [node.left, node.index]
+        elif isinstance(node, IfExpression):
+            if node.alternative is None:
+                return NodeTag.IF, 0, [node.condition, node.consequence]
+            return (
+                NodeTag.IF,
+                1,
+                [node.condition, node.consequence, node.alternative],
+            )
+        elif isinstance(node, FunctionLiteral):
+            return (
+                NodeTag.FUNCTION,
+                len(node.parameters),
+                [*node.parameters, node.body],
+            )
+        elif isinstance(node, BlockStatement):
+            return NodeTag.BLOCK, len(node.statements), list(node.statements)
+        elif isinstance(node, LetStatement):
+            return NodeTag.LET, None, [node.name, node.value]
+        elif isinstance(node, ReturnStatement):
+            return NodeTag.RETURN, None, [node.return_value]
+        elif isinstance(node, WhileStatement):
+            return NodeTag.WHILE, None, [node.condition, node.body]
+        elif isinstance(node, ExpressionStatement):
+            return NodeTag.EXPRESSION, None, [node.expression]
+        raise SerializeError(f"not supported node : {type(node).__name__}")
+
+
+class ProgramReader:
+    """바이너리 포맷에서 명령문을 필요할 때 하나씩 복원한다.
+
+    buffer로 mmap을 넘기면 파일 전체를 읽지 않고, 접근한 명령문만 읽는다.
+    """
+
+    buffer: Buffer
+    strings: List[str]
+    offsets: List[int]  # 각 명령문의 시작 위치, 마지막 원소는 끝 위치
+
+    def __init__(self, buffer: Buffer):
+        self.buffer = buffer
+        if bytes(buffer[: len(MAGIC)]) != MAGIC:
+            raise SerializeError("not a pinterpret binary program")
+        if buffer[len(MAGIC)] != FORMAT_VERSION:
+            raise SerializeError(f"not supported format version : {buffer[4]}")
+        pos = len(MAGIC) + 1
+
+        count, pos = read_varint(buffer, pos)
+        self.strings = []
+        for _ in range(count):
+            length, pos = read_varint(buffer, pos)
+            self.strings.append(bytes(buffer[pos : pos + length]).decode())
+            pos += length
+        self._tokens: List[Optional[Token]] = [None] * count
+
+        count, pos = read_varint(buffer, pos)
+        lengths = []
+        for _ in range(count):
+            length, pos = read_varint(buffer, pos)
+            lengths.append(length)
+
+        self.offsets = [pos]
+        for length in lengths:
+            pos += length
+            self.offsets.append(pos)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Statement:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return self.decode_node(self.offsets[index % len(self)])
+
+    def __iter__(self) -> Iterator[Statement]:
+        for offset in self.offsets[:-1]:
+            yield self.decode_node(offset)
+
+    def read_program(self) -> Program:
+        return Program(list(self))
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> "ProgramReader":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def token(self, index: int) -> Token:
+        # 같은 리터럴의 토큰은 한 번만 만든다.
+        # 여러 스레드가 동시에 읽으면 토큰이 두 번 만들어질 수 있지만, 값은 같다.
+        token = self._tokens[index]
+        if token is None:
+            token = self._tokens[index] = Token(self.strings[index])
+        return token
+
+    def decode_node(self, pos: int) -> Optional[Node]:
+        buf = self.buffer
+        tokens = self._tokens
+        # [태그, 토큰, 추가 정보, 모인 자식 노드, 전체 자식 개수]
+        stack = []
+        while True:
+            tag = buf[pos]
+            pos += 1
+            if tag == NONE_TAG:
+                node = None
+            else:
+                index, pos = read_varint(buf, pos)
+                token = tokens[index]
+                if token is None:
+                    token = self.token(index)
+                extra = None
+                size = CHILDREN_SIZE[tag]
+                if tag in EXTRA_TAGS:
+                    extra, pos = read_varint(buf, pos)
+                    size += extra
+                if size:
+                    stack.append([tag, token, extra, [], size])
+                    continue
+                node = BUILDERS[tag](token, extra, [])
+
+            # 자식 노드가 다 모인 부모 노드를 차례로 조립한다.
+            while stack:
+                frame = stack[-1]
+                frame[3].append(node)
+                if len(frame[3]) < frame[4]:
+                    break
+                stack.pop()
+                node = BUILDERS[frame[0]](frame[1], frame[2], frame[3])
+            else:
+                return node
+
+
+NONE_TAG = int(NodeTag.NONE)
+
+# 추가 정보(varint)를 갖는 태그. 자식 개수가 추가 정보만큼 늘어난다.
+EXTRA_TAGS = frozenset(
+    int(tag)
+    for tag in (
+        NodeTag.CALL,
+        NodeTag.IF,
+        NodeTag.FUNCTION,
+        NodeTag.BLOCK,
+        NodeTag.ARRAY,
+        NodeTag.HASH,
+    )
+)
+
+CHILDREN_SIZE = {
+    int(NodeTag.IDENTIFIER): 0,
+    int(NodeTag.INTEGER): 0,
+    int(NodeTag.BOOL): 0,
+    int(NodeTag.PREFIX): 1,
+    int(NodeTag.INFIX): 2,
+    int(NodeTag.CALL): 1,
+    int(NodeTag.IF): 2,
+    int(NodeTag.FUNCTION): 1,
+    int(NodeTag.BLOCK): 0,
+    int(NodeTag.LET): 2,
+    int(NodeTag.RETURN): 1,
+    int(NodeTag.EXPRESSION): 1,
+    int(NodeTag.ARRAY): 0,
+    int(NodeTag.INDEX): 2,
+    int(NodeTag.HASH): 0,
+    int(NodeTag.STRING): 0,
+    int(NodeTag.WHILE): 2,
+}
+
+# 태그별 노드 생성 함수 : (토큰, 추가 정보, 자식 노드) -> 노드
+BUILDERS = {
+    int(NodeTag.IDENTIFIER): lambda t, e, c: Identifier(t),
+    int(NodeTag.INTEGER): lambda t, e, c: IntegerLiteral(t),
+    int(NodeTag.BOOL): lambda t, e, c: BoolLiteral(t),
+    int(NodeTag.PREFIX): lambda t, e, c: PrefixExpression(t, c[0]),
+    int(NodeTag.INFIX): lambda t, e, c: InfixExpression(t, c[0], c[1]),
+    int(NodeTag.CALL): lambda t, e, c: CallExpression(t, c[0], c[1:]),
+    int(NodeTag.IF): lambda t, e, c: IfExpression(t, *c),
+    int(NodeTag.FUNCTION): lambda t, e, c: FunctionLiteral(t, c[:-1], c[-1]),
+    int(NodeTag.BLOCK): lambda t, e, c: BlockStatement(t, c),
+    int(NodeTag.LET): lambda t, e, c: LetStatement(t, c[0], c[1]),
+    int(NodeTag.RETURN): lambda t, e, c: ReturnStatement(t, c[0]),
+    int(NodeTag.EXPRESSION): lambda t, e, c: ExpressionStatement(t, c[0]),
+    int(NodeTag.ARRAY): lambda t, e, c: ArrayLiteral(t, c),
+    int(NodeTag.INDEX): lambda t, e, c: IndexExpression(t, c[0], c[1]),
+    int(NodeTag.STRING): lambda t, e, c: StringLiteral(t),
+    int(NodeTag.WHILE): lambda t, e, c: WhileStatement(t, c[0], c[1]),
+    int(NodeTag.HASH): lambda t, e, c: HashLiteral(t, c[: e // 2], c[e // 2 :]),
+}
+
+
+def dumps(program: Program) -> bytes:
+    return Encoder().encode(program)
+
+
+def loads(data: Buffer) -> Program:
+    return ProgramReader(data).read_program()
+
+
+def dump(program: Program, path: str):
+    with open(path, "wb") as f:
+        f.write(dumps(program))
+
+
+def load(path: str) -> ProgramReader:
+    """파일을 mmap으로 열어 ProgramReader를 돌려준다.
+
+    명령문은 접근할 때 복원되므로, 다 쓰고 나면 close()를 호출하거나 with 문으로 사용한다.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return ProgramReader(buffer)
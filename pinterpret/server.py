@@ -0,0 +1,547 @@
+"""
+로컬 평가 서버
+
+TCP나 Unix 소켓으로 프로그램을 받아, 계속 떠 있는 worker 프로세스들에서 평가하고 결과를 돌려준다.
+
+메시지 형식 (framing)
+    ndjson : 한 줄에 JSON 하나
+    length : 4바이트 big-endian 길이 + JSON
+
+요청
+    {"id": 1, "source": "1 + 2", "timeout": 0.5}   id, timeout은 생략할 수 있다.
+    {"id": 2, "op": "stats"}                      지연 시간 히스토그램을 돌려준다.
+응답
+    {"id": 1, "type": "INTEGER", "result": "3"} 또는 {"id": 1, "error": "..."}
+
+- 한 연결에서 응답을 기다리지 않고 요청을 계속 보낼 수 있다. (pipelining)
+  응답은 끝나는 순서대로 보내므로 id로 요청과 짝을 맞춘다.
+  한 연결에서 동시에 처리하는 요청 수는 max_pipeline으로 제한한다.
+- worker는 prelude를 한 번 평가해 두고 (pinterpret.batch.init_worker),
+  프로그램을 scheduler.Task로 slice_steps 단계씩 실행하면서 timeout을 확인한다.
+  그래서 끝나지 않는 프로그램도 timeout이 지나면 멈추고 worker는 다음 요청을 받는다.
+  내장 함수 안의 호출처럼 단계로 나눠 실행하지 않는 곳에서 멈추지 않으면
+  (TIMEOUT_GRACE까지 지나도 응답이 없으면) 그 풀을 새 풀로 바꾸고,
+  진행 중인 다른 요청이 끝나면 옛 풀의 worker 프로세스를 끝낸다.
+
+CLI
+python -m pinterpret.server [--host HOST --port PORT | --unix PATH] [--framing ndjson|length]
+                            [--workers N] [--timeout SEC] [--prelude FILE]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Set
+
+from pinterpret.batch import (
+    fork,
+    init_worker,
+    load_prelude,
+    result_record,
+    worker_prelude,
+)
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+from pinterpret.scheduler import Task
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_SLICE_STEPS = 10000
+
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024  # 16MB
+
+# worker가 한 단계를 오래 실행해서 timeout 확인이 늦어질 때를 위한 여유 시간
+TIMEOUT_GRACE = 1.0
+
+LENGTH_PREFIX = struct.Struct(">I")
+
+
+class FramingError(Exception):
+    """메시지 경계를 읽을 수 없을 때. 연결을 끊는다."""
+
+
+class Framing:
+    name: str
+
+    async def read(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """메시지 하나를 읽는다. 연결이 끝났으면 None을 돌려준다."""
+        raise NotImplementedError
+
+    def encode(self, payload: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class NdjsonFraming(Framing):
+    name = "ndjson"
+
+    async def read(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError as e:
+                # 한 줄이 StreamReader의 limit를 넘었을 때
+                raise FramingError(str(e)) from e
+            if not line:
+                return None
+            if line.strip():
+                return line
+
+    def encode(self, payload: bytes) -> bytes:
+        return payload + b"\n"
+
+
+class LengthPrefixFraming(Framing):
+    name = "length"
+
+    async def read(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        try:
+            header = await reader.readexactly(LENGTH_PREFIX.size)
+            (size,) = LENGTH_PREFIX.unpack(header)
+            if size > MAX_MESSAGE_SIZE:
+                raise FramingError(f"message too large : {size} bytes")
+            return await reader.readexactly(size)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise FramingError("connection closed in the middle of a message") from e
+
+    def encode(self, payload: bytes) -> bytes:
+        return LENGTH_PREFIX.pack(len(payload)) + payload
+
+
+FRAMINGS = {framing.name: framing for framing in (NdjsonFraming, LengthPrefixFraming)}
+
+
+def get_framing(name: str) -> Framing:
+    try:
+        return FRAMINGS[name]()
+    except KeyError:
+        raise ValueError(f"not supported framing : {name}") from None
+
+
+class LatencyHistogram:
+    """지연 시간 히스토그램
+
+    bucket은 마이크로초 단위의 로그 스케일로, 2배마다 SUBBUCKETS개로 나눈다.
+    백분위 값은 그 값이 들어있는 bucket의 상한이므로 최대 약 19% 크게 나온다.
+    """
+
+    SUBBUCKETS = 4
+
+    count: int
+    total: float
+    max: float
+    buckets: Dict[int, int]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+    def record(self, seconds: float):
+        micros = max(seconds * 1e6, 1.0)
+        index = int(math.log2(micros) * self.SUBBUCKETS)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def upper_bound(self, index: int) -> float:
+        """bucket의 상한 (초)"""
+        return 2 ** ((index + 1) / self.SUBBUCKETS) / 1e6
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def snapshot(self) -> Dict:
+        """밀리초 단위 요약"""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p90_ms": self.percentile(90) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max * 1e3,
+            "buckets": [
+                [self.upper_bound(index) * 1e3, self.buckets[index]]
+                for index in sorted(self.buckets)
+            ],
+        }
+
+
+def kill_executor(executor: ProcessPoolExecutor):
+    """실행 중인 작업을 기다리지 않고 worker 프로세스들을 끝낸다."""
+    # 실행 중인 작업은 취소할 수 없으므로 프로세스를 직접 끝낸다.
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def evaluate_request(
+    job_id, source: str, timeout: Optional[float], slice_steps: int
+) -> Dict:
+    """worker 프로세스에서 실행된다. timeout초가 지나면 평가를 멈춘다.
+
+    파싱이나 평가 중에 예외가 나도 에러 응답으로 돌려준다.
+    """
+    try:
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        if parser.errors:
+            return {"id": job_id, "error": "; ".join(parser.errors)}
+
+        task = Task(program, fork(worker_prelude()))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not task.run(slice_steps):
+            if deadline is not None and time.monotonic() >= deadline:
+                return {"id": job_id, "error": f"timeout : {timeout}s"}
+    except Exception as e:
+        return {"id": job_id, "error": f"{type(e).__name__}: {e}"}
+
+    if task.exception is not None:
+        e = task.exception
+        return {"id": job_id, "error": f"{type(e).__name__}: {e}"}
+    return result_record(job_id, task.result)
+
+
+class EvaluationServer:
+    timeout: Optional[float]  # 요청에 timeout이 없을 때 쓰는 값, None이면 제한 없음
+    max_pipeline: int  # 한 연결에서 동시에 처리하는 요청 수
+    histogram: LatencyHistogram  # 요청을 받고 결과가 나오기까지의 시간
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        prelude: Optional[str] = None,
+        framing: str = "ndjson",
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        max_pipeline: int = 64,
+        slice_steps: int = DEFAULT_SLICE_STEPS,
+    ):
+        if prelude:
+            # worker를 띄우기 전에 prelude의 에러를 확인한다.
+            load_prelude(prelude)
+
+        self.workers = workers or os.cpu_count() or 1
+        self.prelude = prelude
+        self.framing = get_framing(framing)
+        self.timeout = timeout
+        self.max_pipeline = max_pipeline
+        self.slice_steps = slice_steps
+        self.histogram = LatencyHistogram()
+        self.executor = self.new_executor()
+        # executor -> 그 풀에서 응답을 기다리고 있는 요청 수
+        self._active: Dict[ProcessPoolExecutor, int] = {}
+        self._ids = itertools.count()
+        self._server: Optional[asyncio.AbstractServer] = None
+        # 처리 중인 연결 -> 그 연결의 writer
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    def new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=init_worker, initargs=(self.prelude,)
+        )
+
+    async def start_tcp(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self._server = await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_MESSAGE_SIZE
+        )
+        return self._server
+
+    async def start_unix(self, path: str):
+        self._server = await asyncio.start_unix_server(
+            self.handle_connection, path, limit=MAX_MESSAGE_SIZE
+        )
+        return self._server
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # 연결을 닫아서 handle_connection이 받은 요청까지만 처리하고 끝나게 한다.
+            for writer in self._connections.values():
+                writer.close()
+            if self._connections:
+                await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        for executor in self._active:
+            if executor is not self.executor:
+                kill_executor(executor)
+        self.executor.shutdown()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        pending: Set[asyncio.Future] = set()
+        slots = asyncio.Semaphore(self.max_pipeline)
+        write_lock = asyncio.Lock()
+
+        def finished(future: asyncio.Future):
+            pending.discard(future)
+            slots.release()
+
+        connection = asyncio.current_task()
+        self._connections[connection] = writer
+        try:
+            while True:
+                try:
+                    message = await self.framing.read(reader)
+                except (FramingError, ConnectionError):
+                    break
+                if message is None:
+                    break
+
+                await slots.acquire()
+                future = asyncio.ensure_future(
+                    self.respond(message, writer, write_lock)
+                )
+                pending.add(future)
+                future.add_done_callback(finished)
+
+            # 클라이언트가 쓰기를 끝내도 받은 요청에는 모두 응답한다.
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            del self._connections[connection]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def respond(
+        self, message: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock
+    ):
+        response = await self.handle_request(message)
+        payload = self.framing.encode(json.dumps(response).encode())
+        try:
+            async with write_lock:
+                writer.write(payload)
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def handle_request(self, message: bytes) -> Dict:
+        received = time.perf_counter()
+        try:
+            request = json.loads(message)
+        except ValueError as e:
+            return {"id": None, "error": f"invalid request : {e}"}
+        if not isinstance(request, dict):
+            return {"id": None, "error": "invalid request : not an object"}
+
+        job_id = request.get("id")
+        if job_id is None:
+            job_id = next(self._ids)
+
+        if request.get("op") == "stats":
+            return {"id": job_id, "stats": self.histogram.snapshot()}
+
+        source = request.get("source")
+        if not isinstance(source, str):
+            return {"id": job_id, "error": "invalid request : source is required"}
+
+        timeout = request.get("timeout", self.timeout)
+        if timeout is not None and not (
+            isinstance(timeout, (int, float)) and timeout > 0
+        ):
+            return {"id": job_id, "error": "invalid request : timeout must be > 0"}
+
+        response = await self.run_in_worker(job_id, source, timeout)
+        self.histogram.record(time.perf_counter() - received)
+        return response
+
+    async def run_in_worker(self, job_id, source: str, timeout: Optional[float]):
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        future = loop.run_in_executor(
+            executor, evaluate_request, job_id, source, timeout, self.slice_steps
+        )
+        self._active[executor] = self._active.get(executor, 0) + 1
+        try:
+            return await asyncio.wait_for(
+                future, None if timeout is None else timeout + TIMEOUT_GRACE
+            )
+        except asyncio.TimeoutError:
+            # worker가 timeout을 확인하지 못하고 계속 실행 중이다.
+            # 새 요청은 새 풀로 보내고, 옛 풀은 남은 요청이 끝나면 끝낸다.
+            if self.executor is executor:
+                self.executor = self.new_executor()
+            return {"id": job_id, "error": f"timeout : {timeout}s"}
+        except BrokenProcessPool:
+            # worker 프로세스가 죽으면 풀 전체를 쓸 수 없으므로 새로 띄운다.
+            if self.executor is executor:
+                self.executor = self.new_executor()
+                executor.shutdown(wait=False)
+            return {"id": job_id, "error": "worker process died"}
+        except Exception as e:
+            # 결과를 주고받는 중의 에러 (pickle 등). 응답 없이 끝나지 않도록 에러로 돌려준다.
+            return {"id": job_id, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            self._active[executor] -= 1
+            if not self._active[executor]:
+                del self._active[executor]
+                if executor is not self.executor:
+                    kill_executor(executor)
+
+
+class Client:
+    """서버에 요청을 pipelining으로 보내는 클라이언트
+
+    요청마다 id를 붙이고, 응답의 id로 기다리고 있는 요청을 찾는다.
+
+    client = await Client.connect_tcp("127.0.0.1", 8765)
+    results = await asyncio.gather(*(client.request(s) for s in sources))
+    await client.close()
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        framing: str = "ndjson",
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.framing = get_framing(framing)
+        self._ids = itertools.count()
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._read_task = asyncio.ensure_future(self._read_responses())
+
+    @classmethod
+    async def connect_tcp(
+        cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, framing="ndjson"
+    ) -> "Client":
+        reader, writer = await asyncio.open_connection(
+            host, port, limit=MAX_MESSAGE_SIZE
+        )
+        return cls(reader, writer, framing)
+
+    @classmethod
+    async def connect_unix(cls, path: str, framing="ndjson") -> "Client":
+        reader, writer = await asyncio.open_unix_connection(
+            path, limit=MAX_MESSAGE_SIZE
+        )
+        return cls(reader, writer, framing)
+
+    async def send(self, request: Dict) -> Dict:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        payload = json.dumps({**request, "id": request_id}).encode()
+        self.writer.write(self.framing.encode(payload))
+        await self.writer.drain()
+        return await future
+
+    async def request(self, source: str, timeout: Optional[float] = None) -> Dict:
+        request = {"source": source}
+        if timeout is not None:
+            request["timeout"] = timeout
+        return await self.send(request)
+
+    async def stats(self) -> Dict:
+        return (await self.send({"op": "stats"}))["stats"]
+
+    async def _read_responses(self):
+        error: Exception = ConnectionError("connection closed")
+        try:
+            while True:
+                message = await self.framing.read(self.reader)
+                if message is None:
+                    break
+                response = json.loads(message)
+                future = self._waiting.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (FramingError, ConnectionError) as e:
+            error = e
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiting.clear()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._read_task
+
+
+async def serve(args: argparse.Namespace):
+    prelude = None
+    if args.prelude:
+        with open(args.prelude, encoding="utf-8") as f:
+            prelude = f.read()
+
+    server = EvaluationServer(
+        workers=args.workers,
+        prelude=prelude,
+        framing=args.framing,
+        timeout=args.timeout or None,
+        max_pipeline=args.max_pipeline,
+    )
+    if args.unix:
+        await server.start_unix(args.unix)
+    else:
+        await server.start_tcp(args.host, args.port)
+    print(f"listening on {server.address} ({args.framing})", flush=True)
+
+    try:
+        await server.serve_forever()
+    finally:
+        print(json.dumps(server.histogram.snapshot()), flush=True)
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pinterpret.server", description="local evaluation server"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on a unix socket instead of TCP")
+    parser.add_argument("--framing", choices=sorted(FRAMINGS), default="ndjson")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="default timeout in seconds per request, 0 for no timeout",
+    )
+    parser.add_argument("--max-pipeline", type=int, default=64)
+    parser.add_argument("--prelude", help="file evaluated once in every worker")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
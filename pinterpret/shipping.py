@@ -0,0 +1,160 @@
+"""
+함수(FunctionObj)를 다른 프로세스로 보내기 위한 pickle 지원
+
+FunctionObj를 기본 방식으로 pickle하면 env의 outer를 따라 도달할 수 있는 모든 바인딩과
+AST 노드 객체가 통째로 들어간다. 여기서는 FunctionObj.__reduce__가
+
+- 함수 본문의 자유 식별자 중 env에서 찾을 수 있는 바인딩만 모은 새 Environment와
+- 함수 리터럴(매개변수 + 본문)의 content hash
+
+만 보내도록 한다. 함수 리터럴은 프로세스마다 하나씩 있는 AST 테이블(ast_table)에
+content hash로 등록되고, 같은 내용의 함수는 몇 번을 보내도 하나만 만들어진다.
+
+보내는 쪽은 받는 쪽이 그 함수 리터럴을 가지고 있는지 모르면 바이너리 AST(serialize)를 함께 보낸다.
+worker를 띄울 때 ast_table.export()를 넘기고 worker에서 ast_table.install()로 등록해두면,
+그 뒤로는 content hash만 보내므로 payload가 작아진다.
+
+모아서 보낸 바인딩은 보낸 시점의 값이다. 보낸 뒤에 원래 Environment에 생긴 let은 보이지 않는다.
+AST 테이블은 등록된 함수를 계속 붙잡고 있으므로, 필요 없어지면 clear()로 비운다.
+"""
+
+import hashlib
+import pickle
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from pinterpret import serialize
+from pinterpret.analysis import FreeIdentifiers
+from pinterpret.ast import BlockStatement, FunctionLiteral, Identifier, Program
+from pinterpret.environment import Environment
+from pinterpret.token import Token
+
+FUNCTION_TOKEN = Token("fn")
+
+
+class AstEntry:
+    """AST 테이블에 등록된 함수 리터럴"""
+
+    __slots__ = ("key", "literal", "data", "free_names")
+
+    key: str  # data의 sha256
+    literal: FunctionLiteral
+    data: bytes  # serialize 포맷
+    free_names: Tuple[str, ...]  # 매개변수를 뺀 본문의 자유 식별자
+
+    def __init__(self, key: str, literal: FunctionLiteral, data: bytes):
+        self.key = key
+        self.literal = literal
+        self.data = data
+        self.free_names = tuple(FreeIdentifiers().run(literal).names)
+
+
+class AstTable:
+    """content hash -> 함수 리터럴"""
+
+    entries: Dict[str, AstEntry]
+    shared: set  # 받는 쪽도 가지고 있는 key
+
+    def __init__(self):
+        self.entries = {}
+        self.shared = set()
+        # id(본문) -> (본문, entry), 본문을 붙잡아 두어 id가 바뀌지 않게 한다.
+        self._by_body: Dict[int, Tuple[BlockStatement, AstEntry]] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get(self, key: str) -> AstEntry:
+        return self.entries[key]
+
+    def add(self, parameters: List[Identifier], body: BlockStatement) -> AstEntry:
+        found = self._by_body.get(id(body))
+        if found is not None and found[0] is body:
+            return found[1]
+
+        literal = FunctionLiteral(FUNCTION_TOKEN, parameters, body)
+        data = serialize.dumps(Program([literal]))
+        entry = self.add_data(hashlib.sha256(data).hexdigest(), data, literal)
+        with self._lock:
+            self._by_body[id(body)] = (body, entry)
+        return entry
+
+    def add_data(
+        self, key: str, data: bytes, literal: Optional[FunctionLiteral] = None
+    ) -> AstEntry:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                return entry
+
+        if literal is None:
+            literal = serialize.ProgramReader(data)[0]
+        entry = AstEntry(key, literal, data)
+        with self._lock:
+            return self.entries.setdefault(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.shared.clear()
+            self._by_body.clear()
+
+    def export(self) -> List[Tuple[str, bytes]]:
+        """지금까지 등록된 함수 리터럴을 install에 넘길 수 있는 형태로 돌려준다.
+
+        돌려준 함수들은 받는 쪽도 가지고 있다고 보고, 이후로는 content hash만 보낸다.
+        """
+        with self._lock:
+            entries = list(self.entries.values())
+            self.shared.update(entry.key for entry in entries)
+        return [(entry.key, entry.data) for entry in entries]
+
+    def install(self, exported: List[Tuple[str, bytes]]):
+        for key, data in exported:
+            self.add_data(key, data)
+        with self._lock:
+            self.shared.update(key for key, _ in exported)
+
+
+# 프로세스마다 하나씩 있는 AST 테이블
+ast_table = AstTable()
+
+
+def captured_environment(env: Environment, names: Tuple[str, ...]) -> Environment:
+    """env에서 names에 해당하는 바인딩만 모은 Environment"""
+    captured = Environment()
+    for name in names:
+        value, ok = env.get(name)
+        if ok:
+            captured.set(name, value)
+    return captured
+
+
+def reduce_function(fn) -> tuple:
+    """FunctionObj.__reduce__
+
+    env는 인자가 아니라 state로 보내야, 재귀 함수처럼 env를 거쳐 자기 자신으로 돌아오는
+    순환 참조를 pickle이 처리할 수 있다.
+    """
+    entry = ast_table.add(fn.parameters, fn.body)
+    data = None if entry.key in ast_table.shared else entry.data
+    env = captured_environment(fn.env, entry.free_names)
+    return restore_function, (entry.key, data), (None, {"env": env})
+
+
+def restore_function(key: str, data: Optional[bytes]):
+    from pinterpret.obj import FunctionObj
+
+    if key in ast_table:
+        entry = ast_table.get(key)
+    elif data is not None:
+        entry = ast_table.add_data(key, data)
+    else:
+        raise pickle.UnpicklingError(f"unknown function literal : {key}")
+
+    literal = entry.literal
+    return FunctionObj(literal.parameters, literal.body, None)
@@ -0,0 +1,160 @@
+"""
+Environment 스냅샷
+
+평가가 끝난 Environment를 통째로 파일에 저장했다가 다른 프로세스에서 복원한다.
+소스코드를 다시 파싱하고 평가하지 않아도 되므로 짧게 실행되는 CLI의 시작 시간을 줄일 수 있다.
+
+Environment, FunctionObj 등 객체 그래프는 pickle로 저장한다.
+pickle은 이미 저장한 객체를 다시 가리키므로, 재귀 함수처럼
+Environment -> FunctionObj -> Environment로 도는 순환 참조도 그대로 복원된다.
+
+함수의 매개변수와 본문 같은 AST 노드는 pickle에 넣지 않고,
+pinterpret.serialize의 바이너리 포맷으로 된 AST 테이블에 한 번씩만 넣고 인덱스로 가리킨다.
+(pickle의 persistent_id) 같은 함수 리터럴에서 만들어진 클로저들은 본문을 공유한다.
+함수 본문은 복원할 때 LazyBlockStatement로 두었다가, 처음 호출될 때 AST 테이블에서 읽는다.
+
+포맷
+MAGIC(4 bytes) VERSION(1 byte) AST 테이블 길이(8 bytes) AST 테이블 pickle 바이트
+
+pickle을 쓰므로 믿을 수 없는 파일은 복원하지 않아야 한다.
+복원할 때는 스냅샷에 실제로 들어가는 클래스와 함수(ALLOWED_GLOBALS)만 불러온다.
+"""
+
+import copyreg
+import io
+import pickle
+import struct
+from functools import partial
+from typing import Dict, List, Optional
+
+from pinterpret import serialize
+from pinterpret.ast import BlockStatement, LazyBlockStatement, Node, Program
+from pinterpret.cache import RestrictedUnpickler
+from pinterpret.environment import Environment
+from pinterpret.obj import FunctionObj
+from pinterpret.serialize import Buffer, NodeTag, ProgramReader, SerializeError
+from pinterpret.token import Token
+
+MAGIC = b"PSNP"
+FORMAT_VERSION = 1
+
+AST_TABLE_SIZE = struct.Struct(">Q")
+HEADER_SIZE = len(MAGIC) + 1 + AST_TABLE_SIZE.size
+
+BLOCK_TOKEN = Token("{")
+
+# 스냅샷의 pickle이 가리킬 수 있는 (모듈, 이름)
+ALLOWED_GLOBALS = frozenset(
+    [
+        ("pinterpret.environment", "Environment"),
+        ("pinterpret.environment", "FrozenEnvironment"),
+        ("pinterpret.common", "ObjectType"),
+        ("pinterpret.obj", "IntegerObj"),
+        ("pinterpret.obj", "BooleanObj"),
+        ("pinterpret.obj", "NullObj"),
+        ("pinterpret.obj", "StringObj"),
+        ("pinterpret.obj", "ArrayObj"),
+        ("pinterpret.obj", "HashObj"),
+        ("pinterpret.obj", "HashKey"),
+        ("pinterpret.obj", "FunctionObj"),
+        ("pinterpret.builtins", "lookup"),
+        ("pinterpret.hamt", "restore"),
+        # ArrayObj의 정수 저장소 (array.array)
+        ("array", "array"),
+        ("array", "_array_reconstructor"),
+    ]
+)
+
+
+class SnapshotPickler(pickle.Pickler):
+    nodes: List[Node]
+
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.nodes = []
+        self._node_index: Dict[int, int] = {}
+
+    def reducer_override(self, obj):
+        # FunctionObj.__reduce__는 필요한 바인딩만 보내지만, 스냅샷은 env를 그대로 저장한다.
+        if type(obj) is FunctionObj:
+            slots = {"parameters": obj.parameters, "body": obj.body, "env": obj.env}
+            return copyreg.__newobj__, (FunctionObj,), (None, slots)
+        return NotImplemented
+
+    def persistent_id(self, obj) -> Optional[int]:
+        if not isinstance(obj, Node):
+            return None
+        # id는 self.nodes가 노드를 붙잡고 있는 동안에는 다른 노드와 겹치지 않는다.
+        index = self._node_index.get(id(obj))
+        if index is None:
+            index = self._node_index[id(obj)] = len(self.nodes)
+            self.nodes.append(obj)
+        return index
+
+
+def decode_block(reader: ProgramReader, index: int, _tokens) -> BlockStatement:
+    return reader[index]
+
+
+class SnapshotUnpickler(RestrictedUnpickler):
+    allowed = ALLOWED_GLOBALS
+
+    def __init__(self, file, reader: ProgramReader, lazy: bool):
+        super().__init__(file)
+        self.reader = reader
+        self.lazy = lazy
+        self._nodes: Dict[int, Node] = {}
+
+    def persistent_load(self, index: int) -> Node:
+        node = self._nodes.get(index)
+        if node is None:
+            node = self._nodes[index] = self.load_node(index)
+        return node
+
+    def load_node(self, index: int) -> Node:
+        reader = self.reader
+        if self.lazy and reader.buffer[reader.offsets[index]] == NodeTag.BLOCK:
+            # 함수 본문은 처음 호출될 때 AST 테이블에서 복원한다.
+            return LazyBlockStatement(
+                BLOCK_TOKEN, None, partial(decode_block, reader, index)
+            )
+        return reader[index]
+
+
+def dumps(env: Environment) -> bytes:
+    payload = io.BytesIO()
+    pickler = SnapshotPickler(payload)
+    pickler.dump(env)
+    table = serialize.dumps(Program(pickler.nodes))
+
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    out += AST_TABLE_SIZE.pack(len(table))
+    out += table
+    out += payload.getbuffer()
+    return bytes(out)
+
+
+def loads(data: Buffer, lazy: bool = True) -> Environment:
+    """lazy=True이면 함수 본문은 처음 호출될 때 복원한다."""
+    view = memoryview(data)
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise SerializeError("not a pinterpret snapshot")
+    if view[len(MAGIC)] != FORMAT_VERSION:
+        raise SerializeError(f"not supported snapshot version : {view[len(MAGIC)]}")
+
+    (table_size,) = AST_TABLE_SIZE.unpack_from(view, len(MAGIC) + 1)
+    table_end = HEADER_SIZE + table_size
+    reader = ProgramReader(view[HEADER_SIZE:table_end])
+    unpickler = SnapshotUnpickler(io.BytesIO(view[table_end:]), reader, lazy)
+    return unpickler.load()
+
+
+def dump(env: Environment, path: str):
+    with open(path, "wb") as f:
+        f.write(dumps(env))
+
+
+def load(path: str, lazy: bool = True) -> Environment:
+    with open(path, "rb") as f:
+        return loads(f.read(), lazy)
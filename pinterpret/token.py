@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Iterable, Union
+from typing import Iterable, Optional, Union
 
 
 class TokenType(Enum):
@@ -8,6 +8,7 @@ class TokenType(Enum):
 
     IDENT = "IDENT"
     INT = "INT"
+    STRING = "STRING"
 
     ASSIGN = "="
     PLUS = "+"
@@ -24,11 +25,14 @@ class TokenType(Enum):
 
     COMMA = ","
     SEMICOLON = ";"
+    COLON = ":"
 
     LPAREN = "("
     RPAREN = ")"
     LBRACE = "{"
     RBRACE = "}"
+    LBRACKET = "["
+    RBRACKET = "]"
 
     FUNCTION = "fn"
     LET = "let"
@@ -37,6 +41,7 @@ class TokenType(Enum):
     IF = "if"
     ELSE = "else"
     RETURN = "return"
+    WHILE = "while"
 
     @classmethod
     def symbols(cls) -> Iterable["TokenType"]:
@@ -53,10 +58,13 @@ class TokenType(Enum):
             TokenType.EQUAL,
             TokenType.NOT_EQUAL,
             TokenType.SEMICOLON,
+            TokenType.COLON,
             TokenType.LPAREN,
             TokenType.RPAREN,
             TokenType.LBRACE,
             TokenType.RBRACE,
+            TokenType.LBRACKET,
+            TokenType.RBRACKET,
         )
 
     @classmethod
@@ -73,6 +81,7 @@ class TokenType(Enum):
             TokenType.IF,
             TokenType.ELSE,
             TokenType.RETURN,
+            TokenType.WHILE,
         )
 
     def __hash__(self):
@@ -84,9 +93,46 @@ class TokenType(Enum):
         return super().__eq__(other)
 
 
+# 기호와 예약어 -> TokenType
+FIXED_TOKEN_TYPES = {
+    token_type.value: token_type
+    for token_type in (*TokenType.symbols(), *TokenType.reserved_words())
+}
+
+
+# 문자열 리터럴에서 \ 뒤에 올 수 있는 문자
+ESCAPES = {'"': '"', "\\": "\\", "n": "\n", "t": "\t"}
+
+
+def string_value(word: str) -> Optional[str]:
+    """따옴표로 감싼 문자열 리터럴의 값, 올바른 리터럴이 아니면 None"""
+    if len(word) < 2 or word[0] != '"' or word[-1] != '"':
+        return None
+    if "\\" not in word:
+        return None if '"' in word[1:-1] else word[1:-1]
+
+    chars = []
+    i = 1
+    end = len(word) - 1
+    while i < end:
+        char = word[i]
+        if char == '"':
+            return None
+        if char == "\\":
+            i += 1
+            if i >= end or word[i] not in ESCAPES:
+                return None
+            char = ESCAPES[word[i]]
+        chars.append(char)
+        i += 1
+    return "".join(chars)
+
+
 class Token:
     """Lexical Analysis를 통해, 소스코드에서 나온 단어를 토큰 열로 변환"""
 
+    __slots__ = ("type", "literal")
+
     type: TokenType
     literal: str
 
@@ -96,24 +142,20 @@ class Token:
             self.literal = ""
             return
 
-        for symbol in TokenType.symbols():
-            if word == symbol:
-                self.type = symbol
-                self.literal = word
-                return
-
-        for token in TokenType.reserved_words():
-            if word == token:
-                self.type = token
-                self.literal = word
-                return
-
-        if word.isnumeric():
+        token_type = FIXED_TOKEN_TYPES.get(word)
+        if token_type is not None:
+            self.type = token_type
+            self.literal = word
+        elif word.isnumeric():
             self.type = TokenType.INT
             self.literal = word
         elif word[0].isalnum() and word.isalnum():
             self.type = TokenType.IDENT
             self.literal = word
+        elif string_value(word) is not None:
+            # 리터럴에는 따옴표와 escape를 소스코드 그대로 둔다.
+            self.type = TokenType.STRING
+            self.literal = word
         else:
             self.type = TokenType.ILLEGAL
             self.literal = word
@@ -0,0 +1,215 @@
+"""
+AST를 다시 소스코드로 변환 (unparse)
+
+노드의 __str__은 자식 노드의 문자열을 재귀적으로 이어 붙이기 때문에,
+큰 프로그램에서는 중간 문자열이 계속 복사되고 깊은 트리에서는 재귀 한도에 걸린다.
+Unparser는 출력할 조각을 stack에 쌓아두고 하나씩 꺼내 버퍼(io.StringIO나 파일)에
+바로 쓰므로, 출력 크기에 비례하는 시간과 일정한 파이썬 스택만 사용한다.
+
+출력은 다시 파싱할 수 있는 소스코드이며, 괄호는 연산자 우선순위상 필요한 곳에만 넣는다.
+pretty=True이면 명령문마다 줄을 바꾸고 블록을 들여쓰며 연산자 양옆에 공백을 넣는다.
+"""
+
+import io
+from typing import List, Optional, TextIO, Union
+
+from pinterpret.ast import (
+    Node,
+    Program,
+    Expression,
+    LetStatement,
+    ReturnStatement,
+    WhileStatement,
+    ExpressionStatement,
+    BlockStatement,
+    Identifier,
+    IntegerLiteral,
+    StringLiteral,
+    BoolLiteral,
+    PrefixExpression,
+    InfixExpression,
+    IfExpression,
+    FunctionLiteral,
+    CallExpression,
+    ArrayLiteral,
+    HashLiteral,
+    IndexExpression,
+)
+from pinterpret.parser import OperatorPrecedence, PRECEDENCE_RELATION
+
+# 식별자, 리터럴처럼 괄호가 필요 없는 표현식의 우선순위
+ATOM_PRECEDENCE = OperatorPrecedence.INDEX + 1
+
+
+class Marker:
+    """stack에 쌓이는 특수 조각 (줄바꿈, 들여쓰기)"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+NEWLINE = Marker("NEWLINE")
+INDENT = Marker("INDENT")
+DEDENT = Marker("DEDENT")
+
+Part = Union[str, Node, Marker, None]
+
+
+def precedence_of(expr: Optional[Expression]) -> int:
+    if isinstance(expr, InfixExpression):
+        return PRECEDENCE_RELATION.get(expr.token.type, OperatorPrecedence.LOWEST)
+    elif isinstance(expr, PrefixExpression):
+        return OperatorPrecedence.PREFIX
+    elif isinstance(expr, CallExpression):
+        return OperatorPrecedence.CALL
+    elif isinstance(expr, IndexExpression):
+        return OperatorPrecedence.INDEX
+    return ATOM_PRECEDENCE
+
+
+class Unparser:
+    out: TextIO
+    pretty: bool
+    indent: str
+
+    def __init__(self, out: TextIO, pretty: bool = False, indent: str = "    "):
+        self.out = out
+        self.pretty = pretty
+        self.indent = indent
+
+    def write(self, node: Optional[Node]):
+        write = self.out.write
+        level = 0
+        stack: List[Part] = [node]
+        while stack:
+            part = stack.pop()
+            if part is None:
+                continue
+            elif isinstance(part, str):
+                write(part)
+            elif part is NEWLINE:
+                write("\n" + self.indent * level)
+            elif part is INDENT:
+                level += 1
+            elif part is DEDENT:
+                level -= 1
+            else:
+                stack.extend(reversed(self.parts(part)))
+
+    def parts(self, node: Node) -> List[Part]:
+        """노드를 출력 순서대로의 조각 목록으로 펼친다."""
+        pretty = self.pretty
+        sp = " " if pretty else ""
+
+        if isinstance(node, (Identifier, IntegerLiteral, BoolLiteral, StringLiteral)):
+            return [node.token.literal]
+
+        elif isinstance(node, PrefixExpression):
+            return [node.operator, *self.operand(node.right, OperatorPrecedence.PREFIX)]
+
+        elif isinstance(node, InfixExpression):
+            precedence = precedence_of(node)
+            return [
+                *self.operand(node.left, precedence),
+                f"{sp}{node.operator}{sp}",
+                # 좌결합이므로 오른쪽 피연산자는 우선순위가 같아도 괄호가 필요하다.
+                *self.operand(node.right, precedence + 1),
+            ]
+
+        elif isinstance(node, CallExpression):
+            parts = [*self.operand(node.function, OperatorPrecedence.CALL), "("]
+            for i, arg in enumerate(node.arguments):
+                if i:
+                    parts.append("," + sp)
+                parts.append(arg)
+            parts.append(")")
+            return parts
+
+        elif isinstance(node, ArrayLiteral):
+            parts = ["["]
+            for i, element in enumerate(node.elements):
+                if i:
+                    parts.append("," + sp)
+                parts.append(element)
+            parts.append("]")
+            return parts
+
+        elif isinstance(node, HashLiteral):
+            parts = ["{"]
+            for i, (key, value) in enumerate(zip(node.keys, node.values)):
+                if i:
+                    parts.append("," + sp)
+                parts += [key, ":" + sp, value]
+            parts.append("}")
+            return parts
+
+        elif isinstance(node, IndexExpression):
+            # 호출과 인덱스는 왼쪽으로 이어지므로 f(x)[0]에는 괄호가 필요 없다.
+            return [
+                *self.operand(node.left, OperatorPrecedence.CALL),
+                "[",
+                node.index,
+                "]",
+            ]
+
+        elif isinstance(node, IfExpression):
+            parts = ["if" + sp + "(", node.condition, ")" + sp, node.consequence]
+            if node.alternative is not None:
+                parts += [sp + "else" + sp, node.alternative]
+            return parts
+
+        elif isinstance(node, FunctionLiteral):
+            params = ("," + sp).join(p.token_literal() for p in node.parameters)
+            return [f"fn({params}){sp}", node.body]
+
+        elif isinstance(node, BlockStatement):
+            if not node.statements:
+                return ["{}"]
+            if not pretty:
+                return ["{", *node.statements, "}"]
+            parts = ["{", INDENT]
+            for stmt in node.statements:
+                parts += [NEWLINE, stmt]
+            return parts + [DEDENT, NEWLINE, "}"]
+
+        elif isinstance(node, LetStatement):
+            return [f"let {node.name.value}{sp}={sp}", node.value, ";"]
+
+        elif isinstance(node, ReturnStatement):
+            return ["return ", node.return_value, ";"]
+
+        elif isinstance(node, WhileStatement):
+            return ["while" + sp + "(", node.condition, ")" + sp, node.body]
+
+        elif isinstance(node, ExpressionStatement):
+            return [node.expression, ";"]
+
+        elif isinstance(node, Program):
+            if not pretty:
+                return list(node.statements)
+            parts = []
+            for i, stmt in enumerate(node.statements):
+                if i:
+                    parts.append(NEWLINE)
+                parts.append(stmt)
+            return parts
+
+        raise TypeError(f"not supported node : {type(node).__name__}")
+
+    @staticmethod
+    def operand(expr: Optional[Expression], precedence: int) -> List[Part]:
+        if precedence_of(expr) < precedence:
+            return ["(", expr, ")"]
+        return [expr]
+
+
+def unparse(node: Node, pretty: bool = False) -> str:
+    buffer = io.StringIO()
+    Unparser(buffer, pretty=pretty).write(node)
+    return buffer.getvalue()
+
+
+def write(node: Node, out: TextIO, pretty: bool = False):
+    Unparser(out, pretty=pretty).write(node)
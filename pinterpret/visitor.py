@@ -0,0 +1,160 @@
+"""
+AST 순회 프레임워크
+
+NodeVisitor / NodeTransformer
+    visit_<클래스 이름>(node) 메서드로 노드 종류별 처리를 정의한다.
+    정의되지 않은 노드는 generic_visit이 자식 노드를 방문한다.
+    (파이썬 표준 라이브러리 ast 모듈의 NodeVisitor와 같은 방식)
+
+AnalysisPass / run_passes
+    enter_<클래스 이름>(node), leave_<클래스 이름>(node) 메서드로
+    노드에 들어갈 때와 나올 때 할 일을 정의한다.
+    순회는 run_passes가 맡으므로, 여러 pass를 한 번의 순회로 함께 실행할 수 있다.
+    순회는 재귀 없이 stack으로 하기 때문에 깊은 트리도 다룰 수 있다.
+
+어떤 메서드를 부를지는 (visitor 클래스, 노드 클래스)마다 처음 한 번만 찾아서 캐시한다.
+노드 클래스의 MRO를 따라 찾기 때문에, arena view처럼 AST 클래스를 상속한 노드도
+부모 클래스 이름의 메서드로 처리된다.
+자식 노드는 각 노드 클래스의 fields 선언을 따라 찾는다.
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pinterpret.ast import Node
+
+# (visitor 클래스, 노드 클래스, 메서드 이름 접두사) -> 메서드
+# 여러 스레드가 동시에 채워도 같은 키에는 항상 같은 메서드가 들어가므로 lock을 걸지 않는다.
+_dispatch_cache: Dict[Tuple[type, type, str], Optional[Callable]] = {}
+
+
+def find_method(visitor_cls: type, node_cls: type, prefix: str) -> Optional[Callable]:
+    key = (visitor_cls, node_cls, prefix)
+    try:
+        return _dispatch_cache[key]
+    except KeyError:
+        pass
+
+    method = None
+    for cls in node_cls.__mro__:
+        method = getattr(visitor_cls, prefix + cls.__name__, None)
+        if method is not None:
+            break
+    return _dispatch_cache.setdefault(key, method)
+
+
+def iter_fields(node: Node) -> Iterator[Tuple[str, object]]:
+    for name in type(node).fields:
+        yield name, getattr(node, name, None)
+
+
+def iter_child_nodes(node: Node) -> Iterator[Node]:
+    for _, value in iter_fields(node):
+        if isinstance(value, list):
+            for item in value:
+                if item is not None:
+                    yield item
+        elif value is not None:
+            yield value
+
+
+def walk(node: Node) -> Iterator[Node]:
+    """node와 그 아래의 모든 노드를 전위 순회 순서로 돌려준다."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(list(iter_child_nodes(node))))
+
+
+class NodeVisitor:
+    def visit(self, node: Node):
+        method = find_method(type(self), type(node), "visit_")
+        if method is None:
+            return self.generic_visit(node)
+        return method(self, node)
+
+    def generic_visit(self, node: Node):
+        for child in iter_child_nodes(node):
+            self.visit(child)
+
+
+class NodeTransformer(NodeVisitor):
+    """visit_<클래스 이름>이 돌려준 노드로 원래 노드를 바꾼다.
+
+    None을 돌려주면 목록(statements, arguments 등)에서는 빠지고,
+    그 외의 속성에는 None이 들어간다.
+    노드는 제자리에서 바뀌므로, hash consing으로 공유된 노드를 바꿀 때는 주의해야 한다.
+    """
+
+    def generic_visit(self, node: Node) -> Node:
+        for name, old_value in iter_fields(node):
+            if isinstance(old_value, list):
+                new_value = []
+                for item in old_value:
+                    if item is not None:
+                        item = self.visit(item)
+                    if item is not None:
+                        new_value.append(item)
+                changed = len(new_value) != len(old_value) or any(
+                    a is not b for a, b in zip(old_value, new_value)
+                )
+                if changed:
+                    setattr(node, name, new_value)
+            elif old_value is not None:
+                new_value = self.visit(old_value)
+                if new_value is not old_value:
+                    setattr(node, name, new_value)
+        return node
+
+
+class AnalysisPass:
+    """run_passes로 실행되는 분석 pass
+
+    enter_<클래스 이름>(node) : 자식 노드를 방문하기 전에 호출
+    leave_<클래스 이름>(node) : 자식 노드를 모두 방문한 후에 호출
+    """
+
+    def run(self, node: Node) -> "AnalysisPass":
+        run_passes(node, [self])
+        return self
+
+
+def run_passes(node: Node, passes: Sequence[AnalysisPass]):
+    """여러 pass를 한 번의 순회로 실행한다."""
+    passes = list(passes)
+
+    def handlers(node_cls: type, prefix: str) -> List[Tuple[AnalysisPass, Callable]]:
+        found = []
+        for p in passes:
+            method = find_method(type(p), node_cls, prefix)
+            if method is not None:
+                found.append((p, method))
+        return found
+
+    # 이번 실행 안에서 노드 클래스별 handler 목록도 캐시한다.
+    enter_cache: Dict[type, List[Tuple[AnalysisPass, Callable]]] = {}
+    leave_cache: Dict[type, List[Tuple[AnalysisPass, Callable]]] = {}
+
+    # (노드, 자식 노드를 이미 방문했는지)
+    stack: List[Tuple[Node, bool]] = [(node, False)]
+    while stack:
+        current, visited = stack.pop()
+        node_cls = type(current)
+        if visited:
+            leave = leave_cache.get(node_cls)
+            if leave is None:
+                leave = leave_cache[node_cls] = handlers(node_cls, "leave_")
+            for p, method in leave:
+                method(p, current)
+            continue
+
+        enter = enter_cache.get(node_cls)
+        if enter is None:
+            enter = enter_cache[node_cls] = handlers(node_cls, "enter_")
+        for p, method in enter:
+            method(p, current)
+
+        stack.append((current, True))
+        children = list(iter_child_nodes(current))
+        for child in reversed(children):
+            stack.append((child, False))
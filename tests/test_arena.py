@@ -0,0 +1,86 @@
+import pytest
+
+from pinterpret.arena import ArenaProgram
+from pinterpret.ast import (
+    BlockStatement,
+    ExpressionStatement,
+    FunctionLiteral,
+    IfExpression,
+    InfixExpression,
+)
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+from tests.consts import SOURCE_CODE_TEST_001, SOURCE_CODE_TEST_002
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        SOURCE_CODE_TEST_001,
+        SOURCE_CODE_TEST_002,
+        "- 5 * (3 + 2) != !true;",
+        "if (x<y) {y} else {x}",
+        "abc(1+2,a,b); abc()",
+        "99999999999999999999999 + 1",
+        "[1, {}, {x: [2], 3: y}][2][x]",
+        '"a" + "b \\"c\\""',
+    ],
+)
+def test_arena_program_prints_same_as_program(test_input):
+    program = Parser(Lexer(test_input)).parse_program()
+
+    arena_program = ArenaProgram.from_program(program)
+
+    assert str(arena_program) == str(program)
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("let add = fn(a,b) { return a+b }; add(2,3) + add(5,7);", 17),
+        ("if (3>5) {5;2;}", "null"),
+        ("if (0) {5} else {2}", 2),
+        ("5==true", "Error: type mismatch : ObjectType.Integer == ObjectType.Boolean"),
+        ("let f = fn(x) { fn(y) { x * y } }; f(6)(7)", 42),
+        ("99999999999999999999999 - 99999999999999999999990", 9),
+        ("let i = 0; while (i < 10) { let i = i + 1; }; i", 10),
+    ],
+)
+def test_evaluate_arena_program(test_input, expected):
+    program = Parser(Lexer(test_input)).parse_program()
+
+    arena_program = ArenaProgram.from_program(program)
+
+    result = evaluate(arena_program, Environment())
+
+    assert result.inspect() == str(expected)
+
+
+def test_arena_views_keep_node_types():
+    program = Parser(Lexer("if (a < b) { fn(x) { x } }")).parse_program()
+
+    arena_program = ArenaProgram.from_program(program)
+
+    stmt = arena_program.statements[0]
+    assert isinstance(stmt, ExpressionStatement)
+    assert isinstance(stmt.expression, IfExpression)
+    assert isinstance(stmt.expression.condition, InfixExpression)
+    assert isinstance(stmt.expression.consequence, BlockStatement)
+    assert stmt.expression.alternative is None
+    function = stmt.expression.consequence.statements[0].expression
+    assert isinstance(function, FunctionLiteral)
+    assert [str(p) for p in function.parameters] == ["x"]
+    assert stmt.expression == arena_program.statements[0].expression
+
+
+def test_arena_shares_tokens_of_same_literal():
+    source = "let f = fn(a, b) { a + b * 2 }; f(1, 2);" * 100
+    program = Parser(Lexer(source)).parse_program()
+
+    arena_program = ArenaProgram.from_program(program)
+    arena = arena_program.arena
+
+    assert len(arena) == 1700
+    assert len(arena.tokens) == 11
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from pinterpret.batch import BatchRunner, iter_jobs, main, run_job
+
+PRELUDE = """
+let double = fn(x) { x * 2 };
+let base = 10;
+"""
+
+
+@pytest.fixture(scope="module")
+def runner():
+    with BatchRunner(workers=2, prelude=PRELUDE, chunksize=3) as runner:
+        yield runner
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("1 + 2", {"type": "INTEGER", "result": "3"}),
+        ("return 1 < 2; 3", {"type": "BOOLEAN", "result": "True"}),
+        ("1 / 0", {"error": "ZeroDivisionError: integer division or modulo by zero"}),
+    ],
+)
+def test_run_job(source, expected):
+    assert run_job("a", source, None) == {"id": "a", **expected}
+
+
+def test_run_job_parse_error():
+    result = run_job("a", "let = 1", None)
+    assert result["id"] == "a"
+    assert "error" in result
+
+
+def test_batch_ordered(runner):
+    jobs = [(str(i), f"double(base + {i})") for i in range(50)]
+    results = list(runner.run(jobs))
+    assert [r["id"] for r in results] == [str(i) for i in range(50)]
+    assert [r["result"] for r in results] == [str((10 + i) * 2) for i in range(50)]
+
+
+def test_batch_unordered(runner):
+    jobs = [(str(i), f"double({i})") for i in range(50)]
+    results = list(runner.run(jobs, ordered=False))
+    assert sorted(results, key=lambda r: int(r["id"])) == [
+        {"id": str(i), "type": "INTEGER", "result": str(i * 2)} for i in range(50)
+    ]
+
+
+def test_batch_does_not_leak_bindings(runner):
+    # 각 프로그램의 let은 prelude Environment에 남지 않는다.
+    jobs = [("set", "let base = 1; base")] + [(str(i), "base") for i in range(10)]
+    results = list(runner.run(jobs))
+    assert results[0]["result"] == "1"
+    assert all(r["result"] == "10" for r in results[1:])
+
+
+def test_batch_keeps_results_of_other_jobs_on_crash(runner):
+    # 파서가 RecursionError를 내는 프로그램이 있어도 같은 chunk의 다른 결과는 남는다.
+    nested = "fn() {" * 5000 + "}" * 5000
+    jobs = [(str(i), f"double({i})") for i in range(7)]
+    jobs.insert(4, ("bad", nested))
+    results = list(runner.run(jobs))
+
+    assert [r["id"] for r in results] == [job_id for job_id, _ in jobs]
+    assert results[4]["error"].startswith("RecursionError")
+    assert [r["result"] for r in results if r["id"] != "bad"] == [
+        str(i * 2) for i in range(7)
+    ]
+
+
+def test_invalid_prelude():
+    with pytest.raises(ValueError):
+        BatchRunner(workers=1, prelude="let = ;")
+
+
+def test_iter_jobs(tmp_path):
+    programs = tmp_path / "programs"
+    programs.mkdir()
+    (programs / "b.pi").write_text("2")
+    (programs / "a.pi").write_text("1")
+    assert list(iter_jobs(str(programs))) == [("a.pi", "1"), ("b.pi", "2")]
+
+    jsonl = tmp_path / "programs.jsonl"
+    jsonl.write_text('{"id": "x", "source": "1"}\n\n{"source": "2"}\n')
+    assert list(iter_jobs(str(jsonl))) == [("x", "1"), ("2", "2")]
+
+
+def test_main(tmp_path, capsys):
+    jsonl = tmp_path / "programs.jsonl"
+    jsonl.write_text(
+        "\n".join(json.dumps({"id": i, "source": f"{i} * {i}"}) for i in range(5))
+    )
+    main([str(jsonl), "--workers", "1"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["result"] for line in lines] == ["0", "1", "4", "9", "16"]
+
+
+def test_run_job_evaluation_error():
+    result = run_job("a", "1 + true", None)
+    assert result["id"] == "a"
+    assert result["error"].startswith("type mismatch")
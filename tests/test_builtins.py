@@ -0,0 +1,158 @@
+import pytest
+
+from pinterpret.builtins import BUILTINS, builtin
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import IntegerObj
+from pinterpret.parser import Parser
+from pinterpret.scheduler import Scheduler
+
+
+def run(source: str):
+    return evaluate(Parser(Lexer(source)).parse_program(), Environment())
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("abs(-3)", "3"),
+        ("abs(4)", "4"),
+        ("min(3, -1, 2)", "-1"),
+        ("max(3, -1, 2)", "3"),
+        ("min(7)", "7"),
+        ("pow(2, 10)", "1024"),
+        ("pow(5, 0)", "1"),
+        ("len(pcall())", "0"),
+        ("len(pmap(fn(i) { i }, 3))", "3"),
+        ("max(abs(-5), pow(2, 2)) * 2", "10"),
+        ("let f = fn(g, x) { g(x, 10) }; f(min, 3) + f(max, 3)", "13"),
+        ("let abs = fn(x) { 0 }; abs(-3)", "0"),
+        ("abs", "builtin abs"),
+        ("len([1, 2, 3])", "3"),
+        ("range(4)", "[0, 1, 2, 3]"),
+        ("range(2, 5)", "[2, 3, 4]"),
+        ("range(3, 1)", "[]"),
+        ("sum(range(101))", "5050"),
+        ("sum([])", "0"),
+        ("sum([pow(2, 70), 1])", str(2**70 + 1)),
+        ("map(fn(x) { x * x }, range(5))", "[0, 1, 4, 9, 16]"),
+        ("let k = 3; map(fn(x) { x + k }, [1, 2])", "[4, 5]"),
+        ("map(fn(x) { x > 1 }, [1, 2, 3])", "[False, True, True]"),
+        ("map(fn(x) { if (x > 1) { 1 } else { 0 } }, [1, 2, 3])", "[0, 1, 1]"),
+        ("map(abs, [-1, 2])", "[1, 2]"),
+        ("map(fn(x) { [x] }, [1, 2])", "[[1], [2]]"),
+        ("map(fn(x) { !x }, [true, false])", "[False, True]"),
+        ("filter(fn(x) { x / 2 * 2 == x }, range(10))", "[0, 2, 4, 6, 8]"),
+        ("filter(fn(x) { x }, [0, 1, 2])", "[1, 2]"),
+        ("filter(fn(x) { x }, [true, false])", "[True]"),
+        (
+            "let f = fn(x) { if (x < 1) { 0 } else { f(x - 1) } }; map(f, [1, 2])",
+            "[0, 0]",
+        ),
+        (
+            "let h = {1: 2}; let g = put(h, 5, 6); [len(h), len(g), g[5], h[5]]",
+            "[1, 2, 6, null]",
+        ),
+        ("put({1: 2}, 1, 3)[1]", "3"),
+        ("keys(put({}, true, 1))", "[True]"),
+        ("sum(values({1: 10, 2: 20}))", "30"),
+        (
+            "let f = fn(h, i) { if (i < 30) { f(put(h, i, i * i), i + 1) } else { h } }; let h = f({}, 0); [h[29], len(h)]",
+            "[841, 30]",
+        ),
+        ('len("hello" + "!")', "6"),
+        ('str(12) + "!"', "12!"),
+        ('str([1, "a"])', "[1, a]"),
+        ('keys({"a": 1})', "[a]"),
+    ],
+)
+def test_builtins(source, expected):
+    assert run(source).inspect() == expected
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("abs()", "wrong number of arguments : abs expects 1, got 0"),
+        ("abs(1, 2)", "wrong number of arguments : abs expects 1, got 2"),
+        ("pow(2)", "wrong number of arguments : pow expects 2, got 1"),
+        ("min()", "wrong number of arguments : min expects 1, got 0"),
+        ("max()", "wrong number of arguments : max expects 1, got 0"),
+        ("abs(true)", "not supported : abs("),
+        ("max(1, true)", "not supported : max("),
+        ("pow(2, -1)", "negative exponent : pow(..., -1)"),
+        ("len(3)", "not supported : len("),
+        ("3(1)", "not a function : "),
+        ("abs(-x)", "identifier not found : x"),
+        ("range()", "wrong number of arguments : range expects 2, got 0"),
+        ("range(true)", "not supported : range("),
+        ("sum([1, true])", "not supported : sum("),
+        ("map(1, [1])", "not supported : map("),
+        ("filter(fn(x) { x }, 1)", "not supported : filter("),
+        ("map(fn(x) { x + y }, [1])", "identifier not found : y"),
+        ("put([], 1, 2)", "not supported : put("),
+        ("put({}, [1], 2)", "unusable as hash key : "),
+        ("keys(1)", "not supported : keys("),
+    ],
+)
+def test_errors(source, expected):
+    assert run(source).inspect().startswith("Error: " + expected)
+
+
+def test_register():
+    @builtin("twice", arity=1)
+    def twice(x):
+        return IntegerObj(x.value * 2)
+
+    try:
+        assert run("twice(twice(3))").inspect() == "12"
+        assert run("twice()").inspect().startswith("Error: wrong number")
+    finally:
+        del BUILTINS["twice"]
+
+
+def test_scheduler():
+    scheduler = Scheduler(slice_steps=2)
+    task = scheduler.spawn("let f = fn(x) { abs(x) + 1 }; max(f(-3), pow(2, 1))")
+    list(scheduler.run())
+    assert task.result.inspect() == "4"
+
+
+def test_map_is_vectorized_with_numpy():
+    pytest.importorskip("numpy")
+    from pinterpret.builtins import apply_vectorized
+
+    arr = run("range(5)")
+
+    assert list(apply_vectorized(run("fn(x) { x * 2 + 1 }"), arr)) == [1, 3, 5, 7, 9]
+    assert apply_vectorized(run("fn(x) { [x] }"), arr) is None
+    assert apply_vectorized(run("fn(x) { x }"), run("[true]")) is None
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        (
+            "map(fn(v) { v * v * v * v }, range(99995, 100000))[4]",
+            "99996000059999600001",
+        ),
+        (
+            "sum(map(fn(v) { v * 4611686018427387904 }, range(3)))",
+            "13835058055282163712",
+        ),
+        ("len(filter(fn(v) { v * v * v * v * v > 0 }, range(99990, 100000)))", "10"),
+    ],
+)
+def test_vectorized_overflow_matches_per_element(source, expected):
+    assert run(source).inspect() == expected
+
+
+def test_vectorized_overflow_is_not_applied():
+    pytest.importorskip("numpy")
+    from pinterpret.builtins import apply_vectorized
+
+    arr = run("range(99990, 100000)")
+
+    assert apply_vectorized(run("fn(v) { v * v * v * v }"), arr) is None
+    assert apply_vectorized(run("fn(v) { v * v * v }"), arr) is not None
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from pinterpret.cache import ProgramCache
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+
+
+def test_parse_stores_and_reuses_program(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    source = "let add = fn(a,b) { a + b }; add(2,3);"
+
+    program, errors = cache.parse(source)
+    assert not errors
+    assert len(cache.entries()) == 1
+
+    cached = cache.get(source)
+    assert cached is not None
+    assert str(cached) == str(program)
+    assert evaluate(cached, Environment()).inspect() == "5"
+
+
+def test_changed_source_misses_cache(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    cache.parse("1 + 2")
+
+    assert cache.get("1 + 2") is not None
+    assert cache.get("1 + 3") is None
+
+
+def test_program_with_errors_is_not_cached(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+
+    _, errors = cache.parse("let = 3;")
+
+    assert errors
+    assert not cache.entries()
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    sources = ["1 + 2", "3 + 4", "5 + 6"]
+    for i, source in enumerate(sources):
+        cache.parse(source)
+        path = cache.path(cache.key(source))
+        os.utime(path, (i, i))
+
+    # 가장 먼저 만든 항목을 최근에 사용
+    cache.get(sources[0])
+
+    cache.max_size = cache.size() - 1
+    cache.evict()
+
+    assert cache.get(sources[0]) is not None
+    assert cache.get(sources[1]) is None
+    assert cache.get(sources[2]) is not None
+
+
+def test_broken_entry_is_discarded(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    cache.parse("1 + 2")
+    path = cache.path(cache.key("1 + 2"))
+    with open(path, "wb") as f:
+        f.write(b"broken")
+
+    assert cache.get("1 + 2") is None
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"cos\ngetpid\n)R.",
+        b"cpinterpret.ast\nos.getpid\n)R.",
+        b"cpinterpret.cache\nProgramCache\n)R.",
+    ],
+)
+def test_only_ast_classes_are_loaded(tmp_path, payload):
+    cache = ProgramCache(str(tmp_path))
+    cache.parse("1 + 2")
+    path = cache.path(cache.key("1 + 2"))
+    with open(path, "wb") as f:
+        f.write(payload)
+
+    assert cache.get("1 + 2") is None
+    assert not os.path.exists(path)
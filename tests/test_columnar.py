@@ -0,0 +1,170 @@
+import pytest
+
+from pinterpret.common import Object
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+
+np = pytest.importorskip("numpy")
+
+from pinterpret.columnar import (  # noqa: E402
+    ColumnarEvaluator,
+    evaluate_columns,
+    evaluate_rows,
+)
+from pinterpret.environment import Environment  # noqa: E402
+from pinterpret.prepared import prepare  # noqa: E402
+
+
+def parse(source: str):
+    return Parser(Lexer(source)).parse_program()
+
+
+def show(value) -> str:
+    return value.inspect() if isinstance(value, Object) else str(value)
+
+
+COLUMNS = {
+    "x": np.array([-3, -1, 0, 2, 5, 40]),
+    "y": np.array([7, 2, 3, -4, 5, 6]),
+    "flag": np.array([True, False, True, False, True, False]),
+}
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "x + y * 2",
+        "-x / y",
+        "x < y == flag",
+        "!flag != (x > 0)",
+        "!x",
+        "if (x > y) { x } else { y * 10 }",
+        "if (flag) { x > 0 } else { y > 0 }",
+        "if (x) { 1 } else { 0 }",
+        "let sq = fn(v) { v * v }; let d = x - y; sq(d) + sq(3)",
+        "let clamp = fn(v) { if (v < 0) { return 0; } else { v } }; clamp(x)",
+        "let f = fn(a) { let b = a * 2; return b + 1; }; f(y)",
+        "return x * 2; y",
+        "5 * 5",
+    ],
+)
+def test_vectorised_result_matches_per_row(test_input):
+    program = parse(test_input)
+    size = len(COLUMNS["x"])
+
+    expected = evaluate_rows(program, COLUMNS, size)
+    result = evaluate_columns(program, COLUMNS)
+
+    assert result.dtype == expected.dtype
+    assert result.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "x + y * 2",
+        "if (x > y) { x } else { y * 10 }",
+        "let sq = fn(v) { v * v }; sq(x - y)",
+    ],
+)
+def test_vectorisable_programs_do_not_fall_back(test_input):
+    env = Environment()
+    for name, column in COLUMNS.items():
+        env.set(name, column)
+
+    value = ColumnarEvaluator(len(COLUMNS["x"])).run(parse(test_input), env)
+
+    assert isinstance(value, np.ndarray)
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "let f = fn(n) { if (n < 1) { 0 } else { n + f(n - 1) } }; f(x)",
+        "if (flag) { x }",
+        "x == flag",
+        "let a = x;",
+        "if (flag) { fn(a) { a } } else { 1 }",
+    ],
+)
+def test_unvectorisable_programs_fall_back_to_rows(test_input):
+    columns = {name: column[2:] for name, column in COLUMNS.items()}
+    program = parse(test_input)
+
+    expected = evaluate_rows(program, columns, 4)
+    result = evaluate_columns(program, columns)
+
+    assert result.dtype == expected.dtype
+    assert [show(r) for r in result] == [show(e) for e in expected]
+
+
+def test_division_by_zero_falls_back_to_rows():
+    with pytest.raises(ZeroDivisionError):
+        evaluate_columns(parse("y / x"), COLUMNS)
+
+
+def test_columns_must_have_same_length():
+    with pytest.raises(ValueError):
+        evaluate_columns(parse("x + y"), {"x": np.arange(3), "y": np.arange(4)})
+
+
+def test_prepared_program_run_columns():
+    handle = prepare("let sq = fn(v) { v * v }; sq(x) + sq(y)")
+
+    result = handle.run_columns({"x": np.arange(4), "y": np.arange(4) + 1})
+
+    assert result.tolist() == [1, 5, 13, 25]
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "99999999999999999999999",
+        "x + 99999999999999999999",
+        "x * 3000000000 * 3000000000 * 3000000000",
+        "y - 9223372036854775807 - 9223372036854775807",
+        "let big = fn(v) { v * 4611686018427387904 }; big(x) / 2",
+        "-(x - 9223372036854775807 - 3)",
+        "(x - 9223372036854775807 - 1) / -1",
+    ],
+)
+def test_int64_overflow_falls_back_to_rows(test_input):
+    program = parse(test_input)
+    size = len(COLUMNS["x"])
+
+    expected = evaluate_rows(program, COLUMNS, size)
+    result = evaluate_columns(program, COLUMNS)
+
+    assert expected.dtype == object
+    assert [show(r) for r in result] == [show(e) for e in expected]
+    assert any(abs(int(r.value)) > 2**63 - 1 for r in result)
+
+
+def test_int64_boundary_stays_vectorised():
+    env = Environment()
+    env.set("x", np.array([0, 1, -1], dtype=np.int64))
+    program = parse("x + 9223372036854775806")
+
+    value = ColumnarEvaluator(3).run(program, env)
+
+    assert value.tolist() == [2**63 - 2, 2**63 - 1, 2**63 - 3]
+
+
+def test_uint64_column_out_of_int64_range_falls_back_to_rows():
+    columns = {"x": np.array([2**64 - 1, 2**63, 5], dtype=np.uint64)}
+    program = parse("x + 0")
+
+    result = evaluate_columns(program, columns)
+
+    assert result.dtype == object
+    assert [show(r) for r in result] == [str(2**64 - 1), str(2**63), "5"]
+    assert prepare("x + 0").run_columns(columns)[0].value == 2**64 - 1
+
+
+def test_uint64_column_in_int64_range_stays_vectorised():
+    columns = {"x": np.array([2**63 - 1, 5], dtype=np.uint64)}
+
+    result = evaluate_columns(parse("x - 1"), columns)
+
+    assert result.dtype == np.int64
+    assert result.tolist() == [2**63 - 2, 4]
@@ -0,0 +1,76 @@
+import pytest
+
+from pinterpret.batch import load_prelude
+from pinterpret.environment import Environment, FrozenEnvironment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import IntegerObj
+from pinterpret.parser import Parser
+from pinterpret.prepared import prepare
+
+PRELUDE = """
+let base = 10;
+let scale = fn(x) { x * base };
+let fact = fn(n) { if (n < 2) { 1 } else { n * fact(n - 1) } };
+"""
+
+
+def run(source: str, env: Environment):
+    return evaluate(Parser(Lexer(source)).parse_program(), env)
+
+
+def test_fork_reads_outer_and_writes_child():
+    parent = Environment()
+    parent.set("a", IntegerObj(1))
+    child = parent.fork()
+
+    assert child.outer is parent
+    assert child.get("a") == (IntegerObj(1), True)
+    child.set("a", IntegerObj(2))
+    assert child.get("a") == (IntegerObj(2), True)
+    assert parent.get("a") == (IntegerObj(1), True)
+
+
+def test_freeze():
+    outer = Environment()
+    env = Environment(outer)
+    env.set("a", IntegerObj(1))
+
+    assert env.freeze() is env
+    assert isinstance(env, FrozenEnvironment) and env.frozen
+    assert isinstance(outer, FrozenEnvironment) and outer.frozen
+    assert env.get("a") == (IntegerObj(1), True)
+    with pytest.raises(TypeError):
+        env.set("b", IntegerObj(2))
+    with pytest.raises(TypeError):
+        outer.set("b", IntegerObj(2))
+    assert not env.fork().frozen
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("scale(3)", 30),
+        ("fact(5)", 120),
+        ("let base = 2; scale(3) + base", 32),
+        ("let scale = fn(x) { x }; scale(3)", 3),
+        ("let helper = fn(n) { let base = n; base + 1 }; helper(4) + base", 15),
+    ],
+)
+def test_forked_prelude(source, expected):
+    prelude = load_prelude(PRELUDE)
+    assert prelude.frozen
+
+    assert run(source, prelude.fork()).value == expected
+    # 자식 Environment에서의 let은 prelude에 남지 않는다.
+    assert run("scale(1) + fact(3)", prelude.fork()).value == 16
+
+
+def test_prepared_run_with_prelude():
+    prelude = load_prelude(PRELUDE)
+    handle = prepare("scale(x) + fact(3)")
+    assert [handle.run({"x": x}, prelude=prelude).value for x in range(3)] == [
+        6,
+        16,
+        26,
+    ]
@@ -1,10 +1,12 @@
+import pickle
+
 import pytest
 
 from pinterpret.common import Object
 from pinterpret.environment import Environment
-from pinterpret.evaluator import evaluate
+from pinterpret.evaluator import evaluate, evaluate_stream
 from pinterpret.lexer import Lexer
-from pinterpret.obj import FunctionObj
+from pinterpret.obj import BooleanObj, FunctionObj, IntegerObj, StringObj
 from pinterpret.parser import Parser
 
 
@@ -156,3 +158,239 @@ def test_evaluate_call_expression(test_input, expected):
     result: Object = evaluate(program, Environment())
 
     assert result.inspect() == str(expected)
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("let a = 5; a; a * 2", ["null", "5", "10"]),
+        ("1; return 2; 3", ["1", "2"]),
+        ("1; b; 3", ["1", "Error: identifier not found : b"]),
+    ],
+)
+def test_evaluate_stream(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+
+    results = evaluate_stream(parser.iter_statements(), Environment())
+
+    assert [result.inspect() for result in results] == expected
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("let add = fn(a,b) { return a+b }; add(2,3);", 5),
+        ("let f = fn(a) { if (a > 1) { a } else { 1 } }; f(3) * f(0);", 3),
+        ("let unused = fn() { 1 + }; 7", 7),
+    ],
+)
+def test_evaluate_lazy_function_literal(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer, lazy_functions=True)
+
+    program = parser.parse_program()
+
+    result: Object = evaluate(program, Environment())
+
+    assert result.inspect() == str(expected)
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        (
+            "let a = 2; let f = fn(x) { fn(y) { fn(z) { a + x + y + z } } }; f(3)(4)(5)",
+            14,
+        ),
+    ],
+)
+def test_evaluate_nested_closure(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+
+    program = parser.parse_program()
+
+    result: Object = evaluate(program, Environment())
+
+    assert result.inspect() == str(expected)
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("let x = 1 + 2; let y = 1 + 2; x * y + (1 + 2)", 12),
+        ("let f = fn(a) { a * a }; f(3) + f(3) + fn(a) { a * a }(3)", 27),
+    ],
+)
+def test_evaluate_hash_consed_program(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer, hash_consing=True)
+
+    program = parser.parse_program()
+
+    result: Object = evaluate(program, Environment())
+
+    assert result.inspect() == str(expected)
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("[1, 2 * 2, 3 + 3]", "[1, 4, 6]"),
+        ("[]", "[]"),
+        ("[1, true, [2]]", "[1, True, [2]]"),
+        ("let a = [1, 2, 3]; a[0] + a[1] + a[2]", "6"),
+        ("let i = 0; [1][i]", "1"),
+        ("[[1, 2], [3]][0][1]", "2"),
+        ("let f = fn(x) { [x, x * 2] }; f(3)[1]", "6"),
+        ("[1, 2, 3][3]", "null"),
+        ("[1, 2, 3][-1]", "null"),
+        ("[1, x]", "Error: identifier not found : x"),
+        ("1[0]", "Error: not supported : "),
+    ],
+)
+def test_evaluate_array(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+
+    program = parser.parse_program()
+
+    result: Object = evaluate(program, Environment())
+
+    assert result.inspect().startswith(expected)
+
+
+def test_integer_array_uses_typed_storage():
+    program = Parser(Lexer("[1, 2, -3]; [1, true]")).parse_program()
+    env = Environment()
+
+    ints = evaluate(program.statements[0], env)
+    mixed = evaluate(program.statements[1], env)
+
+    assert ints.ints.typecode == "q" and list(ints.ints) == [1, 2, -3]
+    assert ints.objects is None
+    assert mixed.ints is None and len(mixed) == 2
+
+    # int64 범위를 넘는 정수가 있으면 Object 목록에 담는다.
+    big = evaluate(Parser(Lexer("[pow(2, 70), 1]")).parse_program(), env)
+    assert big.ints is None
+    assert big.inspect() == f"[{2 ** 70}, 1]"
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("{1: 2, true: 3}[true]", "3"),
+        ("{1: 2}[2]", "null"),
+        ("let k = 1; {k: 10, k + 1: 20}[2]", "20"),
+        ("{1: 2, 1: 3}[1]", "3"),
+        ("{true: 1}[1]", "null"),
+        ("{1: {2: [3]}}[1][2][0]", "3"),
+        ("{}", "{}"),
+        ("{[1]: 2}", "Error: unusable as hash key : "),
+        ("{1: 2}[[1]]", "Error: unusable as hash key : "),
+        ("{1: x}", "Error: identifier not found : x"),
+    ],
+)
+def test_evaluate_hash(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+
+    program = parser.parse_program()
+
+    result: Object = evaluate(program, Environment())
+
+    assert result.inspect().startswith(expected)
+
+
+def test_hash_key_is_cached():
+    key = IntegerObj(3)
+
+    assert key.hash_key() is key.hash_key()
+    assert key.hash_key() == IntegerObj(3).hash_key()
+    assert key.hash_key() != BooleanObj(True).hash_key()
+    assert IntegerObj(1).hash_key() != BooleanObj(True).hash_key()
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ('"hello"', "hello"),
+        ('"hello" + " " + "world"', "hello world"),
+        ('"a" == "a"', "True"),
+        ('"a" != "a"', "False"),
+        ('"ab" == "a" + "b"', "True"),
+        ('let s = "x"; s + s + s', "xxx"),
+        ('{"a": 1, "b": 2}["a" + ""]', "1"),
+        ('"a" - "b"', "Error: not supported : "),
+        ('"a" + 1', "Error: type mismatch : "),
+    ],
+)
+def test_evaluate_string(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+
+    program = parser.parse_program()
+
+    result: Object = evaluate(program, Environment())
+
+    assert result.inspect().startswith(expected)
+
+
+def test_string_concatenation_builds_rope():
+    piece = StringObj("x" * 10)
+    s = StringObj("")
+    for _ in range(100000):
+        s = StringObj.concat(s, piece)
+    prefix = StringObj("y" * 100)
+    t = StringObj.concat(prefix, s)
+
+    # 한쪽으로 깊은 rope도 재귀 없이 펼친다.
+    assert s.length == 1000000 and s._value is None
+    assert t.value == "y" * 100 + "x" * 1000000
+    assert s._value is None
+    assert s.value == "x" * 1000000
+    assert s._left is None and s._right is None
+    assert pickle.loads(pickle.dumps(t)) == t
+
+
+def test_string_hash_key_is_cached():
+    key = StringObj("ab")
+
+    assert key.hash_key() is key.hash_key()
+    assert key.hash_key() == StringObj.concat(StringObj("a"), StringObj("b")).hash_key()
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("let i = 0; while (i < 5) { let i = i + 1; }; i", "5"),
+        ("let i = 0; while (i < 5) { let i = i + 1; }", "null"),
+        ("while (false) { 1 }", "null"),
+        (
+            "let f = fn() { let i = 0; while (true) { if (i == 3) { return i * 10; } let i = i + 1; } }; f()",
+            "30",
+        ),
+        ("let i = 0; while (i < 5) { let i = i + true; }", "Error: type mismatch : "),
+        ("while (x) { 1 }", "Error: identifier not found : x"),
+    ],
+)
+def test_evaluate_while(test_input, expected):
+    program = Parser(Lexer(test_input)).parse_program()
+
+    result: Object = evaluate(program, Environment())
+
+    assert result.inspect().startswith(expected)
+
+
+def test_while_runs_longer_than_python_recursion():
+    program = Parser(
+        Lexer(
+            "let i = 0; let s = 0; while (i < 20000) { let s = s + i; let i = i + 1; }; s"
+        )
+    ).parse_program()
+
+    result = evaluate(program, Environment())
+
+    assert result == IntegerObj(sum(range(20000)))
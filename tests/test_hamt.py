@@ -0,0 +1,84 @@
+import pickle
+import random
+
+from pinterpret.hamt import HamtMap
+
+
+class Key:
+    """해시를 마음대로 정할 수 있는 키"""
+
+    def __init__(self, value: int, hash: int):
+        self.value = value
+        self.hash = hash
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return isinstance(other, Key) and self.value == other.value
+
+
+def test_set_and_get():
+    m = HamtMap().set("a", 1).set("b", 2).set("a", 3)
+
+    assert len(m) == 2
+    assert m.get("a") == 3
+    assert m.get("b") == 2
+    assert m.get("c") is None
+    assert "b" in m and "c" not in m
+
+
+def test_set_keeps_original_map():
+    empty = HamtMap()
+    one = empty.set(1, "x")
+    two = one.set(2, "y")
+
+    assert len(empty) == 0 and empty.get(1) is None
+    assert len(one) == 1 and one.get(2) is None
+    assert len(two) == 2 and two.get(1) == "x"
+
+
+def test_set_same_value_returns_same_map():
+    value = object()
+    m = HamtMap().set(1, value)
+
+    assert m.set(1, value) is m
+
+
+def test_set_shares_untouched_nodes():
+    m = HamtMap.from_items((i, i) for i in range(1000))
+    updated = m.set(0, -1)
+
+    shared = sum(a is b for a, b in zip(m.root.entries, updated.root.entries))
+    assert shared == len(m.root.entries) - 1
+
+
+def colliding_key(value: int) -> Key:
+    # 여러 키가 해시를 완전히 같이 쓰거나, 앞쪽 비트만 같이 쓰도록 한다.
+    hashes = [value % 7, (value % 3) << 40, -value, value]
+    return Key(value, hashes[value % 4])
+
+
+def test_matches_dict_with_colliding_hashes():
+    rng = random.Random(0)
+    expected = {}
+    m = HamtMap()
+    for _ in range(5000):
+        value = rng.randrange(2000)
+        m = m.set(colliding_key(value), value * 2)
+        expected[value] = value * 2
+
+    assert len(m) == len(expected)
+    for value, doubled in expected.items():
+        assert m.get(colliding_key(value)) == doubled
+    assert m.get(colliding_key(2001)) is None
+    assert sorted(k.value for k in m) == sorted(expected)
+
+
+def test_pickle():
+    m = HamtMap.from_items((str(i), i) for i in range(100))
+
+    loaded = pickle.loads(pickle.dumps(m))
+
+    assert len(loaded) == 100
+    assert dict(loaded.items()) == dict(m.items())
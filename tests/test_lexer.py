@@ -20,6 +20,17 @@ from tests.consts import SOURCE_CODE_TEST_001, SOURCE_CODE_TEST_002
                 TokenType.RPAREN,
             ],
         ),
+        (
+            "while (x) {}",
+            [
+                TokenType.WHILE,
+                TokenType.LPAREN,
+                TokenType.IDENT,
+                TokenType.RPAREN,
+                TokenType.LBRACE,
+                TokenType.RBRACE,
+            ],
+        ),
         (
             "let five = 5;",
             [
@@ -160,3 +171,19 @@ def test_read_identifier(test_input, expected):
     lexer = Lexer(test_input)
     for e in expected:
         assert e == lexer.read_identifier()
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ('"foo bar" + x', ['"foo bar"', "+", "x"]),
+        ('"a\\"b" ""', ['"a\\"b"', '""']),
+        ('let s = "{ } ;";', ["let", "s", "=", '"{ } ;"', ";"]),
+        ('"abc', ['"abc']),
+    ],
+)
+def test_read_string(test_input, expected):
+    lexer = Lexer(test_input)
+    for e in expected:
+        assert lexer.next_token().literal == e
+    assert lexer.next_token().type == TokenType.EOF
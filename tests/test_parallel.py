@@ -0,0 +1,170 @@
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pinterpret.builtins import BUILTINS
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import ArrayObj, IntegerObj
+from pinterpret.parallel import ParallelPool
+from pinterpret.parser import Parser
+from pinterpret.scheduler import Scheduler
+
+PRELUDE = """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let base = 100;
+let square = fn(x) { x * x + base };
+"""
+
+
+def run(source: str, env=None):
+    env = env or Environment()
+    return evaluate(Parser(Lexer(source)).parse_program(), env)
+
+
+@pytest.fixture
+def env():
+    env = Environment()
+    run(PRELUDE, env)
+    return env
+
+
+@pytest.fixture(scope="module")
+def pool():
+    # 작은 작업도 항상 worker에 보내도록 한다.
+    with ParallelPool(workers=2, sample_time=0, startup_time=0) as pool:
+        pool.start()
+        pool.dispatch_overhead = 0.0
+        yield pool
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("pmap(square, 4)", "[100, 101, 104, 109]"),
+        ("pmap(fib, 8)", "[0, 1, 1, 2, 3, 5, 8, 13]"),
+        ("pmap(fn(i) { i < 2 }, 3)", "[True, True, False]"),
+        ("pmap(fn(i) { if (i > 0) { i } }, 2)", "[null, 1]"),
+        ("pmap(square, 0)", "[]"),
+        ("pcall(fn() { fib(10) }, fn() { base })", "[55, 100]"),
+        ("pcall()", "[]"),
+        ('pmap(fn(i) { "a" }, 2)', "[a, a]"),
+        ("pmap(fn(i) { [i, i * 2] }, 3)", "[[0, 0], [1, 2], [2, 4]]"),
+        ('pcall(fn() { "error" }, fn() { [] })', "[error, []]"),
+        ("let pmap = 3; pmap", "3"),
+    ],
+)
+def test_builtins(env, source, expected):
+    assert run(source, env).inspect() == expected
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("pmap(square)", "wrong number of arguments : pmap expects 2, got 1"),
+        ("pmap(1, 2)", "not a function : pmap"),
+        ("pmap(square, -1)", "not a count : pmap(..., -1)"),
+        ("pmap(square, true)", "not a count : pmap(..., True)"),
+        ("pcall(square, 1)", "not a function : pcall"),
+        ("pmap(fn(i) { square }, 2)", "not supported result : "),
+        ('pmap(fn(i) { ["a"] }, 2)', "not supported result : ObjectType.Array"),
+        ("pmap(fn(i) { {} }, 2)", "not supported result : ObjectType.Hash"),
+        ("pmap(fn(i) { i + true }, 2)", "type mismatch : "),
+        ("pcall(fn() { 1(2) })", "not a function : "),
+    ],
+)
+def test_errors(env, source, expected):
+    result = run(source, env)
+    assert result.inspect().startswith("Error: " + expected)
+
+
+@pytest.mark.parametrize(
+    "source, size",
+    [
+        ("fn(i) { square(i) }", 50),
+        ("fn(i) { fib(i) }", 15),
+        ("fn(i) { i == 3 }", 9),
+        ('fn(i) { if (i == 3) { "error" } else { "ok" } }', 9),
+        ("fn(i) { [i, square(i)] }", 9),
+    ],
+)
+def test_parallel_matches_serial(pool, env, source, size):
+    fn = run(source, env)
+    calls = [(fn, [IntegerObj(i)]) for i in range(size)]
+    serial = ParallelPool(workers=1).call_all(calls)
+    parallel = pool.call_all(calls)
+    assert isinstance(parallel, ArrayObj)
+    assert parallel == serial
+
+
+def test_parallel_error(pool, env):
+    fn = run("fn(i) { if (i == 7) { i + true } else { i } }", env)
+    result = pool.call_all([(fn, [IntegerObj(i)]) for i in range(20)])
+    assert result.inspect().startswith("Error: type mismatch : ")
+
+
+class EstimatingPool(ParallelPool):
+    """worker에 보내지 않고, call_all이 예상한 남은 시간 중 가장 큰 값을 기록한다."""
+
+    estimate = 0.0
+
+    def worth_parallel(self, serial_time: float) -> bool:
+        self.estimate = max(self.estimate, serial_time)
+        return False
+
+
+def test_estimate_covers_calls_that_grow_with_index(env):
+    # fib(i)는 뒤쪽 호출일수록 오래 걸리므로 앞쪽 호출만 재면 남은 시간을 크게 낮춰 잡는다.
+    pool = EstimatingPool(workers=2)
+    fib = run("fib", env)
+    start = time.perf_counter()
+    result = pool.call_all([(fib, [IntegerObj(i)]) for i in range(18)])
+    elapsed = time.perf_counter() - start
+
+    assert result.get(17) == IntegerObj(1597)
+    assert pool.estimate > elapsed * 0.2
+
+
+def test_first_error_in_call_order(pool, env):
+    fn = run(
+        "fn(i) { if (i > 2) { i + true } else { if (i > 1) { 1 + square } else { i } } }",
+        env,
+    )
+    for p in (pool, ParallelPool(workers=1)):
+        result = p.call_all([(fn, [IntegerObj(i)]) for i in range(16)])
+        assert (
+            result.inspect()
+            == "Error: type mismatch : ObjectType.Integer + ObjectType.Function"
+        )
+
+
+def test_small_work_stays_in_process(env):
+    pool = ParallelPool(workers=2)
+    pool.call_all([(run("square", env), [IntegerObj(1)])] * 3)
+    assert pool._executor is None
+
+
+def nested_enabled() -> bool:
+    return ParallelPool(workers=2).enabled
+
+
+def test_disabled_in_worker():
+    assert ParallelPool(workers=2).enabled
+    assert not ParallelPool(workers=1).enabled
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert not executor.submit(nested_enabled).result()
+
+
+def test_pickle_builtin():
+    pmap = BUILTINS["pmap"]
+    assert pickle.loads(pickle.dumps(pmap)) is pmap
+
+
+def test_scheduler(env):
+    scheduler = Scheduler(slice_steps=10)
+    task = scheduler.spawn("pmap(square, 3)", env)
+    list(scheduler.run())
+    assert task.result.inspect() == "[100, 101, 104]"
@@ -1,6 +1,7 @@
 import pytest
 
 from pinterpret.ast import (
+    StringLiteral,
     LetStatement,
     ReturnStatement,
     ExpressionStatement,
@@ -10,11 +11,16 @@ from pinterpret.ast import (
     IfExpression,
     FunctionLiteral,
     CallExpression,
+    LazyBlockStatement,
+    WhileStatement,
+    ArrayLiteral,
+    IndexExpression,
+    HashLiteral,
 )
 from pinterpret.lexer import Lexer
 from pinterpret.parser import Parser
 from pinterpret.token import TokenType
-from tests.consts import SOURCE_CODE_TEST_004
+from tests.consts import SOURCE_CODE_TEST_001, SOURCE_CODE_TEST_004
 
 
 @pytest.mark.parametrize(
@@ -290,3 +296,239 @@ def test_parse_single_call_expression(
         assert str(arg) == expected_arg
 
     assert str(call_expr.function) == expected_expression
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("let a = 1; a + 2; return a;", ["let a = 1;", "(a+2)", "return a;"]),
+        ("", []),
+    ],
+)
+def test_iter_statements(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+
+    stmts = parser.iter_statements()
+    for e in expected:
+        assert str(next(stmts)) == e
+    assert next(stmts, None) is None
+
+
+@pytest.mark.parametrize(
+    "test_input,expected_depth",
+    [
+        ("(" * 10000 + "5" + ")" * 10000, 0),
+        ("-" * 10000 + "5", 10000),
+        ("!" * 10000 + "true", 10000),
+        ("f(" * 10000 + "5" + ")" * 10000, 10000),
+        ("[" * 10000 + "5" + "]" * 10000, 10000),
+        ("a[" * 10000 + "5" + "]" * 10000, 10000),
+        ("f(1, [2, " * 10000 + "5" + "])" * 10000, 20000),
+        ("{1: " * 10000 + "5" + "}" * 10000, 10000),
+        ("{" * 10000 + "5" + ": 5}" * 10000, 10000),
+    ],
+    ids=[
+        "grouped",
+        "minus",
+        "bang",
+        "call",
+        "array",
+        "index",
+        "list",
+        "hash_value",
+        "hash_key",
+    ],
+)
+def test_parse_deeply_nested_expression(test_input, expected_depth):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+    program = parser.parse_program()
+
+    assert not parser.errors
+    assert len(program.statements) == 1
+
+    stmt: ExpressionStatement = program.statements[0]
+    expr = stmt.expression
+    depth = 0
+    while True:
+        if isinstance(expr, PrefixExpression):
+            expr = expr.right
+        elif isinstance(expr, CallExpression):
+            expr = expr.arguments[-1]
+        elif isinstance(expr, ArrayLiteral):
+            expr = expr.elements[-1]
+        elif isinstance(expr, IndexExpression):
+            expr = expr.index
+        elif isinstance(expr, HashLiteral):
+            key = expr.keys[0]
+            expr = key if isinstance(key, HashLiteral) else expr.values[0]
+        else:
+            break
+        depth += 1
+    assert depth == expected_depth
+    assert expr.token_literal() in ("5", "true")
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        "let add = fn(a, b) { a + b }; add(1, 2);",
+        "fn (x) { if (x < 1) { return fn (y) { y * -x } } else { x } }",
+        "let f = fn() { let g = fn() { if (true) { 1 } }; g }; f()",
+        "fn (x) { x + ",
+    ],
+)
+def test_parse_lazy_function_literal(test_input):
+    eager = Parser(Lexer(test_input))
+    lazy = Parser(Lexer(test_input), lazy_functions=True)
+
+    expected = str(eager.parse_program())
+    program = lazy.parse_program()
+
+    assert str(program) == expected
+    assert lazy.errors == eager.errors
+
+
+def test_lazy_function_body_is_not_parsed_until_used():
+    lexer = Lexer("let f = fn(x) { x + 1 }; f")
+    parser = Parser(lexer, lazy_functions=True)
+    program = parser.parse_program()
+
+    stmt: LetStatement = program.statements[0]
+    body = stmt.value.body
+    assert isinstance(body, LazyBlockStatement)
+    assert not body.parsed
+
+    assert str(body) == "(x+1)"
+    assert body.parsed
+
+
+def test_parsed_nodes_have_no_instance_dict():
+    lexer = Lexer(SOURCE_CODE_TEST_001 + "if (x < y) { return -x } else { !y }")
+    parser = Parser(lexer)
+    program = parser.parse_program()
+
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        assert not hasattr(node, "__dict__"), type(node).__name__
+        for name in node.__slots__:
+            child = getattr(node, name, None)
+            if isinstance(child, list):
+                stack.extend(child)
+            elif hasattr(child, "token_literal"):
+                stack.append(child)
+
+
+def test_hash_consing_shares_identical_expressions():
+    lexer = Lexer("a + b * c; let x = a + b * c; f(a + b * c, 1); a + c")
+    parser = Parser(lexer, hash_consing=True)
+    program = parser.parse_program()
+
+    first = program.statements[0].expression
+    assert program.statements[1].value is first
+    assert program.statements[2].expression.arguments[0] is first
+    assert program.statements[3].expression is not first
+    assert program.statements[3].expression.left is first.left
+
+
+def test_hash_consing_is_disabled_by_default():
+    lexer = Lexer("a + b; a + b")
+    parser = Parser(lexer)
+    program = parser.parse_program()
+
+    assert program.statements[0].expression is not program.statements[1].expression
+    assert str(program.statements[0]) == str(program.statements[1])
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("[1, 2 * 3, f(x)]", "[1,(2*3),f(x)]"),
+        ("[]", "[]"),
+        ("a[1 + 2]", "(a[(1+2)])"),
+        ("[[1], [2]][0][1]", "(([[1],[2]][0])[1])"),
+        ("-a[0] * b[1]", "((-(a[0]))*(b[1]))"),
+        ("f(x)[1]", "(f(x)[1])"),
+    ],
+)
+def test_parse_array_and_index_expression(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+    program = parser.parse_program()
+
+    assert not parser.errors
+    assert str(program) == expected
+
+
+@pytest.mark.parametrize("test_input", ["[1, 2", "a[1", "[1 2]"])
+def test_parse_array_errors(test_input):
+    parser = Parser(Lexer(test_input))
+    parser.parse_program()
+
+    assert parser.errors
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("{1: 2, true: f(x)}", "{1:2,true:f(x)}"),
+        ("{}", "{}"),
+        ("{a + 1: [b]}[c]", "({(a+1):[b]}[c])"),
+        ("fn(x) { {x: 1} }", "fn (x) {{x:1}}"),
+        ("if (a) { {} }", "if a \n{{}}"),
+    ],
+)
+def test_parse_hash_literal(test_input, expected):
+    lexer = Lexer(test_input)
+    parser = Parser(lexer)
+    program = parser.parse_program()
+
+    assert not parser.errors
+    assert str(program) == expected
+
+
+@pytest.mark.parametrize("test_input", ["{1 2}", "{1: 2", "{1: 2 3: 4}", "{1}"])
+def test_parse_hash_literal_errors(test_input):
+    parser = Parser(Lexer(test_input))
+    parser.parse_program()
+
+    assert parser.errors
+
+
+def test_parse_string_literal_is_interned():
+    lexer = Lexer('"foo" + "bar"; let x = "fo" ; "foo"')
+    parser = Parser(lexer)
+    program = parser.parse_program()
+
+    assert not parser.errors
+    first = program.statements[0].expression.left
+    last = program.statements[2].expression
+    assert isinstance(first, StringLiteral)
+    assert first.value == "foo"
+    assert first is not last
+    assert first.value is last.value
+
+
+def test_parse_while_statement():
+    parser = Parser(Lexer("while (i < 10) { let i = i + 1; }; i"))
+    program = parser.parse_program()
+
+    assert not parser.errors
+    assert len(program.statements) == 2
+    stmt = program.statements[0]
+    assert isinstance(stmt, WhileStatement)
+    assert str(stmt.condition) == "(i<10)"
+    assert len(stmt.body.statements) == 1
+    assert isinstance(stmt.body.statements[0], LetStatement)
+
+
+@pytest.mark.parametrize(
+    "test_input", ["while i { 1 }", "while (i) 1", "while (i { 1 }"]
+)
+def test_parse_while_statement_errors(test_input):
+    parser = Parser(Lexer(test_input))
+    parser.parse_program()
+
+    assert parser.errors
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pinterpret.analysis import FreeIdentifiers
+from pinterpret.lexer import Lexer
+from pinterpret.obj import IntegerObj
+from pinterpret.parser import Parser
+from pinterpret.prepared import PrepareError, prepare
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("a + b * c", ["a", "b", "c"]),
+        ("let a = 1; a + b", ["b"]),
+        ("let a = a + 1; a", ["a"]),
+        ("let f = fn(x) { x + y }; f(z)", ["y", "z"]),
+        ("let f = fn(n) { if (n < 1) { 0 } else { f(n - 1) } }; f(k)", ["k"]),
+        ("fn(x) { x }(x)", ["x"]),
+        ("if (c) { let t = 1; } t", ["c"]),
+    ],
+)
+def test_free_identifiers(test_input, expected):
+    program = Parser(Lexer(test_input)).parse_program()
+
+    assert FreeIdentifiers().run(program).names == expected
+
+
+@pytest.mark.parametrize(
+    "bindings,expected",
+    [
+        ({"x": 3, "y": 4}, "25"),
+        ({"x": IntegerObj(1), "y": 0}, "1"),
+        ({"x": 3}, "Error: identifier not found : y"),
+    ],
+)
+def test_prepared_program_runs_with_bindings(bindings, expected):
+    handle = prepare("let sq = fn(v) { v * v }; sq(x) + sq(y)")
+
+    assert handle.free_identifiers == ("x", "y")
+    assert handle.run(bindings).inspect() == expected
+
+
+def test_prepared_program_unwraps_return():
+    handle = prepare("if (flag) { return 1; } 2")
+
+    assert handle.run({"flag": True}).inspect() == "1"
+    assert handle.run({"flag": False}).inspect() == "2"
+
+
+def test_prepare_raises_on_parse_errors():
+    with pytest.raises(PrepareError) as e:
+        prepare("let = 3;")
+
+    assert e.value.errors
+
+
+def test_prepared_program_runs_concurrently():
+    handle = prepare("let f = fn(n) { if (n < 1) { 0 } else { n + f(n - 1) } }; f(x)")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda x: handle.run({"x": x}), range(30)))
+
+    assert [r.inspect() for r in results] == [str(x * (x + 1) // 2) for x in range(30)]
@@ -0,0 +1,123 @@
+import pytest
+
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import IntegerObj, ReturnObj
+from pinterpret.parser import Parser
+from pinterpret.prepared import PrepareError
+from pinterpret.scheduler import Scheduler, Task
+
+LONG = """
+let count = fn(n) { if (n == 0) { 0 } else { 1 + count(n - 1) } };
+count(50)
+"""
+
+
+def parse(source: str):
+    return Parser(Lexer(source)).parse_program()
+
+
+def show(obj):
+    return None if obj is None else obj.inspect()
+
+
+def evaluated(source: str):
+    result = evaluate(parse(source), Environment())
+    return result.value if isinstance(result, ReturnObj) else result
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "",
+        "5; 10",
+        "-5 + 10 * 2 == 15",
+        "!true; !!5",
+        "if (1 > 2) { 10 }",
+        "if (1 < 2) { 10 } else { 20 }",
+        "if (10 > 1) { if (10 > 1) { return 10; } return 1; }",
+        "let a = 5; let b = a * 2; b",
+        "let a = 5;",
+        "5 + true; 5",
+        "-true",
+        "foobar",
+        "let add = fn(a, b) { a + b }; add(5, add(5, 5))",
+        "let adder = fn(x) { fn(y) { x + y } }; let two = adder(2); two(3)",
+        "let f = fn(x) { return x * 2; 100 }; f(4) + 1",
+        "let f = fn(x) { x }; f(bar)",
+        "let i = 0; let s = 0; while (i < 10) { let s = s + i; let i = i + 1; }; s",
+        "let f = fn() { let i = 0; while (true) { if (i > 3) { return i; } let i = i + 1; } }; f()",
+        "while (x) { 1 }",
+        "while (false) { 1 }",
+        LONG,
+    ],
+)
+@pytest.mark.parametrize("slice_steps", [1, 7, 1000])
+def test_task_result_matches_evaluate(source, slice_steps):
+    task = Task(parse(source), Environment())
+    while not task.run(slice_steps):
+        pass
+    assert task.exception is None
+    assert show(task.result) == show(evaluated(source))
+
+
+def test_task_runs_bounded_steps():
+    task = Task(parse(LONG), Environment())
+    assert not task.run(10)
+    assert task.steps == 10
+    assert not task.done
+
+
+def test_task_runs_deeper_than_python_recursion():
+    task = Task(parse(LONG.replace("50", "5000")), Environment())
+    while not task.run(10000):
+        pass
+    assert task.result == IntegerObj(5000)
+
+
+def test_task_exception():
+    task = Task(parse("1 / 0"), Environment())
+    assert task.run(100)
+    assert isinstance(task.exception, ZeroDivisionError)
+    assert task.result is None
+
+
+def test_round_robin_short_tasks_are_not_blocked():
+    scheduler = Scheduler(slice_steps=50)
+    scheduler.spawn(LONG, name="long")
+    for i in range(5):
+        scheduler.spawn(f"{i} * 2", name=f"short{i}")
+
+    finished = [task.name for task in scheduler.run()]
+    assert finished == ["short0", "short1", "short2", "short3", "short4", "long"]
+    assert len(scheduler) == 0
+
+
+def test_priority():
+    scheduler = Scheduler(slice_steps=20)
+    low = scheduler.spawn(LONG, name="low")
+    high = scheduler.spawn(LONG, name="high", priority=1)
+
+    finished = list(scheduler.run())
+    assert finished == [high, low]
+    assert high.slices < low.slices + high.slices
+
+
+def test_spawn_with_environment():
+    env = Environment()
+    env.set("x", IntegerObj(20))
+    scheduler = Scheduler()
+    task = scheduler.spawn("x + 1", env=env)
+    assert list(scheduler.run()) == [task]
+    assert task.result == IntegerObj(21)
+
+
+def test_spawn_parse_error():
+    with pytest.raises(PrepareError):
+        Scheduler().spawn("let = 1")
+
+
+def test_invalid_slice_steps():
+    with pytest.raises(ValueError):
+        Scheduler(slice_steps=0)
@@ -0,0 +1,80 @@
+import pytest
+
+from pinterpret.ast import ExpressionStatement, PrefixExpression
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+from pinterpret.serialize import SerializeError, dump, dumps, load, loads
+from tests.consts import (
+    SOURCE_CODE_TEST_001,
+    SOURCE_CODE_TEST_002,
+    SOURCE_CODE_TEST_004,
+)
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        SOURCE_CODE_TEST_001,
+        SOURCE_CODE_TEST_002,
+        SOURCE_CODE_TEST_004,
+        "- 5 * (3 + 2) != !true;",
+        "if (x<y) {y} else {x}",
+        "abc(1+2,a,b); abc()",
+        "let a = [1, [2, x], []]; a[1][0]",
+        "let h = {1: {}, true: {x: 2}}; h[true][x]",
+        'let s = "a \\"b\\""; {s: "{"}[s]',
+        "while (i < 3) { let i = i + 1; }; i",
+        "let x  3;",
+        "",
+    ],
+)
+def test_dumps_and_loads_keep_program(test_input):
+    program = Parser(Lexer(test_input)).parse_program()
+
+    loaded = loads(dumps(program))
+
+    assert len(loaded.statements) == len(program.statements)
+    assert str(loaded) == str(program)
+
+
+def test_loads_program_is_evaluable():
+    source = "let add = fn(a,b) { return a+b }; add(2,3) + add(5,7);"
+    program = Parser(Lexer(source)).parse_program()
+
+    loaded = loads(dumps(program))
+
+    assert evaluate(loaded, Environment()).inspect() == "17"
+
+
+def test_dumps_deeply_nested_program():
+    program = Parser(Lexer("-" * 10000 + "5")).parse_program()
+
+    loaded = loads(dumps(program))
+
+    stmt: ExpressionStatement = loaded.statements[0]
+    expr = stmt.expression
+    depth = 0
+    while isinstance(expr, PrefixExpression):
+        expr = expr.right
+        depth += 1
+    assert depth == 10000
+
+
+def test_load_reads_statements_lazily(tmp_path):
+    program = Parser(Lexer(SOURCE_CODE_TEST_001)).parse_program()
+    path = str(tmp_path / "program.bin")
+    dump(program, path)
+
+    with load(path) as reader:
+        assert len(reader) == len(program.statements)
+        assert str(reader[-1]) == str(program.statements[-1])
+        assert [str(stmt) for stmt in reader] == [
+            str(stmt) for stmt in program.statements
+        ]
+
+
+def test_loads_rejects_unknown_data():
+    with pytest.raises(SerializeError):
+        loads(b"not a program")
@@ -0,0 +1,182 @@
+import asyncio
+import json
+
+import pytest
+
+from pinterpret.server import (
+    Client,
+    EvaluationServer,
+    LatencyHistogram,
+    LengthPrefixFraming,
+    evaluate_request,
+)
+
+PRELUDE = "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };"
+
+
+def run_with_server(test, framing="ndjson", unix_path=None, **kwargs):
+    """서버를 띄우고 test(server, client)를 실행한다."""
+
+    async def main():
+        server = EvaluationServer(workers=1, prelude=PRELUDE, framing=framing, **kwargs)
+        if unix_path:
+            await server.start_unix(unix_path)
+            client = await Client.connect_unix(unix_path, framing)
+        else:
+            await server.start_tcp(port=0)
+            client = await Client.connect_tcp(*server.address, framing)
+        try:
+            return await test(server, client)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("1 + 2", {"type": "INTEGER", "result": "3"}),
+        ("return 1 > 2;", {"type": "BOOLEAN", "result": "False"}),
+        ("1 / 0", {"error": "ZeroDivisionError: integer division or modulo by zero"}),
+        ("foo", {"error": "identifier not found : foo"}),
+    ],
+)
+def test_evaluate_request(source, expected):
+    assert evaluate_request(7, source, None, 100) == {"id": 7, **expected}
+
+
+def test_evaluate_request_timeout():
+    result = evaluate_request(1, "let f = fn(n) { f(n + 1) }; f(0)", 0.05, 100)
+    assert result == {"id": 1, "error": "timeout : 0.05s"}
+
+
+@pytest.mark.parametrize("framing", ["ndjson", "length"])
+def test_request(framing):
+    async def test(server, client):
+        return await client.request("fib(15)")
+
+    result = run_with_server(test, framing=framing)
+    assert result == {"id": 0, "type": "INTEGER", "result": "610"}
+
+
+def test_unix_socket(tmp_path):
+    async def test(server, client):
+        return await client.request("let a = 20; a * 2")
+
+    result = run_with_server(test, unix_path=str(tmp_path / "pinterpret.sock"))
+    assert result["result"] == "40"
+
+
+def test_pipelining():
+    async def test(server, client):
+        requests = [client.request(f"fib({i % 12}) + {i}") for i in range(200)]
+        return await asyncio.gather(*requests)
+
+    expected = [0, 1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89]
+    results = run_with_server(test, max_pipeline=8)
+    assert [r["result"] for r in results] == [
+        str(expected[i % 12] + i) for i in range(200)
+    ]
+
+
+def test_timeout_does_not_block_other_requests():
+    async def test(server, client):
+        slow = client.request("let f = fn(n) { f(n + 1) }; f(0)", timeout=0.2)
+        fast = client.request("1 + 1")
+        return await asyncio.gather(slow, fast)
+
+    slow, fast = run_with_server(test)
+    assert slow["error"] == "timeout : 0.2s"
+    assert fast["result"] == "2"
+
+
+def test_stuck_worker_is_replaced():
+    # 내장 함수 안의 반복은 단계로 나눠 실행하지 않으므로 worker가 timeout을 확인하지 못한다.
+    stuck = "map(fn(x) { while (true) { 1 } }, [1])"
+
+    async def test(server, client):
+        await client.request("1")
+        processes = list(server.executor._processes.values())
+        first = await client.request(stuck, timeout=0.2)
+        second = await client.request("1 + 2", timeout=5)
+        return first, second, processes
+
+    first, second, processes = run_with_server(test)
+    assert first["error"] == "timeout : 0.2s"
+    assert second["result"] == "3"
+    for process in processes:
+        process.join(5)
+        assert not process.is_alive()
+
+
+def test_crashing_program_gets_error_response():
+    # 파서가 RecursionError를 내는 프로그램에도 응답하고, worker는 다음 요청을 받는다.
+    nested = "fn() {" * 5000 + "}" * 5000
+
+    async def test(server, client):
+        crashed = await asyncio.wait_for(client.request(nested), 10)
+        after = await client.request("1 + 1")
+        return crashed, after
+
+    crashed, after = run_with_server(test)
+    assert crashed["error"].startswith("RecursionError")
+    assert after["result"] == "2"
+
+
+def test_invalid_requests():
+    async def test(server, client):
+        reader, writer = await asyncio.open_connection(*server.address)
+        responses = []
+        for line in [
+            b"not json",
+            b"[1, 2]",
+            b'{"id": "x"}',
+            b'{"source": "1", "timeout": -1}',
+        ]:
+            writer.write(line + b"\n")
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        return responses
+
+    responses = run_with_server(test)
+    assert responses[0]["error"].startswith("invalid request")
+    assert responses[1] == {"id": None, "error": "invalid request : not an object"}
+    assert responses[2] == {"id": "x", "error": "invalid request : source is required"}
+    assert responses[3]["error"] == "invalid request : timeout must be > 0"
+
+
+def test_stats():
+    async def test(server, client):
+        await asyncio.gather(*(client.request("fib(8)") for _ in range(20)))
+        return await client.stats()
+
+    stats = run_with_server(test)
+    assert stats["count"] == 20
+    assert 0 < stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    assert sum(count for _, count in stats["buckets"]) == 20
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    assert histogram.count == 100
+    assert 0.050 <= histogram.percentile(50) <= 0.050 * 1.2
+    assert 0.099 <= histogram.percentile(99) <= 0.100
+    assert histogram.percentile(100) == pytest.approx(0.100)
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_length_prefix_framing():
+    framing = LengthPrefixFraming()
+
+    async def read(data: bytes):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [await framing.read(reader), await framing.read(reader)]
+
+    assert framing.encode(b"abc") == b"\x00\x00\x00\x03abc"
+    assert asyncio.run(read(framing.encode(b"abc"))) == [b"abc", None]
@@ -0,0 +1,137 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pinterpret.environment import Environment
+from pinterpret.evaluator import apply_function, evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import FunctionObj, IntegerObj
+from pinterpret.parser import Parser
+from pinterpret.shipping import AstTable, ast_table, restore_function
+
+PRELUDE = """
+let base = 10;
+let adder = fn(x) { fn(y) { x + y + base } };
+let three = adder(3);
+let fact = fn(n) { if (n < 2) { 1 } else { n * fact(n - 1) } };
+let even = fn(n) { if (n == 0) { true } else { odd(n - 1) } };
+let odd = fn(n) { if (n == 0) { false } else { even(n - 1) } };
+let twice = fn(f, v) { f(f(v)) };
+"""
+
+
+def make_env(unused: int = 0) -> Environment:
+    env = Environment()
+    source = "".join(f"let unused{i} = {i};" for i in range(unused)) + PRELUDE
+    evaluate(Parser(Lexer(source)).parse_program(), env)
+    return env
+
+
+def call(fn: FunctionObj, *args):
+    return apply_function(fn, [IntegerObj(a) for a in args]).inspect()
+
+
+@pytest.fixture(autouse=True)
+def clean_table():
+    ast_table.clear()
+    yield
+    ast_table.clear()
+
+
+@pytest.mark.parametrize(
+    "name, args, expected",
+    [
+        ("adder", (1,), "fn (y) {((x+y)+base)}"),
+        ("three", (4,), "17"),
+        ("fact", (6,), "720"),
+        ("even", (9,), "False"),
+        ("odd", (9,), "True"),
+    ],
+)
+def test_round_trip(name, args, expected):
+    fn, _ = make_env().get(name)
+    restored = pickle.loads(pickle.dumps(fn))
+    assert isinstance(restored, FunctionObj)
+    assert call(restored, *args) == expected
+
+
+def test_only_captured_bindings_are_sent():
+    small = pickle.dumps(make_env().get("three")[0])
+    large_env = make_env(unused=2000)
+    large = pickle.dumps(large_env.get("three")[0])
+    assert len(large) == len(small)
+
+    restored = pickle.loads(large)
+    assert set(restored.env._store) == {"x", "base"}
+    assert restored.env.outer is None
+
+
+def test_cycles():
+    env = make_env()
+    even, odd = pickle.loads(pickle.dumps([env.get("even")[0], env.get("odd")[0]]))
+    assert even.env.get("odd")[0] is odd
+    assert odd.env.get("even")[0] is even
+
+    fact = pickle.loads(pickle.dumps(env.get("fact")[0]))
+    assert fact.env.get("fact")[0] is fact
+
+
+def test_same_literal_is_restored_once():
+    env = make_env()
+    evaluate(Parser(Lexer("let four = adder(4);")).parse_program(), env)
+    three, four = pickle.loads(pickle.dumps([env.get("three")[0], env.get("four")[0]]))
+    assert three.body is four.body
+    assert call(four, 1) == "15"
+
+
+def test_shared_table_sends_only_hashes():
+    fn = make_env().get("fact")[0]
+    inline = pickle.dumps(fn)
+    exported = ast_table.export()
+    shared = pickle.dumps(fn)
+    assert len(shared) < len(inline)
+
+    other = AstTable()
+    other.install(exported)
+    assert len(other) == len(exported)
+    assert all(key in other.shared for key, _ in exported)
+
+
+def test_unknown_function_literal():
+    with pytest.raises(pickle.UnpicklingError):
+        restore_function("0" * 64, None)
+
+
+def test_environment_round_trip():
+    env = make_env().freeze()
+    restored = pickle.loads(pickle.dumps(env))
+    assert restored.frozen
+    assert call(restored.get("three")[0], 1) == "14"
+
+
+def install(exported):
+    ast_table.install(exported)
+
+
+def apply_in_worker(fn: FunctionObj, *args) -> str:
+    return call(fn, *args)
+
+
+def test_process_pool():
+    env = make_env()
+    functions = [env.get(name)[0] for name in ("three", "fact", "twice")]
+    pickle.dumps(functions)  # 테이블에 등록
+
+    with ProcessPoolExecutor(
+        max_workers=1, initializer=install, initargs=(ast_table.export(),)
+    ) as executor:
+        three, fact, twice = functions
+        assert executor.submit(apply_in_worker, three, 5).result() == "18"
+        assert executor.submit(apply_in_worker, fact, 5).result() == "120"
+        result = executor.submit(evaluate_in_worker, twice, three).result()
+        assert result == "36"
+
+
+def evaluate_in_worker(twice: FunctionObj, f: FunctionObj) -> str:
+    return apply_function(twice, [f, IntegerObj(10)]).inspect()
@@ -0,0 +1,131 @@
+import pickle
+
+import pytest
+
+from pinterpret import serialize, snapshot
+from pinterpret.ast import LazyBlockStatement, Program
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.obj import FunctionObj
+from pinterpret.parser import Parser
+from pinterpret.serialize import SerializeError
+
+PRELUDE = """
+let base = 10;
+let adder = fn(x) { fn(y) { x + y + base } };
+let one = adder(1);
+let two = adder(2);
+let fact = fn(n) { if (n < 2) { 1 } else { n * fact(n - 1) } };
+let even = fn(n) { if (n == 0) { true } else { odd(n - 1) } };
+let odd = fn(n) { if (n == 0) { false } else { even(n - 1) } };
+let flag = !true;
+let nums = [1, 2, 99999999999999999999];
+let table = {"k": [1, "a"], 2: len, true: one};
+"""
+
+
+def run(source: str, env: Environment, lazy: bool = False):
+    return evaluate(Parser(Lexer(source), lazy_functions=lazy).parse_program(), env)
+
+
+def prelude_env(lazy: bool = False) -> Environment:
+    env = Environment()
+    run(PRELUDE, env, lazy)
+    return env
+
+
+@pytest.mark.parametrize("lazy_restore", [False, True])
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("one(5)", "16"),
+        ("two(5) + one(0)", "28"),
+        ("adder(100)(1)", "111"),
+        ("fact(10)", "3628800"),
+        ("even(10)", "True"),
+        ("odd(7)", "True"),
+        ("flag", "False"),
+        ("nums[2] + len(nums)", "100000000000000000002"),
+        ('table["k"][1] + "b"', "ab"),
+        ('table[2](table["k"]) + table[true](0)', "13"),
+    ],
+)
+def test_round_trip(source, expected, lazy, lazy_restore):
+    data = snapshot.dumps(prelude_env(lazy))
+    restored = snapshot.loads(data, lazy=lazy_restore)
+    assert run(source, restored.fork()).inspect() == expected
+
+
+def test_cycles_are_preserved():
+    restored = snapshot.loads(snapshot.dumps(prelude_env()))
+    fact, _ = restored.get("fact")
+    even, _ = restored.get("even")
+    odd, _ = restored.get("odd")
+    assert fact.env is restored
+    assert even.env is odd.env is restored
+
+
+def test_closures_share_captured_frames_and_bodies():
+    restored = snapshot.loads(snapshot.dumps(prelude_env()))
+    one, _ = restored.get("one")
+    two, _ = restored.get("two")
+    assert isinstance(one, FunctionObj)
+    assert one.env is not two.env
+    assert one.env.outer is two.env.outer is restored
+    assert one.body is two.body
+
+
+def test_function_bodies_are_restored_on_first_call():
+    env = prelude_env()
+    restored = snapshot.loads(snapshot.dumps(env))
+    fact, _ = restored.get("fact")
+    assert isinstance(fact.body, LazyBlockStatement)
+    assert not fact.body.parsed
+
+    assert run("fact(3)", restored.fork()).inspect() == "6"
+    assert fact.body.parsed
+    assert str(fact.body) == str(env.get("fact")[0].body)
+
+
+def test_frozen_is_preserved():
+    env = prelude_env().freeze()
+    restored = snapshot.loads(snapshot.dumps(env))
+    assert restored.frozen
+    assert run("one(1)", restored.fork()).inspect() == "12"
+
+
+def test_dump_load(tmp_path):
+    path = str(tmp_path / "prelude.snapshot")
+    snapshot.dump(prelude_env(), path)
+    restored = snapshot.load(path)
+    assert run("fact(5) + two(3)", restored).inspect() == "135"
+
+
+def test_invalid_snapshot():
+    with pytest.raises(SerializeError):
+        snapshot.loads(b"not a snapshot")
+
+
+def snapshot_with_payload(payload: bytes) -> bytes:
+    table = serialize.dumps(Program([]))
+    header = snapshot.MAGIC + bytes([snapshot.FORMAT_VERSION])
+    return header + snapshot.AST_TABLE_SIZE.pack(len(table)) + table + payload
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        pickle.dumps(print),
+        # pinterpret 모듈을 거쳐 다른 모듈의 함수에 닿는 이름
+        b"cpinterpret.cache\nos.system\n(S'true'\ntR.",
+        b"cpinterpret.cache\nos.getpid\n)R.",
+        # 허용한 모듈이어도 목록에 없는 이름
+        b"cpinterpret.snapshot\nloads\n(C\x00tR.",
+        b"cbuiltins\ngetattr\n.",
+    ],
+)
+def test_only_allowed_globals_are_loaded(payload):
+    with pytest.raises(pickle.UnpicklingError):
+        snapshot.loads(snapshot_with_payload(payload))
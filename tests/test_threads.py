@@ -0,0 +1,109 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pinterpret.ast import LazyBlockStatement
+from pinterpret.batch import ThreadRunner, run_job
+from pinterpret.environment import Environment
+from pinterpret.evaluator import evaluate
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser, parse_skipped_block
+from pinterpret.prepared import prepare
+from pinterpret.token import Token
+
+PRELUDE = """
+let adder = fn(a) { fn(b) { a + b } };
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let base = 100;
+"""
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # 스레드 전환을 자주 일으켜서 경쟁 상태가 드러나게 한다.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def make_jobs(n: int):
+    jobs = []
+    for i in range(n):
+        if i % 3 == 0:
+            source = f"let base = {i}; adder(base)({i})"
+        elif i % 3 == 1:
+            source = f"let add = adder({i}); add(base) + fib({i % 10})"
+        else:
+            source = f"if (base > {i}) {{ fib(8) }} else {{ base - {i} }}"
+        jobs.append((str(i), source))
+    return jobs
+
+
+def test_thread_runner_matches_sequential():
+    jobs = make_jobs(600)
+    env = Environment()
+    evaluate(Parser(Lexer(PRELUDE)).parse_program(), env)
+    expected = [run_job(job_id, source, env) for job_id, source in jobs]
+
+    with ThreadRunner(workers=16, prelude=PRELUDE, chunksize=2) as runner:
+        assert list(runner.run(jobs)) == expected
+        unordered = list(runner.run(jobs, ordered=False))
+        assert sorted(unordered, key=lambda r: int(r["id"])) == expected
+
+
+def test_shared_lazy_function_bodies():
+    source = """
+    let counter = fn(n) { let m = n * 2; let k = fn(x) { x + m }; k(n) };
+    let apply = fn(f, n) { f(n) };
+    apply(counter, n)
+    """
+    program = Parser(Lexer(source), lazy_functions=True).parse_program()
+    barrier = threading.Barrier(16)
+
+    def work(n: int) -> int:
+        barrier.wait()
+        env = Environment()
+        env.set("n", evaluate(Parser(Lexer(str(n))).parse_program(), env))
+        return evaluate(program, env).value
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(work, range(16)))
+    assert results == [n * 3 for n in range(16)]
+
+
+def test_lazy_body_is_parsed_once():
+    calls = []
+    tokens = [Token(word) for word in ["{", "1", "+", "2", "}"]]
+
+    def slow_parse(tokens):
+        calls.append(1)
+        time.sleep(0.01)
+        return parse_skipped_block(tokens, errors=[])
+
+    body = LazyBlockStatement(Token("{"), tokens, slow_parse)
+    barrier = threading.Barrier(8)
+
+    def work(_):
+        barrier.wait()
+        return str(body)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(work, range(8)))
+    assert len(calls) == 1
+    assert results == ["(1+2)"] * 8
+
+
+def test_prepared_program_from_many_threads():
+    handle = prepare(
+        "let scale = fn(v) { v * factor }; if (x > y) { scale(x) } else { scale(y) }"
+    )
+    bindings = [{"x": i, "y": 50 - i, "factor": i % 7} for i in range(500)]
+    expected = [max(b["x"], b["y"]) * b["factor"] for b in bindings]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda b: handle.run(b).value, bindings))
+    assert results == expected
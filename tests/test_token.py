@@ -1,6 +1,6 @@
 import pytest
 
-from pinterpret.token import Token, TokenType
+from pinterpret.token import Token, TokenType, string_value
 
 
 @pytest.mark.parametrize(
@@ -14,7 +14,31 @@ from pinterpret.token import Token, TokenType
         (")", TokenType.RPAREN),
         ("{", TokenType.LBRACE),
         ("}", TokenType.RBRACE),
+        ("[", TokenType.LBRACKET),
+        ("]", TokenType.RBRACKET),
+        (":", TokenType.COLON),
+        ('"hello world"', TokenType.STRING),
+        ('""', TokenType.STRING),
+        ('"a\\"b"', TokenType.STRING),
+        ('"abc', TokenType.ILLEGAL),
+        ('"a\\qb"', TokenType.ILLEGAL),
     ],
 )
 def test_initialize_token(test_input, expected):
     assert Token(test_input).type == expected
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ('"abc"', "abc"),
+        ('""', ""),
+        ('"say \\"hi\\""', 'say "hi"'),
+        ('"a\\\\b\\n\\t"', "a\\b\n\t"),
+        ('"a"b"', None),
+        ('"abc\\"', None),
+        ("abc", None),
+    ],
+)
+def test_string_value(test_input, expected):
+    assert string_value(test_input) == expected
@@ -0,0 +1,103 @@
+import io
+
+import pytest
+
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+from pinterpret.unparse import unparse, write
+from tests.consts import (
+    SOURCE_CODE_TEST_001,
+    SOURCE_CODE_TEST_002,
+    SOURCE_CODE_TEST_003,
+    SOURCE_CODE_TEST_004,
+)
+
+
+def parse(source: str):
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    assert not parser.errors
+    return program
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("a + b * c", "a+b*c;"),
+        ("(a + b) * c", "(a+b)*c;"),
+        ("a - (b - c)", "a-(b-c);"),
+        ("(a - b) - c", "a-b-c;"),
+        ("-(a + b)", "-(a+b);"),
+        ("--5", "--5;"),
+        ("!(a == b) != true", "!(a==b)!=true;"),
+        ("add(1, 2 * 3)(x)", "add(1,2*3)(x);"),
+        ("let x = fn(a, b) { return a + b; };", "let x=fn(a,b){return a+b;};"),
+        ("if (x < y) { x } else { y }", "if(x<y){x;}else{y;};"),
+        ("fn() {}", "fn(){};"),
+        ("[1, a + b, []]", "[1,a+b,[]];"),
+        ("(-a)[0] + b[1][2]", "(-a)[0]+b[1][2];"),
+        ("f(x)[0]", "f(x)[0];"),
+        ("a[0](1)", "a[0](1);"),
+        ("{1: a, b + 1: {}}[c]", "{1:a,b+1:{}}[c];"),
+        ("if (a) { {} }", "if(a){{};};"),
+        ('"a \\"b\\"" + x', '"a \\"b\\""+x;'),
+        ("while (i < 3) { let i = i + 1; }", "while(i<3){let i=i+1;}"),
+    ],
+)
+def test_unparse_compact(test_input, expected):
+    assert unparse(parse(test_input)) == expected
+
+
+def test_unparse_pretty():
+    program = parse(
+        "let f = fn(a) { if (a < 1) { return 0; } else { a * f(a - 1) } }; f(3)"
+    )
+
+    assert unparse(program, pretty=True) == (
+        "let f = fn(a) {\n"
+        "    if (a < 1) {\n"
+        "        return 0;\n"
+        "    } else {\n"
+        "        a * f(a - 1);\n"
+        "    };\n"
+        "};\n"
+        "f(3);"
+    )
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        SOURCE_CODE_TEST_001,
+        SOURCE_CODE_TEST_002,
+        SOURCE_CODE_TEST_003,
+        SOURCE_CODE_TEST_004,
+        "- 5 * (3 + 2) != !true; a / (b * c) - -d",
+        "fn(x) { x }(3); (-f)(1); if (a) { b } (c)",
+        "while (a) { while (b) { let b = f(b); } }; a",
+    ],
+)
+@pytest.mark.parametrize("pretty", [False, True])
+def test_unparse_round_trip(test_input, pretty):
+    program = parse(test_input)
+
+    reparsed = parse(unparse(program, pretty=pretty))
+
+    assert str(reparsed) == str(program)
+    assert unparse(reparsed, pretty=pretty) == unparse(program, pretty=pretty)
+
+
+def test_unparse_deeply_nested_expression():
+    program = parse("-" * 10000 + "(" * 10000 + "a + b" + ")" * 10000)
+
+    text = unparse(program)
+
+    assert text == "-" * 10000 + "(a+b);"
+
+
+def test_write_to_buffer():
+    buffer = io.StringIO()
+
+    write(parse("let a = 1; a"), buffer)
+
+    assert buffer.getvalue() == "let a=1;a;"
@@ -0,0 +1,106 @@
+from pinterpret.arena import ArenaProgram
+from pinterpret.ast import Identifier, InfixExpression, IntegerLiteral, Node
+from pinterpret.lexer import Lexer
+from pinterpret.parser import Parser
+from pinterpret.token import Token
+from pinterpret.unparse import unparse
+from pinterpret.visitor import (
+    AnalysisPass,
+    NodeTransformer,
+    NodeVisitor,
+    run_passes,
+    walk,
+)
+
+
+def parse(source: str):
+    return Parser(Lexer(source)).parse_program()
+
+
+class IdentifierCollector(NodeVisitor):
+    def __init__(self):
+        self.names = []
+
+    def visit_Identifier(self, node: Identifier):
+        self.names.append(node.value)
+
+
+class ConstantFolder(NodeTransformer):
+    def visit_InfixExpression(self, node: InfixExpression) -> Node:
+        self.generic_visit(node)
+        if (
+            node.operator in ("+", "*")
+            and isinstance(node.left, IntegerLiteral)
+            and isinstance(node.right, IntegerLiteral)
+        ):
+            if node.operator == "+":
+                value = node.left.value + node.right.value
+            else:
+                value = node.left.value * node.right.value
+            return IntegerLiteral(Token(str(value)))
+        return node
+
+
+class DepthPass(AnalysisPass):
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+
+    def enter_Node(self, node: Node):
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    def leave_Node(self, node: Node):
+        self.depth -= 1
+
+
+class CallCounter(AnalysisPass):
+    def __init__(self):
+        self.calls = 0
+
+    def enter_CallExpression(self, node):
+        self.calls += 1
+
+
+def test_node_visitor_visits_in_order():
+    program = parse("let x = a + f(b, c); if (x) { return y }")
+
+    collector = IdentifierCollector()
+    collector.visit(program)
+
+    assert collector.names == ["x", "a", "f", "b", "c", "x", "y"]
+
+
+def test_node_visitor_dispatches_on_arena_views():
+    program = ArenaProgram.from_program(parse("let x = a + f(b, c);"))
+
+    collector = IdentifierCollector()
+    collector.visit(program)
+
+    assert collector.names == ["x", "a", "f", "b", "c"]
+
+
+def test_node_transformer_replaces_nodes():
+    program = parse("let x = 1 + 2 * 3; f(2 * 2, y + 1)")
+
+    program = ConstantFolder().visit(program)
+
+    assert unparse(program) == "let x=7;f(4,y+1);"
+
+
+def test_run_passes_in_single_walk():
+    program = parse("f(g(1), 2 + h(3))")
+
+    depth, counter = DepthPass(), CallCounter()
+    run_passes(program, [depth, counter])
+
+    assert counter.calls == 3
+    assert depth.depth == 0
+    assert depth.max_depth == 6
+
+
+def test_walk_deeply_nested_expression():
+    program = parse("-" * 10000 + "a")
+
+    assert sum(1 for _ in walk(program)) == 10000 + 3
+    assert DepthPass().run(program).max_depth == 10000 + 3